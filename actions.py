@@ -1,11 +1,68 @@
 """
 Module Actions.
 Contient les méthodes statiques exécutées par les commandes.
+
+Le nombre de paramètres est vérifié en amont par le répartiteur (command.py) :
+les actions reçoivent toujours une saisie valide.
 """
+# pylint: disable=unused-argument
+from console import display
+from stats import STATS, TRACE_DIR, trace_path
+
+MSG_QUANTITY = "\nQuantité invalide.\n"
+MSG_TOO_HEAVY = "\n⚖️  Trop lourd : il n'y a plus assez de place pour '{item_name}'.\n"
+MSG_NO_CONTAINER = "\nIl n'y a pas de '{container_name}' ici.\n"
+ALL_WORD = "all"
+# PNJ (clé de nom) -> scène jouée par 'talk'
+TALK_SCENES = {"fouras": "fouras", "marchand": "marchand"}
+# Nombre maximal de PNJ listés par 'where'
+WHERE_LIMIT = 10
+# Aide de la commande d'administration 'stats'
+STATS_USAGE = "\nUsage : stats [reset | trace <fichier>]\n"
+FROM_WORDS = ("de", "du", "from")
+INTO_WORDS = ("dans", "in", "into")
+
+# Synonymes acceptés pour les directions de 'go'
+DIRECTION_ALIASES = {
+    "NORD": "N", "EST": "E", "SUD": "S", "OUEST": "O",
+    "UP": "U", "DOWN": "D",
+    "N": "N", "E": "E", "S": "S", "O": "O", "U": "U", "D": "D"
+}
+
+
+def normalize_direction(word):
+    """Convertit une direction saisie (ex: 'nord') en direction du jeu (ex: 'N')."""
+    raw_dir = word.upper()
+    return DIRECTION_ALIASES.get(raw_dir, raw_dir)
+
+
+def parse_item_request(list_of_words, separators=()):
+    """
+    Analyse les paramètres de take/drop : [nombre | all] <objet> [<séparateur> <conteneur>].
+
+    Returns:
+        tuple: (quantité, nom de l'objet, nom du conteneur). La quantité vaut
+        None pour la pile entière ; le nom vaut None pour 'all' seul (tout
+        l'inventaire) ; le conteneur vaut None s'il n'est pas précisé.
+    """
+    words = list_of_words[1:]
+    container_name = None
+    for position in range(len(words) - 2, 0, -1):
+        if words[position].lower() in separators:
+            container_name = " ".join(words[position + 1:])
+            words = words[:position]
+            break
+    if words[0].lower() == ALL_WORD:
+        return None, " ".join(words[1:]) or None, container_name
+    if len(words) > 1 and words[0].isdigit():
+        return int(words[0]), " ".join(words[1:]), container_name
+    return 1, " ".join(words), container_name
+
+
+def format_stacks(stacks):
+    """Met en forme des piles déplacées : 'pièce (x10), tortue (x1)'."""
+    return ", ".join(f"{item.name} (x{quantity})" for item, quantity in stacks)
 
-# Messages d'erreur constants
-MSG0 = "\nLa commande '{command_word}' ne prend pas de paramètre.\n"
-MSG1 = "\nLa commande '{command_word}' prend 1 seul paramètre.\n"
 
 class Actions:
     """
@@ -18,263 +75,280 @@ class Actions:
     def go(game, list_of_words, number_of_parameters):
         """Gère le déplacement du joueur."""
         player = game.player
-        command_length = len(list_of_words)
-        if command_length != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
-            return False
-
         direction = list_of_words[1]
+        previous_room = player.current_room
 
-        # Vérification pré-déplacement : La porte du trésor
-        next_room = player.current_room.exits.get(direction)
-
-        if next_room and next_room.name == "la cave aux trésors":
-            # Le gardien bloque le passage si l'équipage n'est pas complet
-            if player.crew < 8:
-                print("\n⛔ LE GARDIEN VOUS BARRE LA ROUTE !")
-                print("Gardien : 'Halte ! Tu dois avoir un équipage au complet d'au moins "
-                      "8 valeureux pirates pour pouvoir briser la porte !'")
-                print(f"(Vous n'avez que {player.crew} hommes.)\n")
-                return False
-            print("\n🔓 Gardien : 'Je vois que vous êtes bien entouré. Vous pouvez passer.'")
+        # Porte de la sortie (ex: le gardien de la cave aux trésors), puis gardes de la salle visée
+        next_room = previous_room.exits.get(direction)
+        if next_room is not None and not (
+                player.exit_cache.cross(game, previous_room, direction)
+                and game.triggers.allows(game, next_room)):
+            return False
 
         # On tente le mouvement normal
         if player.move(direction):
-            # Si le mouvement réussit, on vérifie les événements de la nouvelle salle
-            game.check_room_events()
+            # Si le mouvement réussit, on déclenche les événements des deux salles
+            game.check_room_events(previous_room)
             return True
         return False
 
     @staticmethod
-    def quit(game, list_of_words, number_of_parameters):
-        """Quitte le jeu."""
-        command_length = len(list_of_words)
-        if command_length != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
+    def travel(game, list_of_words, number_of_parameters):
+        """
+        Conduit le joueur jusqu'à une salle par le plus court chemin.
+
+        Comme autant de 'go', chaque étape franchie avance le monde d'un tick
+        (la commande elle-même est instantanée, voir Game.step).
+        """
+        room_name = " ".join(list_of_words[1:])
+        player = game.player
+        destination = game.world.find_room(room_name)
+        if destination is None:
+            display(f"\nAucune île ne s'appelle '{room_name}'.\n")
+            return False
+
+        # Les portes fermées pour le joueur sont évitées
+        route = game.world.route(player.current_room, destination,
+                                 player.exit_cache.closed_edges())
+        if route is None:
+            display(f"\nAucune route ouverte ne mène à {destination.name}.\n")
+            return False
+        if not route:
+            display(f"\nVous êtes déjà dans {destination.name}.\n")
             return False
 
+        display(f"\n🧭 Cap sur {destination.name} : {' → '.join(route)}")
+        for step, direction in enumerate(route, start=1):
+            if not Actions.go(game, ["go", direction], 1):
+                display("\n🧭 Le voyage est interrompu.\n")
+                return False
+            game.tick((player.current_room,))
+            if game.dialogue.active and step < len(route):
+                # Une scène (ex: la tempête) arrête le voyage en cours de route
+                display("\n🧭 Le voyage est interrompu.\n")
+                return False
+        return True
+
+    @staticmethod
+    def quit(game, list_of_words, number_of_parameters):
+        """Quitte le jeu."""
         player = game.player
         msg = f"\nMerci {player.name} d'avoir joué. Au revoir.\n"
-        print(msg)
+        display(msg)
         game.finished = True
         return True
 
     @staticmethod
     def help(game, list_of_words, number_of_parameters):
         """Affiche l'aide."""
-        command_length = len(list_of_words)
-        if command_length != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
-
-        print("\nVoici les commandes disponibles:")
+        display("\nVoici les commandes disponibles:")
         for command in game.commands.values():
-            print("\t- " + str(command))
-        print()
+            display("\t- " + str(command))
+        display()
         return True
 
     @staticmethod
     def history(game, list_of_words, number_of_parameters):
-        """Affiche l'historique."""
-        command_length = len(list_of_words)
-        if command_length != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
-        game.player.get_history()
+        """Affiche l'historique, page par page ('history 2')."""
+        page = 1
+        if len(list_of_words) > 1:
+            if not list_of_words[1].isdigit() or int(list_of_words[1]) < 1:
+                display("\nNuméro de page invalide.\n")
+                return False
+            page = int(list_of_words[1])
+        game.player.get_history(game.rooms, page)
         return True
 
     @staticmethod
     def back(game, list_of_words, number_of_parameters):
         """Revient à la salle précédente."""
-        command_length = len(list_of_words)
-        if command_length != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
-
         player = game.player
         if not player.history:
-            print("\nImpossible de revenir en arrière : aucun historique.\n")
+            display("\nImpossible de revenir en arrière : aucun historique.\n")
             return False
 
-        previous_room = player.history.pop()
-        player.current_room = previous_room
-        print("\nVous êtes maintenant dans :", player.current_room.get_long_description())
-        game.check_room_events()
+        previous_room = player.current_room
+        if not game.triggers.allows(game, game.rooms[player.history.peek()]):
+            return False
+        player.current_room = game.rooms[player.history.pop()]
+        display("\nVous êtes maintenant dans :", player.current_room.get_long_description())
+        game.check_room_events(previous_room)
         return True
 
     @staticmethod
     def check(game, list_of_words, number_of_parameters):
         """Affiche l'inventaire."""
-        command_length = len(list_of_words)
-        if command_length != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
-        print(game.player.get_inventory())
+        display(game.player.get_inventory())
         return True
 
     @staticmethod
     def look(game, list_of_words, number_of_parameters):
         """Observe la salle actuelle."""
-        command_length = len(list_of_words)
-        if command_length != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
-
         room = game.player.current_room
-        print(room.get_long_description())
-        print(room.get_inventory())
-
-        pnjs = getattr(room, "characters", [])
-        if pnjs:
-            print("PNJ présents :")
-            for character in pnjs:
-                print(f" - {character.name} : {character.description}")
-        else:
-            print("Il n'y a pas de PNJ ici.")
+        display(room.get_long_description())
+        closed = game.player.exit_cache.closed_exits(room)
+        if closed:
+            display(f"🔒 Sorties fermées : {', '.join(closed)}\n")
+        display(room.get_inventory())
+        display(room.get_characters())
         return True
 
     @staticmethod
     def take(game, list_of_words, number_of_parameters):
-        """Prend un objet."""
-        command_length = len(list_of_words)
-        if command_length != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
-            return False
-
-        item_name = list_of_words[1]
+        """
+        Prend un objet : 'take pièce', 'take 10 pièce', 'take all pièce', 'take all',
+        'take coffre' (un conteneur entier) ou 'take 5 pièce de coffre'.
+        """
         player = game.player
         room = player.current_room
+        quantity, item_name, container_name = parse_item_request(list_of_words, FROM_WORDS)
+
+        source = room.inventory
+        if container_name is not None:
+            source = room.inventory.find_container(container_name)
+            if source is None:
+                source = player.inventory.find_container(container_name)
+            if source is None:
+                display(MSG_NO_CONTAINER.format(container_name=container_name))
+                return False
 
-        info = room.inventory.get(item_name)
-        if info is None:
-            print(f"\n'{item_name}' n'est pas présent dans cette pièce.\n")
+        if item_name is None:
+            moved, complete = source.transfer_all(player.inventory)
+            if not moved and complete:
+                display("\nIl n'y a rien à prendre ici.\n")
+                return False
+            if moved:
+                display(f"\nVous avez pris : {format_stacks(moved)}.\n")
+            if not complete:
+                display("\n⚖️  Trop lourd : une partie est restée sur place.\n")
+            return bool(moved)
+
+        if item_name in source.containers:
+            if not source.transfer_container(player.inventory, item_name):
+                display(MSG_TOO_HEAVY.format(item_name=item_name))
+                return False
+            display(f"\nVous avez pris '{item_name}'.\n")
+            return True
+
+        if item_name not in source:
+            display(f"\n'{item_name}' n'est pas présent dans cette pièce.\n")
+            return False
+        if quantity == 0:
+            display(MSG_QUANTITY)
             return False
 
-        qty_room = info.get("quantity", 1)
-        if qty_room <= 1:
-            del room.inventory[item_name]
-        else:
-            info["quantity"] = qty_room - 1
-
-        pinfo = player.inventory.get(item_name)
-        if pinfo is None:
-            player.inventory[item_name] = {
-                "description": info.get("description", ""),
-                "weight": info.get("weight", 0),
-                "quantity": 1
-            }
+        moved = source.transfer(player.inventory, item_name, quantity)
+        if moved == 0:
+            display(MSG_TOO_HEAVY.format(item_name=item_name))
+            return False
+        if moved == 1:
+            display(f"\nVous avez pris '{item_name}'.\n")
         else:
-            pinfo["quantity"] = pinfo.get("quantity", 1) + 1
-
-        print(f"\nVous avez pris '{item_name}'.\n")
+            display(f"\nVous avez pris {moved} x '{item_name}'.\n")
         return True
 
     @staticmethod
     def drop(game, list_of_words, number_of_parameters):
-        """Pose un objet."""
-        command_length = len(list_of_words)
-        if command_length != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
-            return False
-
-        item_name = list_of_words[1]
+        """
+        Pose un objet : 'drop pièce', 'drop 10 pièce', 'drop all pièce', 'drop all',
+        'drop sac' (un conteneur entier) ou 'drop 5 pièce dans sac'.
+        """
         player = game.player
         room = player.current_room
+        quantity, item_name, container_name = parse_item_request(list_of_words, INTO_WORDS)
+
+        target, where = room.inventory, "dans la pièce"
+        if container_name is not None:
+            target = player.inventory.find_container(container_name)
+            if target is None:
+                target = room.inventory.find_container(container_name)
+            if target is None:
+                display(MSG_NO_CONTAINER.format(container_name=container_name))
+                return False
+            where = f"dans '{container_name}'"
+
+        if item_name is None:
+            moved, complete = player.inventory.transfer_all(target)
+            if not moved and complete:
+                display("\nVotre inventaire est vide.\n")
+                return False
+            if moved:
+                display(f"\nVous avez reposé {where} : {format_stacks(moved)}.\n")
+            if not complete:
+                display(f"\n⚖️  Il n'y a pas assez de place {where} pour tout poser.\n")
+            return bool(moved)
+
+        if item_name in player.inventory.containers:
+            if target.is_inside(player.inventory.containers[item_name]):
+                display(f"\nImpossible de ranger '{item_name}' dans lui-même.\n")
+                return False
+            if not player.inventory.transfer_container(target, item_name):
+                display(MSG_TOO_HEAVY.format(item_name=item_name))
+                return False
+            display(f"\nVous avez reposé '{item_name}' {where}.\n")
+            return True
 
-        pinfo = player.inventory.get(item_name)
-        if pinfo is None:
-            print(f"\nVous ne possédez pas '{item_name}'.\n")
+        if item_name not in player.inventory:
+            display(f"\nVous ne possédez pas '{item_name}'.\n")
+            return False
+        if quantity == 0:
+            display(MSG_QUANTITY)
             return False
 
-        qty_player = pinfo.get("quantity", 1)
-        if qty_player <= 1:
-            del player.inventory[item_name]
-        else:
-            pinfo["quantity"] = qty_player - 1
-
-        rinfo = room.inventory.get(item_name)
-        if rinfo is None:
-            room.inventory[item_name] = {
-                "description": pinfo.get("description", ""),
-                "weight": pinfo.get("weight", 0),
-                "quantity": 1
-            }
+        moved = player.inventory.transfer(target, item_name, quantity)
+        if moved == 0:
+            display(MSG_TOO_HEAVY.format(item_name=item_name))
+            return False
+        if moved == 1:
+            display(f"\nVous avez reposé '{item_name}' {where}.\n")
         else:
-            rinfo["quantity"] = rinfo.get("quantity", 1) + 1
-
-        print(f"\nVous avez reposé '{item_name}' dans la pièce.\n")
+            display(f"\nVous avez reposé {moved} x '{item_name}' {where}.\n")
         return True
 
     @staticmethod
     def talk(game, list_of_words, number_of_parameters):
-        """Discute avec un PNJ."""
-        player = game.player
-        room = player.current_room
-        command_length = len(list_of_words)
-        if command_length != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
+        """Discute avec un PNJ (accents et casse ignorés : 'talk pere fouras')."""
+        room = game.player.current_room
+        target_name = " ".join(list_of_words[1:])
+
+        npc = room.find_character(target_name)
+        if npc is None:
+            display(f"\nIl n'y a personne du nom de '{target_name}' ici.\n")
             return False
 
-        target_name = list_of_words[1]
-
-        # VÉRIFICATION SPÉCIALE POUR FOURAS
-        if "fouras" in target_name.lower():
-            npc_present = any("fouras" in c.name.lower() for c in room.characters)
-            if npc_present:
-                game.handle_fouras_interaction()
-                return True
-
-        # VÉRIFICATION SPÉCIALE POUR LE MARCHAND
-        if "marchand" in target_name.lower():
-            npc_present = any("marchand" in c.name.lower() for c in room.characters)
-            if npc_present:
-                game.handle_merchant_interaction()
-                return True
-
-        # Comportement standard pour les autres PNJ
-        found_character = None
-        if hasattr(room, "characters"):
-            for npc in room.characters:
-                if target_name.lower() in npc.name.lower():
-                    found_character = npc
-                    break
-
-        if found_character:
-            found_character.get_msg()
-            return True
+        # Certains PNJ ouvrent une scène interactive (Fouras, le Marchand)
+        scene = TALK_SCENES.get(npc.key)
+        if scene is not None:
+            game.dialogue.start(scene)
+        else:
+            npc.get_msg()
+        return True
 
-        print(f"\nIl n'y a personne du nom de '{target_name}' ici.\n")
-        return False
+    @staticmethod
+    def where(game, list_of_words, number_of_parameters):
+        """Indique dans quelle salle se trouve un PNJ."""
+        target_name = " ".join(list_of_words[1:])
+        found = game.npc_engine.locate(target_name)
+        if not found:
+            display(f"\nAucun PNJ ne s'appelle '{target_name}'.\n")
+            return False
+        display()
+        for npc, room in found[:WHERE_LIMIT]:
+            display(f"📍 {npc.name} se trouve dans {room.name}.")
+        if len(found) > WHERE_LIMIT:
+            display(f"... et {len(found) - WHERE_LIMIT} autre(s).")
+        display()
+        return True
 
     @staticmethod
     def quests(game, list_of_words, number_of_parameters):
         """Affiche les quêtes."""
-        command_length = len(list_of_words)
-        if command_length != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
         game.player.quest_manager.show_quests()
         return True
 
     @staticmethod
     def quest(game, list_of_words, number_of_parameters):
         """Affiche les détails d'une quête."""
-        command_length = len(list_of_words)
-        if command_length < number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
         quest_title = " ".join(list_of_words[1:])
         current_counts = {"Se déplacer": game.player.move_count}
         game.player.quest_manager.show_quest_details(quest_title, current_counts)
@@ -283,24 +357,66 @@ class Actions:
     @staticmethod
     def activate(game, list_of_words, number_of_parameters):
         """Active une quête."""
-        command_length = len(list_of_words)
-        if command_length < number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
-            return False
         quest_title = " ".join(list_of_words[1:])
-        if game.player.quest_manager.activate_quest(quest_title):
+        quest_manager = game.player.quest_manager
+        if quest_manager.activate_quest(quest_title):
             return True
-        print(f"\nImpossible d'activer '{quest_title}'.\n")
+        quest = quest_manager.get_quest_by_title(quest_title)
+        if quest is not None and not quest.is_active and not quest_manager.is_unlocked(quest):
+            display(f"\n🔒 La quête '{quest_title}' est verrouillée "
+                    f"('quest {quest_title}' pour voir ses conditions).\n")
+            return False
+        display(f"\nImpossible d'activer '{quest_title}'.\n")
         return False
 
+    @staticmethod
+    def save(game, list_of_words, number_of_parameters):
+        """Sauvegarde la partie (instantané complet)."""
+        if game.save_manager is None:
+            display("\nAucun fichier de sauvegarde (lancez le jeu avec --save).\n")
+            return False
+        game.save_manager.save_snapshot()
+        display("\n💾 Partie sauvegardée.\n")
+        return True
+
     @staticmethod
     def rewards(game, list_of_words, number_of_parameters):
         """Affiche les récompenses."""
-        command_length = len(list_of_words)
-        if command_length != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
         game.player.show_rewards()
         return True
+
+    @staticmethod
+    def stats(game, list_of_words, number_of_parameters):
+        """
+        Commande d'administration des mesures de performance (voir stats.py).
+
+        'stats' affiche le rapport, 'stats reset' efface les mesures et
+        'stats trace <fichier>' exporte la trace au format Chrome trace-event
+        dans le dossier TRACE_DIR. Les mesures s'activent au lancement
+        (--stats) : elles sont communes à tout le processus.
+        """
+        if not game.admin:
+            display("\n⛔ Commande réservée à l'administrateur.\n")
+            return False
+        arguments = list_of_words[1:]
+        action = arguments[0].lower() if arguments else ""
+        if not arguments:
+            display(STATS.report())
+        elif action == "reset" and len(arguments) == 1:
+            STATS.reset()
+            display("\n📊 Mesures effacées.\n")
+        elif action == "trace" and len(arguments) >= 2:
+            try:
+                path = trace_path(" ".join(arguments[1:]))
+                STATS.export_trace(path)
+            except ValueError as error:
+                display(f"\n{error} La trace est rangée dans '{TRACE_DIR}/'.\n")
+                return False
+            except OSError as error:
+                display(f"\nImpossible d'écrire la trace : {error}\n")
+                return False
+            display(f"\n📊 Trace exportée ({len(STATS.events)} événements) : {path}\n")
+        else:
+            display(STATS_USAGE)
+            return False
+        return True
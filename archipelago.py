@@ -0,0 +1,185 @@
+"""
+Module de génération procédurale d'archipels.
+Construit de grands mondes (jusqu'au million de salles) pour éprouver le moteur.
+
+Chaque île est une grille de salles reliées N/E/S/O ; toutes les salles
+d'une île restent accessibles (arbre couvrant en peigne), et la connectivité
+règle la proportion de passages supplémentaires. Les îles sont reliées en
+chaîne : la dernière salle d'une île mène (E) au port de la suivante (O).
+
+Le résultat est un World (voir world_loader.py) fait de Room, Character et
+Quest ordinaires, utilisable tel quel par Game. Le monde ne dépend que des
+paramètres et de la graine.
+
+Usage : python archipelago.py [--islands 100] [--rooms-per-island 100] [--seed 0]
+                              [--connectivity 0.5] [--items-per-room 0.5]
+                              [--npc-density 0.05] [--quests 10] [--play]
+"""
+import argparse
+import gc
+import random
+import time
+
+from bitset import Bitset
+from character import Character
+from game import Game
+from item import ITEMS
+from objectives import VisitObjective
+from quests import ExplorationQuest, Quest
+from room import Room
+from world_loader import World
+
+# Lieux d'une île, choisis tour à tour pour nommer les salles
+PLACES = ("la crique", "la plage", "la forêt", "la grotte", "la falaise", "le lagon",
+          "le marais", "le récif")
+DESCRIPTIONS = ("le sable est chaud.", "les palmiers bruissent.", "l'air sent le sel.",
+                "des mouettes crient au loin.", "une brume épaisse flotte.")
+# Objets semés dans les salles : (nom, description, poids)
+CATALOGUE = (("pièce", "une pièce d'or", 0.1),
+             ("corde", "une corde de chanvre", 1.0),
+             ("noix de coco", "une noix de coco", 0.5),
+             ("bouteille", "une bouteille de rhum", 0.8))
+# Nombre d'objectifs des quêtes de visite
+VISIT_OBJECTIVES = 3
+
+
+def _island_rooms(island, size, connectivity, rng):
+    """
+    Construit les salles d'une île, en grille.
+
+    Returns:
+        list: Les salles ; la première est le port, la dernière mène à l'île suivante.
+    """
+    width = max(1, int(size ** 0.5))
+    rooms = [Room(f"{PLACES[index % len(PLACES)]} {index} de l'île {island}",
+                  DESCRIPTIONS[index % len(DESCRIPTIONS)])
+             for index in range(size)]
+    rand = rng.random
+    for index, room in enumerate(rooms):
+        column = index % width
+        if column + 1 < width and index + 1 < size:
+            east = rooms[index + 1]
+            room.exits["E"] = east
+            east.exits["O"] = room
+        # Arbre couvrant : la première colonne est toujours reliée vers le sud
+        if index + width < size and (column == 0 or rand() < connectivity):
+            south = rooms[index + width]
+            room.exits["S"] = south
+            south.exits["N"] = room
+    return rooms
+
+
+def _seed_items(rooms, items_per_room, rng):
+    """Sème en moyenne items_per_room piles d'objets par salle."""
+    prototypes = [ITEMS.register(*entry).name for entry in CATALOGUE]
+    whole, fraction = divmod(items_per_room, 1)
+    whole = int(whole)
+    rand = rng.random
+    for room in rooms:
+        stacks = whole + (1 if rand() < fraction else 0)
+        for _ in range(stacks):
+            room.inventory.add(prototypes[int(rand() * len(prototypes))], 1 + int(rand() * 5))
+
+
+def _place_characters(rooms, npc_density, rng):
+    """Place npc_density PNJ par salle en moyenne, au hasard."""
+    characters = []
+    rand = rng.random
+    for index in range(int(len(rooms) * npc_density)):
+        room = rooms[int(rand() * len(rooms))]
+        npc = Character(f"Matelot {index}", "un matelot de l'archipel", room,
+                        ["Ohé, Capitaine !"])
+        room.add_character(npc)
+        characters.append(npc)
+    return characters
+
+
+def _make_quests(rooms, islands, size, quest_count, rng):
+    """
+    Crée les quêtes : l'exploration de chaque île d'abord, puis des quêtes
+    de visite de quelques salles tirées au hasard.
+    """
+    quests = []
+    for number in range(quest_count):
+        if number < islands:
+            start = number * size
+            region = Bitset(range(start, start + size), len(rooms))
+            quests.append(ExplorationQuest(f"Explorer l'île {number}",
+                                           f"Visitez les {size} lieux de l'île {number}.",
+                                           region, f"Carte de l'île {number}"))
+        else:
+            targets = [rooms[int(rng.random() * len(rooms))].name
+                       for _ in range(VISIT_OBJECTIVES)]
+            quests.append(Quest(f"Expédition {number}", "Rejoignez ces lieux.",
+                                [VisitObjective(name) for name in targets],
+                                f"Trésor de l'expédition {number}"))
+    return quests
+
+
+def generate_archipelago(islands=10, rooms_per_island=100, connectivity=0.5,
+                         items_per_room=0.5, npc_density=0.05, quest_count=10, seed=0):
+    """
+    Génère un archipel.
+
+    Args:
+        islands (int): Nombre d'îles.
+        rooms_per_island (int): Nombre de salles par île.
+        connectivity (float): Proportion (0 à 1) des passages nord-sud en plus de l'arbre couvrant.
+        items_per_room (float): Nombre moyen de piles d'objets par salle.
+        npc_density (float): Nombre moyen de PNJ par salle.
+        quest_count (int): Nombre de quêtes, toutes actives au départ.
+        seed (int): Graine du générateur.
+
+    Returns:
+        World: Le monde généré ; il commence au port de la première île.
+    """
+    if islands < 1 or rooms_per_island < 1:
+        raise ValueError("Il faut au moins une île d'au moins une salle.")
+    rng = random.Random(seed)
+    # Des millions d'objets créés d'un coup, tous gardés : le ramasse-miettes
+    # les parcourrait encore et encore sans rien libérer.
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        rooms = []
+        for island in range(islands):
+            island_rooms = _island_rooms(island, rooms_per_island, connectivity, rng)
+            if rooms:
+                rooms[-1].exits["E"] = island_rooms[0]
+                island_rooms[0].exits["O"] = rooms[-1]
+            rooms.extend(island_rooms)
+        _seed_items(rooms, items_per_room, rng)
+        characters = _place_characters(rooms, npc_density, rng)
+        quests = _make_quests(rooms, islands, rooms_per_island, quest_count, rng)
+    finally:
+        if collecting:
+            gc.enable()
+    return World(rooms, characters, quests, [quest.title for quest in quests], rooms[0])
+
+
+def main():
+    """Point d'entrée : génère un archipel, affiche sa taille et le temps de génération."""
+    parser = argparse.ArgumentParser(description="Génère un archipel procédural.")
+    parser.add_argument("--islands", type=int, default=100)
+    parser.add_argument("--rooms-per-island", type=int, default=100)
+    parser.add_argument("--connectivity", type=float, default=0.5)
+    parser.add_argument("--items-per-room", type=float, default=0.5)
+    parser.add_argument("--npc-density", type=float, default=0.05)
+    parser.add_argument("--quests", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--play", action="store_true", help="joue dans l'archipel généré")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    world = generate_archipelago(args.islands, args.rooms_per_island, args.connectivity,
+                                 args.items_per_room, args.npc_density, args.quests,
+                                 args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"{len(world.rooms)} salles, {len(world.characters)} PNJ, "
+          f"{len(world.quests)} quêtes générés en {elapsed:.2f} s (graine {args.seed})")
+    if args.play:
+        Game(prebuilt_world=world, seed=args.seed).play()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""
+Module de mesure des performances (micro et macro benchmarks).
+
+Mesure les chemins critiques du moteur sur des mondes synthétiques (grilles
+de 10, 1 000 et 100 000 salles) :
+    - Game.process_command, par type de commande ;
+    - QuestManager.check_room_objectives selon le nombre de quêtes actives ;
+    - QuestManager.notify selon le nombre de quêtes verrouillées ;
+    - un tour de déplacement des PNJ (NPCEngine.tick) selon le nombre de PNJ ;
+    - l'horloge du monde (TimingWheel) selon le nombre d'événements en attente ;
+    - l'avance rapide du monde (Game.fast_forward) ;
+    - la génération d'un archipel procédural (archipelago.py) ;
+    - le rendu de Room.get_long_description et de 'look' ;
+    - le débit de parties complètes rejouées en mode headless.
+
+Toutes les parties utilisent la même graine (SEED) : deux versions du code
+sont mesurées sur exactement la même charge. Les résultats sont écrits en
+JSON (microsecondes par opération, médiane de plusieurs séries) et comparés
+à une référence (baseline.json) : toute mesure
+plus lente que la référence au-delà de la tolérance est signalée et le
+programme se termine avec le code 1. La référence dépend de la machine :
+elle se régénère avec --update-baseline sur la machine de mesure.
+
+Usage : python benchmarks/bench.py [--sizes 10 1000 100000] [--output resultats.json]
+                                   [--baseline benchmarks/baseline.json]
+                                   [--tolerance 0.25] [--update-baseline]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# pylint: disable=wrong-import-position
+from archipelago import generate_archipelago
+from character import Character
+from console import discard, output_channel
+from game import Game
+from headless import replay
+from quests import Quest, QuestManager
+from room import Room
+from npc_engine import NPCEngine
+from scheduler import TimingWheel
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SIZES = (10, 1000, 100000)
+NPC_COUNTS = (100, 10000, 100000)
+QUEST_COUNTS = (1, 100, 10000)
+EVENT_COUNTS = (1000, 100000)
+SEED = 0
+FAST_FORWARD_TICKS = 100
+
+# Commandes mesurées : nom -> lignes jouées à chaque opération (aller-retour si besoin)
+COMMANDS = {
+    "look": ("look",),
+    "check": ("check",),
+    "go": ("go E", "go O"),
+    "take_drop": ("take pièce", "drop pièce"),
+    "take_drop_bulk": ("take all", "drop all"),
+    "talk": ("talk matelot 0",),
+    "where": ("where matelot 0",),
+    "history": ("history",),
+    "quests": ("quests",),
+    "help": ("help",),
+    "unknown": ("xyzzy",),
+}
+
+SESSION_SCRIPT = ["look", "take 5 pièce", "check", "go E", "go E", "go S", "look",
+                  "back", "history", "quests", "where matelot 1", "go O", "drop all", "quit"]
+
+
+def grid_world(room_count, npc_count=None, seed=0):
+    """
+    Construit un monde synthétique au format des fichiers de monde : une grille
+    de salles reliées N/E/S/O, de l'or dans la première salle et des PNJ.
+
+    Args:
+        room_count (int): Nombre de salles.
+        npc_count (int): Nombre de PNJ (défaut: une salle sur dix, au moins 3).
+        seed (int): Graine du placement des PNJ.
+
+    Returns:
+        dict: Le monde (données JSON décodées).
+    """
+    rng = random.Random(seed)
+    width = max(1, int(room_count ** 0.5))
+    rooms = []
+    for index in range(room_count):
+        exits = {}
+        if index % width + 1 < width and index + 1 < room_count:
+            exits["E"] = f"r{index + 1}"
+        if index % width > 0:
+            exits["O"] = f"r{index - 1}"
+        if index + width < room_count:
+            exits["S"] = f"r{index + width}"
+        if index >= width:
+            exits["N"] = f"r{index - width}"
+        rooms.append({"id": f"r{index}", "name": f"Salle {index}",
+                      "description": "une salle générée.", "exits": exits})
+    rooms[0]["inventory"] = {"pièce": {"description": "une pièce d'or", "weight": 0.1,
+                                       "quantity": 10}}
+    if npc_count is None:
+        npc_count = max(3, room_count // 10)
+    characters = [{"name": f"Matelot {i}", "description": "un matelot",
+                   "room": f"r{0 if i == 0 else rng.randrange(room_count)}",
+                   "msgs": ["Ohé !"]} for i in range(npc_count)]
+    quests = [{"title": "Cartographe", "description": "Explorer la grille.",
+               "explore": {"exclude": []}, "active": True}]
+    return {"start": "r0", "rooms": rooms, "characters": characters, "quests": quests}
+
+
+def measure(func, number, repeat=5):
+    """
+    Mesure le temps d'un appel (médiane de plusieurs séries).
+
+    Args:
+        func (callable): La fonction à mesurer, sans argument.
+        number (int): Nombre d'appels par série.
+        repeat (int): Nombre de séries.
+
+    Returns:
+        dict: {"us": médiane, "min_us": meilleure série} en microsecondes par appel.
+    """
+    func()  # échauffement
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter_ns() - start) / number / 1000)
+    return {"us": round(statistics.median(samples), 3), "min_us": round(min(samples), 3)}
+
+
+def _world_file(folder, room_count):
+    """Écrit le monde synthétique d'une taille donnée et retourne son chemin."""
+    path = os.path.join(folder, f"grille_{room_count}.json")
+    with open(path, "w", encoding="utf-8") as world_file:
+        json.dump(grid_world(room_count), world_file, ensure_ascii=False)
+    return path
+
+
+def bench_commands(world_path, room_count, results, number):
+    """Mesure Game.process_command pour chaque type de commande."""
+    game = Game(input_func=lambda prompt="": "", output_func=discard, world_file=world_path,
+                seed=SEED)
+    with output_channel(discard):
+        game.setup("Bench")
+    for name, lines in COMMANDS.items():
+        def play(lines=lines):
+            for line in lines:
+                game.process_command(line)
+        timing = measure(play, number)
+        timing = {key: round(value / len(lines), 3) for key, value in timing.items()}
+        results[f"process_command.{name}[rooms={room_count}]"] = timing
+
+
+def bench_rendering(world_path, room_count, results, number):
+    """
+    Mesure le rendu d'une salle (description, puis 'look' complet).
+
+    Contrairement à discard, le canal utilisé ici reçoit vraiment le texte :
+    toute la mise en forme est comptée, seule l'écriture finale est évitée.
+    La salle ne change pas entre deux appels : c'est le cas courant, servi
+    par les rendus mémorisés (render_cache.py).
+    """
+    written = []
+
+    def sink(text, **_options):
+        written.append(text)
+    game = Game(input_func=lambda prompt="": "", output_func=sink, world_file=world_path,
+                seed=SEED)
+    game.setup("Bench")
+    room = game.player.current_room
+    results[f"render.long_description[rooms={room_count}]"] = measure(
+        room.get_long_description, number)
+
+    def look():
+        game.process_command("look")
+        written.clear()
+    results[f"render.look[rooms={room_count}]"] = measure(look, number)
+
+
+def bench_session(world_path, room_count, results, number):
+    """Mesure une partie complète rejouée en mode headless (setup compris)."""
+    results[f"session.replay[rooms={room_count}]"] = measure(
+        lambda: replay(SESSION_SCRIPT, "Bench", discard, world_path, SEED), number, repeat=3)
+
+
+def bench_fast_forward(world_path, room_count, results, number):
+    """Mesure l'avance rapide du monde (temps par tick, sans affichage)."""
+    game = Game(input_func=lambda prompt="": "", output_func=discard, world_file=world_path,
+                seed=SEED)
+    game.setup("Bench")
+    timing = measure(lambda: game.fast_forward(FAST_FORWARD_TICKS), number, repeat=3)
+    results[f"world.fast_forward_tick[rooms={room_count}]"] = {
+        key: round(value / FAST_FORWARD_TICKS, 3) for key, value in timing.items()}
+
+
+def bench_quests(results, number):
+    """Mesure QuestManager.check_room_objectives selon le nombre de quêtes actives."""
+    for quest_count in QUEST_COUNTS:
+        manager = QuestManager()
+        for index in range(quest_count):
+            quest = Quest(f"Quête {index}", "", [f"Visiter Salle {index}", "Répondre 42"])
+            quest.is_active = True
+            manager.add_quest(quest)
+        names = [f"Autre salle {i}" for i in range(64)]
+        cycle = iter(())
+
+        def visit(manager=manager, names=names):
+            nonlocal cycle
+            name = next(cycle, None)
+            if name is None:
+                cycle = iter(names)
+                name = next(cycle)
+            manager.check_room_objectives(name)
+        results[f"quests.check_room_objectives[active={quest_count}]"] = measure(visit, number)
+
+    # Chaîne de quêtes verrouillées : chacune attend la précédente
+    for quest_count in QUEST_COUNTS:
+        manager = QuestManager()
+        for index in range(quest_count + 1):
+            requires = [f"Quête {index - 1}"] if index else None
+            manager.add_quest(Quest(f"Quête {index}", "", ["Répondre 42"], requires=requires))
+        key = ("quest", f"Quête {quest_count // 2}")
+        results[f"quests.notify[locked={quest_count}]"] = measure(
+            lambda manager=manager, key=key: manager.notify(key), number)
+
+
+def bench_npcs(results, number):
+    """Mesure un tour de déplacement des PNJ selon leur nombre (1 000 salles)."""
+    rooms = [Room(f"Salle {i}", "") for i in range(1000)]
+    for index, room in enumerate(rooms):
+        room.exits = {"E": rooms[(index + 1) % 1000], "O": rooms[index - 1]}
+    for npc_count in NPC_COUNTS:
+        rng = random.Random(0)
+        characters = []
+        for index in range(npc_count):
+            room = rooms[rng.randrange(len(rooms))]
+            npc = Character(f"Matelot {index}", "", room)
+            characters.append(npc)
+        engine = NPCEngine(rooms, characters, rng=rng)
+        observed = (rooms[0],)
+        with output_channel(discard):
+            results[f"npcs.tick[npcs={npc_count}]"] = measure(
+                lambda engine=engine, observed=observed: engine.tick(observed),
+                max(1, number // 10))
+
+
+def bench_clock(results, number):
+    """Mesure la programmation d'un événement et un tick selon le nombre d'événements en attente."""
+    for event_count in EVENT_COUNTS:
+        rng = random.Random(SEED)
+        clock = TimingWheel()
+        for index in range(event_count):
+            clock.every(rng.randrange(1, 100000), index, first=rng.randrange(1, 100000))
+
+        def schedule(clock=clock, rng=rng):
+            clock.cancel(clock.schedule(rng.randrange(1, 100000), None))
+        results[f"clock.schedule[pending={event_count}]"] = measure(schedule, number)
+        results[f"clock.advance[pending={event_count}]"] = measure(clock.advance, number)
+
+
+def bench_generation(sizes, results):
+    """Mesure la génération d'un archipel (îles de 100 salles) pour chaque taille."""
+    for room_count in sizes:
+        islands = max(1, room_count // 100)
+        results[f"world.generate_archipelago[rooms={room_count}]"] = measure(
+            lambda islands=islands: generate_archipelago(islands, 100, seed=SEED), 1, repeat=3)
+
+
+def run(sizes, number):
+    """
+    Lance toutes les mesures.
+
+    Returns:
+        dict: Les résultats, par nom de mesure.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for room_count in sizes:
+            world_path = _world_file(folder, room_count)
+            bench_commands(world_path, room_count, results, number)
+            bench_rendering(world_path, room_count, results, number)
+            bench_session(world_path, room_count, results,
+                          max(1, number // 100) if room_count <= 1000 else 1)
+            bench_fast_forward(world_path, room_count, results, max(1, number // 100))
+    bench_quests(results, number)
+    bench_npcs(results, number)
+    bench_clock(results, number)
+    bench_generation(sizes, results)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare des résultats à la référence.
+
+    La comparaison porte sur la meilleure série (min_us), moins sensible que
+    la médiane aux perturbations de la machine.
+
+    Returns:
+        list: Les régressions : (nom, référence, mesure, rapport).
+    """
+    regressions = []
+    for name, timing in sorted(results.items()):
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"  (nouveau)  {name:55} {timing['us']:>12.3f} µs")
+            continue
+        ratio = timing["min_us"] / reference["min_us"] if reference["min_us"] else 1.0
+        flag = "RÉGRESSION" if ratio > 1 + tolerance else "ok"
+        print(f"  {flag:10} {name:55} {timing['us']:>12.3f} µs  (x{ratio:.2f})")
+        if ratio > 1 + tolerance:
+            regressions.append((name, reference["min_us"], timing["min_us"], ratio))
+    return regressions
+
+
+def main():
+    """Point d'entrée des benchmarks."""
+    parser = argparse.ArgumentParser(description="Benchmarks du moteur de jeu.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="tailles de monde (nombre de salles)")
+    parser.add_argument("--number", type=int, default=200, help="appels par série")
+    parser.add_argument("--output", default=None, help="fichier JSON des résultats")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="fichier de référence")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="ralentissement toléré (0.25 = +25 %%)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="enregistre les résultats comme nouvelle référence")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.number)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(report, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write("\n")
+        print(f"Référence mise à jour : {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} régression(s) au-delà de +{args.tolerance:.0%}.")
+        return 1
+    print("\nAucune régression.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Module définissant la classe Bitset.
+Ensemble de numéros (ex: Room.id) stocké sur un bit par numéro.
+
+Sur une carte de 100 000 salles, un ensemble de salles ne pèse que 12,5 Ko,
+et le nombre de salles communes à deux ensembles se calcule d'un coup
+(popcount de leur intersection) sans parcourir les salles une à une.
+"""
+
+
+class Bitset:
+    """
+    Ensemble d'entiers positifs, un bit par entier.
+
+    Attributes:
+        bits (bytearray): Les bits (le bit i de l'octet n représente 8 * n + i).
+    """
+
+    __slots__ = ("bits", "_count")
+
+    def __init__(self, members=(), size=0):
+        """
+        Constructeur de l'ensemble.
+
+        Args:
+            members (iterable): Entiers présents au départ.
+            size (int): Nombre d'entiers prévus (réserve la place d'emblée).
+        """
+        self.bits = bytearray((size + 7) // 8)
+        self._count = 0
+        for member in members:
+            self.add(member)
+
+    def __len__(self):
+        """Nombre d'entiers présents (tenu à jour, sans popcount)."""
+        return self._count
+
+    def __contains__(self, member):
+        """Indique si un entier est présent."""
+        byte = member >> 3
+        return byte < len(self.bits) and bool(self.bits[byte] & (1 << (member & 7)))
+
+    def __iter__(self):
+        """Parcourt les entiers présents, dans l'ordre croissant."""
+        for byte_index, byte in enumerate(self.bits):
+            while byte:
+                low = byte & -byte
+                yield (byte_index << 3) + low.bit_length() - 1
+                byte ^= low
+
+    def add(self, member):
+        """
+        Ajoute un entier.
+
+        Returns:
+            bool: True si l'entier n'était pas encore présent.
+        """
+        byte = member >> 3
+        if byte >= len(self.bits):
+            self.bits.extend(bytes(byte + 1 - len(self.bits)))
+        mask = 1 << (member & 7)
+        if self.bits[byte] & mask:
+            return False
+        self.bits[byte] |= mask
+        self._count += 1
+        return True
+
+    def as_int(self):
+        """Retourne l'ensemble sous forme d'un entier (le bit i représente i)."""
+        return int.from_bytes(self.bits, "little")
+
+    def intersection_count(self, other):
+        """Nombre d'entiers présents dans les deux ensembles (popcount de l'intersection)."""
+        return (self.as_int() & other.as_int()).bit_count()
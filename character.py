@@ -1,10 +1,23 @@
 """
 Module définissant la classe Character.
-Gère les PNJ, leurs dialogues et leurs déplacements.
+Gère les PNJ et leurs dialogues ; leurs déplacements sont simulés par
+NPCEngine (npc_engine.py).
 """
-import random
+import unicodedata
+
+from console import display
+
+
+def name_key(name):
+    """
+    Clé de recherche d'un nom : sans accents ni majuscules, espaces normalisés.
+
+    Ex: name_key("  Père FOURAS ") == name_key("pere fouras") == "pere fouras".
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
 
-# Note: L'import de DEBUG se fait localement dans move() pour éviter l'import circulaire.
 
 class Character:
     """
@@ -15,9 +28,11 @@ class Character:
         description (str): Description du personnage.
         current_room (Room): Salle actuelle du personnage.
         msgs (list): Liste des messages que le personnage peut dire.
+        mobile (bool): Si le personnage se déplace entre les salles.
+        key (str): Clé de recherche du nom (voir name_key).
     """
 
-    def __init__(self, name, description, current_room, msgs=None):
+    def __init__(self, name, description, current_room, msgs=None, mobile=True):
         """
         Constructeur de la classe Character.
         """
@@ -25,55 +40,21 @@ class Character:
         self.description = description
         self.current_room = current_room
         self.msgs = list(msgs) if msgs is not None else []
+        self.mobile = mobile
+        self.key = name_key(name)
 
     def __str__(self):
         """Représentation textuelle du personnage."""
         return f"{self.name} : {self.description} ({self.current_room.name})"
 
-    def move(self) -> bool:
-        """
-        Déplace le PNJ aléatoirement dans une pièce adjacente.
-
-        Returns:
-            bool: True si le déplacement a eu lieu, False sinon.
-        """
-        # Import local pour éviter l'import circulaire avec game.py
-        # pylint: disable=import-outside-toplevel
-        try:
-            from game import DEBUG
-        except ImportError:
-            DEBUG = False
-
-        # 1. Le personnage a une chance sur deux de se déplacer
-        if random.choice([True, False]):
-            exits = self.current_room.exits
-            available_exits = [room for room in exits.values() if room is not None]
-
-            if available_exits:
-                next_room = random.choice(available_exits)
-                old_room_name = self.current_room.name
-                new_room_name = next_room.name
-
-                self.current_room.remove_character(self)
-                next_room.add_character(self)
-
-                if DEBUG:
-                    print(f"DEBUG: {self.name} s'est déplacé de "
-                          f"'{old_room_name}' vers '{new_room_name}'.")
-                return True
-
-        if DEBUG:
-            print(f"DEBUG: {self.name} a décidé de ne pas bouger.")
-        return False
-
     def get_msg(self):
         """
         Affiche le prochain message du PNJ et le remplace en fin de liste (cycle).
         """
         if not self.msgs:
-            print(f"{self.name} n'a rien à dire.")
+            display(f"{self.name} n'a rien à dire.")
             return
 
         message = self.msgs.pop(0)
-        print(message)
+        display(message)
         self.msgs.append(message)
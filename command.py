@@ -1,8 +1,17 @@
 """
-Module définissant la classe Command.
-Structure les commandes disponibles dans le jeu.
+Module définissant les classes Command et CommandDispatcher.
+Structure les commandes disponibles dans le jeu et analyse les saisies.
 """
 
+# Messages d'erreur constants
+MSG0 = "\nLa commande '{command_word}' ne prend pas de paramètre.\n"
+MSG1 = "\nLa commande '{command_word}' prend 1 seul paramètre.\n"
+MSGN = "\nLa commande '{command_word}' prend {count} paramètres.\n"
+MSG_VARIADIC = "\nLa commande '{command_word}' attend au moins {count} paramètre(s).\n"
+MSG_UNKNOWN = "\nCommande '{command_word}' non reconnue. Entrez 'help'.\n"
+MSG_AMBIGUOUS = "\nCommande '{command_word}' ambiguë : {candidates}.\n"
+
+
 class Command:
     """
     Classe représentant une commande du jeu.
@@ -12,19 +21,153 @@ class Command:
         help_string (str): Le message d'aide.
         action (callable): La fonction à exécuter.
         number_of_parameters (int): Le nombre de paramètres attendus.
+        variadic (bool): Accepte aussi davantage de paramètres (ex: un nom en plusieurs mots).
+        aliases (dict): Raccourcis -> paramètres implicites (ex: {"n": ["N"]} pour go).
+        normalize (callable): Transforme chaque paramètre avant l'action (ou None).
+        duration (int): Ticks de temps du monde que prend la commande (0 = instantanée).
     """
 
-    def __init__(self, command_word, help_string, action, number_of_parameters):
+    def __init__(self, command_word, help_string, action, number_of_parameters,
+                 variadic=False, aliases=None, normalize=None, duration=0):
         """
         Constructeur de la classe Command.
         """
+        # pylint: disable=too-many-arguments
         self.command_word = command_word
         self.help_string = help_string
         self.action = action
         self.number_of_parameters = number_of_parameters
+        self.variadic = variadic
+        self.aliases = dict(aliases) if aliases else {}
+        self.normalize = normalize
+        self.duration = duration
+
+    def check_parameters(self, list_of_words):
+        """
+        Vérifie le nombre de paramètres d'une saisie.
+
+        Returns:
+            str | None: Le message d'erreur, ou None si la saisie est valide.
+        """
+        count = len(list_of_words) - 1
+        expected = self.number_of_parameters
+        if self.variadic:
+            if count >= expected:
+                return None
+            return MSG_VARIADIC.format(command_word=list_of_words[0], count=expected)
+        if count == expected:
+            return None
+        if expected == 0:
+            return MSG0.format(command_word=list_of_words[0])
+        if expected == 1:
+            return MSG1.format(command_word=list_of_words[0])
+        return MSGN.format(command_word=list_of_words[0], count=expected)
 
     def __str__(self):
         """
         Retourne la représentation textuelle de la commande (pour l'aide).
         """
         return self.command_word + self.help_string
+
+
+class _TrieNode:
+    """Noeud de l'arbre des préfixes de mots de commande."""
+
+    __slots__ = ("children", "entry", "unique", "count")
+
+    def __init__(self):
+        self.children = {}
+        self.entry = None   # (commande, paramètres implicites) si un mot finit ici
+        self.unique = None  # l'entrée, si un seul mot passe par ce noeud
+        self.count = 0      # nombre de mots qui passent par ce noeud
+
+    def words(self, prefix):
+        """Retourne, triés, les mots qui finissent sous ce noeud (prefix : le chemin du noeud)."""
+        words = []
+        pending = [(self, prefix)]
+        while pending:
+            node, path = pending.pop()
+            if node.entry is not None:
+                words.append(path)
+            pending.extend((child, path + char) for char, child in node.children.items())
+        return sorted(words)
+
+
+class CommandDispatcher:
+    """
+    Répartiteur de commandes compilé une fois pour toutes.
+
+    Les mots de commande et leurs raccourcis sont rangés dans un arbre de
+    préfixes : retrouver une commande coûte la longueur du mot tapé, quel que
+    soit le nombre de commandes. Un préfixe sans ambiguïté suffit ("his" pour
+    history) et les raccourcis peuvent fournir des paramètres ("n" -> go N).
+    """
+
+    def __init__(self):
+        """Constructeur du répartiteur."""
+        self._root = _TrieNode()
+        self._words = {}
+
+    def register(self, command):
+        """Enregistre une commande et ses raccourcis."""
+        self._insert(command.command_word, (command, ()))
+        for alias, implicit in command.aliases.items():
+            self._insert(alias, (command, tuple(implicit)))
+
+    def _insert(self, word, entry):
+        """Ajoute un mot dans l'arbre des préfixes."""
+        word = word.lower()
+        if word in self._words:
+            raise ValueError(f"Mot de commande en double : '{word}'")
+        self._words[word] = entry
+        node = self._root
+        for char in word:
+            node = node.children.setdefault(char, _TrieNode())
+            node.count += 1
+            node.unique = entry if node.count == 1 else None
+        node.entry = entry
+
+    def resolve(self, word):
+        """
+        Retrouve la commande correspondant à un mot (exact, raccourci ou préfixe unique).
+
+        Returns:
+            tuple: (entrée, message d'erreur) ; l'entrée vaut None en cas d'erreur.
+        """
+        node = self._root
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                return None, MSG_UNKNOWN.format(command_word=word)
+        if node.entry is not None:
+            return node.entry, None
+        if node.unique is not None:
+            return node.unique, None
+        if not word:
+            return None, MSG_UNKNOWN.format(command_word=word)
+        # Les candidats sont les mots du sous-arbre du préfixe, pas tout le dictionnaire
+        return None, MSG_AMBIGUOUS.format(command_word=word,
+                                          candidates=", ".join(node.words(word)))
+
+    def parse(self, command_string):
+        """
+        Analyse une saisie.
+
+        Returns:
+            tuple: (commande, liste de mots, message d'erreur). La liste de mots
+            commence par le mot de commande complet, suivi des paramètres normalisés.
+        """
+        words = command_string.split()
+        word = words[0].lower() if words else ""
+        entry, error = self.resolve(word)
+        if entry is None:
+            return None, None, error
+
+        command, implicit = entry
+        list_of_words = [command.command_word, *implicit, *words[1:]]
+        error = command.check_parameters(list_of_words)
+        if error is not None:
+            return None, None, error
+        if command.normalize is not None:
+            list_of_words[1:] = [command.normalize(p) for p in list_of_words[1:]]
+        return command, list_of_words, None
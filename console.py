@@ -0,0 +1,119 @@
+"""
+Module définissant les canaux de sortie du jeu.
+Permet de brancher le moteur sur un terminal, un script ou un réseau.
+
+Pendant un tour, tous les messages sont accumulés dans un tampon (OutputBuffer)
+puis envoyés au canal en une seule écriture à la fin du tour. Chaque message
+porte une catégorie (narration, quête, debug) ; les catégories désactivées
+sont ignorées avant toute mise en forme.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Catégories de messages
+NARRATION = "narration"
+QUEST = "quest"
+DEBUG = "debug"
+ALL_CATEGORIES = frozenset((NARRATION, QUEST, DEBUG))
+
+# Tampon du tour en cours (None = écriture directe vers le terminal).
+# Un ContextVar isole chaque partie, même entre tâches asyncio.
+_output = ContextVar("output", default=None)
+
+
+def discard(*_args, **_kwargs):
+    """Canal de sortie qui ignore tous les messages (mode sans affichage)."""
+    return None
+
+
+class OutputBuffer:
+    """
+    Tampon de sortie d'un tour.
+
+    Attributes:
+        channel (callable | None): Canal au format de print(), ou None pour le terminal.
+        categories (frozenset): Catégories de messages conservées.
+        parts (list): Messages accumulés depuis la dernière écriture.
+    """
+
+    __slots__ = ("channel", "categories", "parts")
+
+    def __init__(self, channel=None, categories=ALL_CATEGORIES):
+        """
+        Constructeur du tampon.
+
+        Args:
+            channel (callable): Canal au format de print(), ou None pour le terminal.
+            categories (iterable): Catégories conservées (aucune si le canal est discard).
+        """
+        self.channel = channel
+        self.categories = frozenset() if channel is discard else frozenset(categories)
+        self.parts = []
+
+    def flush(self):
+        """Envoie au canal, en une seule écriture, tout ce qui a été accumulé."""
+        if not self.parts:
+            return
+        text = "".join(self.parts)
+        self.parts.clear()
+        if self.channel is None:
+            print(text, end="")
+        else:
+            self.channel(text, end="")
+
+
+def display(*args, sep=" ", end="\n", category=NARRATION):
+    """
+    Écrit un message sur le canal de sortie courant.
+
+    S'utilise comme print(), avec en plus la catégorie du message.
+    """
+    buffer = _output.get()
+    if buffer is None:
+        print(*args, sep=sep, end=end)
+    elif category in buffer.categories:
+        buffer.parts.append(sep.join(map(str, args)) + end)
+
+
+def enabled(category):
+    """Indique si les messages d'une catégorie sont conservés par le canal courant."""
+    buffer = _output.get()
+    return buffer is None or category in buffer.categories
+
+
+def debug(template, *args):
+    """
+    Écrit un message de debug.
+
+    Le message n'est mis en forme (template.format(*args)) que si la
+    catégorie DEBUG est active : un debug désactivé ne coûte presque rien.
+    """
+    buffer = _output.get()
+    if buffer is not None and DEBUG not in buffer.categories:
+        return
+    display(template.format(*args) if args else template, category=DEBUG)
+
+
+@contextmanager
+def output_channel(channel, categories=ALL_CATEGORIES):
+    """
+    Redirige display() vers un canal le temps d'un bloc, avec une seule écriture à la fin.
+
+    Un bloc imbriqué vers le même canal réutilise le tampon englobant : un
+    tour complet (commande, PNJ, événements) donne une seule écriture.
+
+    Args:
+        channel (callable | None): Fonction au format de print(), ou None pour le terminal.
+        categories (iterable): Catégories de messages conservées.
+    """
+    current = _output.get()
+    if current is not None and current.channel is channel:
+        yield current
+        return
+    buffer = OutputBuffer(channel, categories)
+    token = _output.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _output.reset(token)
+        buffer.flush()
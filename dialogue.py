@@ -0,0 +1,239 @@
+"""
+Module du moteur de dialogues et de scènes.
+
+Une scène est un graphe de noeuds (Node). Un noeud affiche des lignes,
+applique des effets, puis attend une réponse parmi ses choix (Choice), ou
+passe directement au noeud suivant. Le moteur ne bloque jamais : il
+s'arrête sur la question posée et reprend quand la ligne suivante du joueur
+lui est donnée (DialogueEngine.feed). N'importe quel front (terminal, script,
+réseau) peut ainsi entrelacer les dialogues de nombreux joueurs.
+
+Les effets et les conditions sont décrits par des tuples (nom, argument),
+par exemple ("lose_crew", 1) ou ("quest_open", "Énigme du Phare I"), ou par
+une fonction qui reçoit la partie.
+"""
+from console import display
+
+
+def _quest_open(game, title):
+    """Indique si une quête est active et pas encore terminée."""
+    quest = game.player.quest_manager.get_quest_by_title(title)
+    return bool(quest and quest.is_active and not quest.is_completed)
+
+
+# Effets disponibles : nom -> fonction(game, argument)
+EFFECTS = {
+    "say": lambda game, text: display(text),
+    "lose_crew": lambda game, amount: game.player.lose_crew(amount),
+    "add_crew": lambda game, amount: game.player.add_crew(amount),
+    "give_gold": lambda game, amount: game.give_gold(amount),
+    "remove_gold": lambda game, amount: game.remove_gold(amount),
+    "say_status": lambda game, text: display(text.format(crew=game.player.crew)),
+    "start_scene": lambda game, scene_name: game.dialogue.start(scene_name),
+    "remove_item": lambda game, item_name: game.player.inventory.remove(item_name, nested=True),
+    "complete_objective": lambda game, text: game.player.quest_manager.complete_objective(text),
+    "respawn": lambda game, stack: game.respawn(*stack),
+}
+
+# Conditions disponibles : nom -> fonction(game, argument) -> bool
+CONDITIONS = {
+    "quest_open": _quest_open,
+    "has_gold": lambda game, amount: game.player.inventory.count("pièce", nested=True) >= amount,
+    "has_item": lambda game, item_name: game.player.inventory.count(item_name, nested=True) > 0,
+    "min_crew": lambda game, amount: game.player.crew >= amount,
+    "in_room": lambda game, room_name: game.player.current_room.name == room_name,
+}
+
+
+def apply_effects(game, effects):
+    """Applique une suite d'effets à la partie."""
+    for effect in effects:
+        if callable(effect):
+            effect(game)
+        else:
+            name, argument = effect
+            EFFECTS[name](game, argument)
+
+
+def check_condition(game, condition):
+    """Évalue une condition (None est toujours vraie)."""
+    if condition is None:
+        return True
+    if callable(condition):
+        return condition(game)
+    name, argument = condition
+    return CONDITIONS[name](game, argument)
+
+
+class Choice:
+    """
+    Réponse possible à un noeud.
+
+    Attributes:
+        answers (tuple): Réponses exactes acceptées (espaces ignorés).
+        contains (str): Mot qui, présent dans la réponse (casse ignorée), la valide.
+        effects (tuple): Effets appliqués si la condition est remplie.
+        condition: Condition à remplir pour appliquer effects.
+        otherwise (tuple): Effets appliqués si la condition n'est pas remplie.
+        goto (str): Noeud suivant (None = fin de la scène).
+    """
+
+    def __init__(self, answers=(), effects=(), goto=None, contains=None,
+                 condition=None, otherwise=()):
+        """Constructeur d'un choix."""
+        self.answers = tuple(answers)
+        self.contains = contains.lower() if contains else None
+        self.effects = tuple(effects)
+        self.goto = goto
+        self.condition = condition
+        self.otherwise = tuple(otherwise)
+
+    def matches(self, answer):
+        """Indique si la réponse (déjà nettoyée) correspond à ce choix."""
+        if answer in self.answers:
+            return True
+        return self.contains is not None and self.contains in answer.lower()
+
+
+class Node:
+    """
+    Étape d'une scène.
+
+    Attributes:
+        lines (tuple): Lignes affichées à l'arrivée (texte, ou fonction(game) -> texte).
+        effects (tuple): Effets appliqués à l'arrivée.
+        prompt (str): Invite affichée en attendant la réponse.
+        choices (tuple): Réponses attendues. Sans choix, on passe à next.
+        default (Choice): Choix appliqué à toute autre réponse.
+        invalid (str): Message pour une réponse invalide (si pas de default).
+        condition: Condition pour jouer ce noeud ; sinon on passe à next.
+        next (str): Noeud suivant (None = fin de la scène).
+    """
+
+    def __init__(self, lines=(), effects=(), prompt="> ", choices=(), default=None,
+                 invalid="Choix invalide.", condition=None, next=None):
+        """Constructeur d'un noeud."""
+        # pylint: disable=redefined-builtin,too-many-arguments
+        self.lines = tuple(lines)
+        self.effects = tuple(effects)
+        self.prompt = prompt
+        self.choices = tuple(choices)
+        self.default = default
+        self.invalid = invalid
+        self.condition = condition
+        self.next = next
+
+    @property
+    def waits_for_answer(self):
+        """Indique si le noeud attend une réponse du joueur."""
+        return bool(self.choices) or self.default is not None
+
+    def match(self, line):
+        """Retourne le choix correspondant à une ligne, ou None."""
+        answer = line.strip()
+        for choice in self.choices:
+            if choice.matches(answer):
+                return choice
+        return self.default
+
+
+class Scene:
+    """
+    Scène de dialogue : un graphe de noeuds nommés.
+
+    Attributes:
+        name (str): Nom de la scène.
+        nodes (dict): Noeuds de la scène, par nom.
+        start (str): Nom du premier noeud.
+    """
+
+    def __init__(self, name, nodes, start):
+        """Constructeur d'une scène."""
+        self.name = name
+        self.nodes = dict(nodes)
+        self.start = start
+
+
+class DialogueEngine:
+    """
+    Exécute les scènes d'une partie, une réponse à la fois.
+
+    Attributes:
+        game (Game): La partie.
+        scenes (dict): Scènes disponibles, par nom.
+        scene (Scene): Scène en cours (None si aucune).
+        node_name (str): Noeud qui attend une réponse.
+    """
+
+    def __init__(self, game, scenes):
+        """Constructeur du moteur."""
+        self.game = game
+        self.scenes = dict(scenes)
+        self.scene = None
+        self.node_name = None
+
+    @property
+    def active(self):
+        """Indique si une scène attend une réponse du joueur."""
+        return self.scene is not None
+
+    @property
+    def prompt(self):
+        """Invite de la question en cours."""
+        return self.scene.nodes[self.node_name].prompt
+
+    def start(self, scene_name):
+        """Démarre une scène et s'arrête sur sa première question."""
+        self.scene = self.scenes[scene_name]
+        self._enter(self.scene.start)
+
+    def _enter(self, node_name):
+        """Joue les noeuds à partir de node_name jusqu'à une question ou la fin."""
+        game = self.game
+        while node_name is not None:
+            node = self.scene.nodes[node_name]
+            if not check_condition(game, node.condition):
+                node_name = node.next
+                continue
+            for line in node.lines:
+                display(line(game) if callable(line) else line)
+            apply_effects(game, node.effects)
+            if node.waits_for_answer:
+                self.node_name = node_name
+                return
+            node_name = node.next
+        self.scene = None
+        self.node_name = None
+
+    def feed(self, line):
+        """
+        Donne la réponse du joueur à la question en cours.
+
+        Args:
+            line (str): La ligne saisie.
+        """
+        node = self.scene.nodes[self.node_name]
+        choice = node.match(line)
+        if choice is None:
+            display(node.invalid)
+            return
+        if check_condition(self.game, choice.condition):
+            apply_effects(self.game, choice.effects)
+        else:
+            apply_effects(self.game, choice.otherwise)
+        self._enter(choice.goto)
+
+    def state(self):
+        """Retourne (scène, noeud) en cours, ou None (pour la sauvegarde)."""
+        if self.scene is None:
+            return None
+        return [self.scene.name, self.node_name]
+
+    def restore(self, state):
+        """Replace le moteur sur une question sauvegardée."""
+        if state is None:
+            self.scene = None
+            self.node_name = None
+        else:
+            self.scene = self.scenes[state[0]]
+            self.node_name = state[1]
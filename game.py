@@ -2,56 +2,198 @@
 Module principal Game.
 Initialise le jeu, les salles, les personnages et la boucle principale.
 """
+import argparse
+import random
+
+from console import (ALL_CATEGORIES, DEBUG as DEBUG_CATEGORY, discard, display,
+                     output_channel)
 from room import Room
+from inventory import Inventory
+from item import ITEMS
 from player import Player
-from command import Command
-from actions import Actions
+from command import Command, CommandDispatcher
+from actions import Actions, normalize_direction
 from character import Character
-from quests import Quest
+from npc_engine import NPCEngine
+from world_graph import WorldGraph
+from world_loader import load_world
+from savegame import SaveManager
+from dialogue import DialogueEngine
+from scenes import SCENES
+from quests import ExplorationQuest, Quest
+from requirements import InRoom, MinimumStat
+from bitset import Bitset
+from stats import STATS, instrumented
+from triggers import ON_ENTER, ON_EXIT, Trigger, TriggerRegistry
+from gates import ExitCache, Gate
+from scheduler import TimedEvent, TimingWheel
 
 DEBUG = True
 
+# Prototype de la monnaie du jeu (donnée et retirée par les scènes)
+GOLD = ITEMS.register("pièce", "une pièce d'or", 0.1)
+
+
+def _move_npcs(game):
+    """Déplace les PNJ d'un pas (événement de l'horloge, à chaque tick)."""
+    game.npc_engine.tick(game.observed_rooms)
+
+
 class Game:
     """
     Classe principale du jeu.
     Gère l'initialisation et la boucle de jeu.
     """
 
-    def __init__(self):
-        """Constructeur du jeu."""
+    # (commandes, répartiteur) compilés une fois et partagés par toutes les parties
+    _command_table = None
+
+    def __init__(self, input_func=None, output_func=None, world_file=None, save_file=None,
+                 admin=True, seed=None, prebuilt_world=None, output_categories=None):
+        """
+        Constructeur du jeu.
+
+        Args:
+            input_func (callable): Canal d'entrée au format de input() (défaut: input).
+            output_func (callable): Canal de sortie au format de print() (défaut: terminal).
+            world_file (str): Fichier de monde JSON (défaut: le monde intégré).
+            save_file (str): Fichier de sauvegarde, repris s'il existe (défaut: aucune sauvegarde).
+            admin (bool): Autorise les commandes d'administration ('stats').
+            seed (int): Graine du hasard de la partie (défaut: tirée au hasard).
+            prebuilt_world (World): Monde déjà construit (ex: archipelago.py), à la
+                place du fichier de monde.
+            output_categories (frozenset): Catégories de messages affichées (défaut:
+                toutes, les messages de debug seulement si DEBUG).
+        """
+        self.input = input_func if input_func is not None else input
+        self.output = output_func
+        # Catégories de messages affichées (les messages de debug seulement si DEBUG)
+        if output_categories is None:
+            output_categories = ALL_CATEGORIES if DEBUG else ALL_CATEGORIES - {DEBUG_CATEGORY}
+        self.output_categories = output_categories
+        self.world_file = world_file
+        self.prebuilt_world = prebuilt_world
+        self.save_file = save_file
+        self.admin = admin
+        # Tout le hasard du monde (PNJ) vient de rng, réinitialisé à chaque tick à
+        # partir de (seed, ticks) : une partie se rejoue à l'identique.
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.ticks = 0
+        self.rng = random.Random(self.seed)
+        # Horloge du monde : événements programmés, déclenchés tick par tick
+        self.clock = TimingWheel()
+        self.clock.every(1, TimedEvent([_move_npcs]))
+        # Salles vues par le joueur pendant le tick en cours (voir NPCEngine.tick)
+        self.observed_rooms = ()
+        # Salles changées par l'horloge hors de la présence du joueur (voir SaveManager)
+        self.dirty_rooms = set()
+        self.save_manager = None
         self.finished = False
         self.rooms = []
+        self.world = None
         self.commands = {}
+        self.dispatcher = None
         self.player = None
         self.characters = []
-        self.storm_encountered = False
-        # Flags pour les messages uniques
-        self.fouras_done = False
-        self.fouras_hint_given = False
-
-    def setup(self):
-        """Configuration initiale du jeu."""
-        self._setup_commands()
-        self._setup_rooms_and_characters()
-        self._setup_player()
-        self._setup_quests()
+        self.npc_engine = None
+        self.dialogue = DialogueEngine(self, SCENES)
+        # Événements attachés aux salles (tempête, phare, gardien de la cave)
+        self.triggers = TriggerRegistry()
+
+    def setup(self, player_name=None):
+        """
+        Configuration initiale du jeu.
+
+        Args:
+            player_name (str): Nom du joueur. S'il est absent, il est demandé.
+        """
+        with output_channel(self.output, self.output_categories):
+            self._setup_commands()
+            if self.save_file is not None:
+                self.save_manager = SaveManager(self, self.save_file)
+                player_name = player_name or self.save_manager.saved_name()
+            if self.world_file is None and self.prebuilt_world is None:
+                self._setup_rooms_and_characters()
+                self.world = WorldGraph(self.rooms)
+                self._setup_triggers()
+                self._setup_events()
+                self._setup_player(player_name)
+                self._setup_quests()
+            else:
+                world = self.prebuilt_world or load_world(self.world_file)
+                self.rooms.extend(world.rooms)
+                self.characters.extend(world.characters)
+                self.world = WorldGraph(self.rooms)
+                for room, trigger in world.triggers:
+                    self.triggers.add(room, trigger)
+                for first, period, event in world.events:
+                    self.clock.every(period, event, first)
+                self._setup_player(player_name, world.start)
+                self._setup_world_quests(world)
+            self.player.exit_cache = ExitCache(self.world, self.player.quest_manager)
+            self.npc_engine = NPCEngine(self.rooms, self.characters, rng=self.rng)
+            if self.save_manager is not None:
+                if self.save_manager.exists():
+                    self.save_manager.resume()
+                    display("\n💾 Partie sauvegardée reprise.")
+                else:
+                    self.save_manager.save_snapshot()
 
     def _setup_commands(self):
-        """Initialise les commandes disponibles."""
-        self.commands["help"] = Command("help", " : afficher cette aide", Actions.help, 0)
-        self.commands["quit"] = Command("quit", " : quitter le jeu", Actions.quit, 0)
-        self.commands["go"] = Command("go", " <direction> : se déplacer", Actions.go, 1)
-        self.commands["history"] = Command("history", " : historique", Actions.history, 0)
-        self.commands["back"] = Command("back", " : revenir en arrière", Actions.back, 0)
-        self.commands["look"] = Command("look", " : observer la pièce", Actions.look, 0)
-        self.commands["check"] = Command("check", " : inventaire et état", Actions.check, 0)
-        self.commands["take"] = Command("take", " <item> : prendre objet", Actions.take, 1)
-        self.commands["drop"] = Command("drop", " <item> : poser objet", Actions.drop, 1)
-        self.commands["talk"] = Command("talk", " <nom> : discuter", Actions.talk, 1)
-        self.commands["quests"] = Command("quests", " : afficher les quêtes", Actions.quests, 0)
-        self.commands["quest"] = Command("quest", " <nom> : détails quête", Actions.quest, 1)
-        self.commands["activate"] = Command("activate", " <nom> : activer", Actions.activate, 1)
-        self.commands["rewards"] = Command("rewards", " : récompenses", Actions.rewards, 0)
+        """
+        Initialise les commandes disponibles et compile le répartiteur.
+
+        La table des commandes ne dépend pas de la partie : elle est compilée
+        une seule fois puis partagée par toutes les parties du processus.
+        """
+        table = Game._command_table
+        if table is None:
+            table = Game._command_table = self._compile_commands()
+        commands, self.dispatcher = table
+        self.commands.update(commands)
+
+    def _compile_commands(self):
+        """Construit les commandes et leur répartiteur."""
+        directions = {d.lower(): [d] for d in ("N", "E", "S", "O", "U", "D")}
+        commands = {}
+        commands["help"] = Command("help", " : afficher cette aide", Actions.help, 0,
+                                   aliases={"?": []})
+        commands["quit"] = Command("quit", " : quitter le jeu", Actions.quit, 0)
+        commands["go"] = Command("go", " <direction> : se déplacer (raccourcis : n, e, s, "
+                                 "o, u, d)", Actions.go, 1, aliases=directions,
+                                 normalize=normalize_direction, duration=1)
+        commands["travel"] = Command("travel", " <lieu> : voyager jusqu'à un lieu",
+                                     Actions.travel, 1, variadic=True)
+        commands["history"] = Command("history", " [page] : historique", Actions.history, 0,
+                                      variadic=True)
+        commands["back"] = Command("back", " : revenir en arrière", Actions.back, 0,
+                                   aliases={"b": []}, duration=1)
+        commands["look"] = Command("look", " : observer la pièce", Actions.look, 0,
+                                   aliases={"l": []})
+        commands["check"] = Command("check", " : inventaire et état", Actions.check, 0,
+                                    aliases={"i": []})
+        commands["take"] = Command("take", " [nombre] <item> | all : prendre objet",
+                                   Actions.take, 1, variadic=True)
+        commands["drop"] = Command("drop", " [nombre] <item> | all : poser objet",
+                                   Actions.drop, 1, variadic=True)
+        commands["talk"] = Command("talk", " <nom> : discuter", Actions.talk, 1, variadic=True)
+        commands["where"] = Command("where", " <nom> : où se trouve un PNJ", Actions.where, 1,
+                                    variadic=True)
+        commands["quests"] = Command("quests", " : afficher les quêtes", Actions.quests, 0)
+        commands["quest"] = Command("quest", " <nom> : détails quête", Actions.quest, 1,
+                                    variadic=True)
+        commands["activate"] = Command("activate", " <nom> : activer", Actions.activate, 1,
+                                       variadic=True)
+        commands["save"] = Command("save", " : sauvegarder la partie", Actions.save, 0)
+        commands["rewards"] = Command("rewards", " : récompenses", Actions.rewards, 0)
+        commands["stats"] = Command("stats", " [reset | trace <fichier>] : "
+                                    "mesures de performance (admin)", Actions.stats, 0,
+                                    variadic=True)
+
+        dispatcher = CommandDispatcher()
+        for command in commands.values():
+            dispatcher.register(command)
+        return commands, dispatcher
 
     def _setup_rooms_and_characters(self):
         """Initialise les salles et les PNJ."""
@@ -69,12 +211,13 @@ class Game:
                            pre_treasure, questions, treasure_cave])
 
         # Configuration des inventaires
-        tortues.inventory["tortue"] = {
-            "description": "une tortue rare", "weight": 1, "quantity": 1
-        }
-        taverne.inventory["pièce"] = {
-            "description": "une pièce d'or", "weight": 0.1, "quantity": 10
-        }
+        ITEMS.register("tortue", "une tortue rare", 1)
+        tortues.inventory.add("tortue")
+        taverne.inventory.add(GOLD.name, 10)
+        chest = Inventory(name="coffre", description="un vieux coffre de pirate",
+                          weight=30, capacity=20)
+        chest.add(GOLD.name, 20)
+        pre_treasure.inventory.add_container(chest)
 
         # Configuration des sorties
         entrance.exits = {
@@ -86,6 +229,14 @@ class Game:
         tortues.exits = {"N": taverne}
         taverne.exits = {"O": entrance}
         pre_treasure.exits = {"E": entrance, "D": treasure_cave}
+        # Le gardien bloque le passage si l'équipage n'est pas complet
+        pre_treasure.lock_exit("D", Gate(
+            [MinimumStat("crew", 8)],
+            [("say", "\n🔓 Gardien : 'Je vois que vous êtes bien entouré. Vous pouvez passer.'")],
+            [("say", "\n⛔ LE GARDIEN VOUS BARRE LA ROUTE !"),
+             ("say", "Gardien : 'Halte ! Tu dois avoir un équipage au complet d'au "
+                     "moins 8 valeureux pirates pour pouvoir briser la porte !'"),
+             ("say_status", "(Vous n'avez que {crew} hommes.)\n")]))
         treasure_cave.exits = {"U": pre_treasure}
 
         # Configuration des PNJ
@@ -95,34 +246,58 @@ class Game:
         self.characters.append(fouras)
 
         marchand = Character("Marchand", "recruteur", taverne,
-                             ["J'ai des hommes et j'achète les tortues."])
+                             ["J'ai des hommes et j'achète les tortues."], mobile=False)
         taverne.add_character(marchand)
         self.characters.append(marchand)
 
         gardien = Character("Gardien", "colosse", pre_treasure,
-                            ["Seul un capitaine digne passera."])
+                            ["Seul un capitaine digne passera."], mobile=False)
         pre_treasure.add_character(gardien)
         self.characters.append(gardien)
 
-    def _setup_player(self):
+    def _setup_triggers(self):
+        """Attache les événements du monde par défaut à leurs salles."""
+        rooms = {room.name: room for room in self.rooms}
+        self.triggers.add(rooms["une tempête furieuse"], Trigger(
+            ON_ENTER, [("start_scene", "tempête")], once=True))
+        self.triggers.add(rooms["le phare aux questions (F.A.Q)"], Trigger(
+            ON_ENTER, [("say", "\n💡 Maintenant que tu as visité le phare du mystérieux Fouras,"
+                               " tu as débloqué une quête :"),
+                       ("say", "Pour l'activer tu dois Trouver Fouras et faire 'talk Fouras', "
+                               "réponds à ses questions et il te donnera des pièces d'or.\n")],
+            once=True))
+
+    def _setup_events(self):
+        """Programme les événements répétés du monde par défaut."""
+        rooms = {room.name: room for room in self.rooms}
+        # Les pièces de la taverne et les tortues réapparaissent
+        self.clock.every(20, TimedEvent([("respawn", (rooms["la Taverne"].id, GOLD.name, 10))]))
+        self.clock.every(30, TimedEvent([("respawn", (rooms["Turtle Island"].id, "tortue", 1))]))
+        # Un grain balaie l'océan de temps en temps
+        self.clock.every(25, TimedEvent(
+            [("say", "\n🌩️ Un grain s'abat sur l'océan : l'équipage affale les voiles "
+                     "en attendant l'accalmie.\n")],
+            ("in_room", "un vaste océan")))
+
+    def _setup_player(self, player_name=None, start_room=None):
         """Configure le joueur."""
-        nom_joueur = input("\nEntrez votre nom: ")
+        nom_joueur = player_name
+        if nom_joueur is None:
+            nom_joueur = self.input("\nEntrez votre nom: ")
         while len(str(nom_joueur)) < 2 or len(str(nom_joueur)) > 15:
-            nom_joueur = input("\nEntrez un nom entre 2 et 15 caractères : ")
+            nom_joueur = self.input("\nEntrez un nom entre 2 et 15 caractères : ")
         self.player = Player(nom_joueur)
-        # La salle de départ est la première de la liste (Entrance)
-        self.player.current_room = self.rooms[0]
+        # Par défaut, la salle de départ est la première de la liste (Entrance)
+        self.player.current_room = start_room if start_room is not None else self.rooms[0]
 
     def _setup_quests(self):
         """Configure les quêtes."""
-        objectives_explo = [
-            f"Visiter {r.name}" for r in self.rooms if r.name != "la cave aux trésors"
-        ]
+        region = Bitset(r.id for r in self.rooms if r.name != "la cave aux trésors")
 
-        exploration_quest = Quest(
+        exploration_quest = ExplorationQuest(
             title="Grand Explorateur",
             description="Explorez tous les lieux de ce monde (sauf la cachette finale).",
-            objectives=objectives_explo,
+            region=region,
             reward="Titre de Grand Explorateur"
         )
         self.player.quest_manager.add_quest(exploration_quest)
@@ -132,237 +307,204 @@ class Game:
         self.player.quest_manager.activate_quest("Grand Explorateur")
 
         # Validation immédiate de la salle de départ pour cette quête
-        self.player.quest_manager.check_room_objectives(self.player.current_room.name)
+        self.player.visit(self.player.current_room)
 
         storm_quest = Quest(
             title="Esquiver la tempête",
             description="Brave la tempête pour sauver ton équipage.",
             objectives=["Survivre au Cyclone"],
-            reward="Compass de survie"
+            reward="Compass de survie",
+            requires=[InRoom("une tempête furieuse")]
         )
         self.player.quest_manager.add_quest(storm_quest)
 
         self.player.quest_manager.add_quest(Quest(
             "Énigme du Phare I", "Réponds à la première question de Fouras.",
-            ["Répondre 9"], "5 pièces d'or"
+            ["Répondre 9"], "5 pièces d'or", [InRoom("le phare aux questions (F.A.Q)")]
         ))
         self.player.quest_manager.add_quest(Quest(
             "Énigme du Phare II", "Réponds à la deuxième question de Fouras.",
-            ["Répondre perroquet"], "5 pièces d'or"
+            ["Répondre perroquet"], "5 pièces d'or", [InRoom("le phare aux questions (F.A.Q)")]
         ))
 
+    def _setup_world_quests(self, world):
+        """Configure les quêtes d'un monde chargé depuis un fichier."""
+        quest_manager = self.player.quest_manager
+        for quest in world.quests:
+            quest_manager.add_quest(quest)
+        for title in world.active_titles:
+            quest_manager.activate_quest(title)
+        self.player.visit(self.player.current_room)
+
     def play(self):
         """Lance la boucle principale du jeu."""
         self.setup()
         self.print_welcome()
         while not self.finished:
-            command_string = input("> ")
-            self.process_command(command_string)
-
-            command_clean = command_string.strip()
-            first_word = command_clean.split()[0].lower() if command_clean else ""
-            if first_word in ["go", "back"]:
-                for npc in self.characters:
-                    if npc.name not in ["Marchand", "Gardien"]:
-                        npc.move()
+            command_string = self.input(self.prompt())
+            self.step(command_string)
         return None
 
-    def process_command(self, command_string) -> None:
-        """Traite la commande saisie par le joueur."""
-        command_string = command_string.strip()
-        list_of_words = command_string.split(" ") if command_string else [""]
-        command_word = list_of_words[0].lower()
-
-        # Gestion intelligente des directions pour 'go'
-        if command_word == "go" and len(list_of_words) > 1:
-            raw_dir = list_of_words[1].upper()
-            mapping = {
-                "NORD": "N", "EST": "E", "SUD": "S", "OUEST": "O",
-                "UP": "U", "DOWN": "D",
-                "N": "N", "E": "E", "S": "S", "O": "O", "U": "U", "D": "D"
-            }
-            if raw_dir in mapping:
-                list_of_words[1] = mapping[raw_dir]
-            else:
-                list_of_words[1] = raw_dir
-
-        if command_word not in self.commands:
-            print(f"\nCommande '{command_word}' non reconnue. Entrez 'help'.\n")
-        else:
-            command = self.commands[command_word]
-            command.action(self, list_of_words, command.number_of_parameters)
+    def prompt(self):
+        """Retourne l'invite à afficher : celle de la scène en cours, ou '> '."""
+        return self.dialogue.prompt if self.dialogue.active else "> "
+
+    def step(self, command_string) -> None:
+        """
+        Joue un tour complet : la commande du joueur puis, si elle prend du
+        temps (Command.duration), l'avance du monde d'autant de ticks.
+
+        Args:
+            command_string (str): La ligne saisie par le joueur.
+        """
+        turn_probe = STATS.start()
+        if turn_probe:
+            STATS.turn += 1
+        with output_channel(self.output, self.output_categories):
+            command = self.process_command(command_string)
+            self.player.quest_manager.check_inventory(self.player.inventory)
+            if command is not None:
+                for _ in range(command.duration):
+                    self.tick((self.player.current_room,))
+            if self.save_manager is not None:
+                self.save_manager.record_turn()
+        STATS.stop("turn", turn_probe)
+
+    def tick(self, observed_rooms=()):
+        """
+        Avance le monde d'un tick : les événements échus de l'horloge sont
+        déclenchés (déplacement des PNJ, réapparitions, tempêtes).
+
+        Le hasard du tick ne dépend que de la graine et du numéro du tick :
+        la partie est reproductible, y compris après une reprise de sauvegarde.
+
+        Args:
+            observed_rooms (iterable): Salles vues par le joueur, à garder cohérentes.
+        """
+        self.npc_engine.reseed((self.seed << 32) + self.ticks)
+        self.ticks += 1
+        self.observed_rooms = observed_rooms
+        for event in self.clock.advance():
+            event.run(self)
+        self.observed_rooms = ()
+
+    def fast_forward(self, ticks):
+        """
+        Avance le monde de plusieurs ticks sans rien afficher.
+
+        Les salles ne sont pas tenues à jour pendant l'avance : seule celle du
+        joueur est reconstruite à la fin.
+
+        Args:
+            ticks (int): Nombre de ticks à simuler.
+        """
+        with output_channel(discard):
+            for _ in range(ticks):
+                self.tick()
+        self.npc_engine.observe((self.player.current_room,))
+
+    def process_command(self, command_string):
+        """
+        Traite la commande saisie par le joueur.
+
+        Si une scène attend une réponse, la ligne lui est donnée à la place.
+
+        Returns:
+            Command | None: La commande exécutée, ou None (erreur ou réponse à une scène).
+        """
+        with output_channel(self.output, self.output_categories):
+            if self.dialogue.active:
+                probe = STATS.start()
+                self.dialogue.feed(command_string)
+                STATS.stop("dialogue.feed", probe)
+                return None
+            return self._dispatch(command_string)
+
+    def _dispatch(self, command_string):
+        """
+        Analyse la commande et exécute l'action correspondante.
+
+        Mesures (si STATS est activé) : 'dispatch.parse', puis un compteur
+        'commands.<mot>' et la latence 'action.<mot>' de chaque action.
+        """
+        probe = STATS.start()
+        command, list_of_words, error = self.dispatcher.parse(command_string)
+        STATS.stop("dispatch.parse", probe)
+        if error is not None:
+            STATS.count("commands.<erreur>")
+            display(error)
+            return None
+        probe = STATS.start()
+        command.action(self, list_of_words, command.number_of_parameters)
+        if probe:
+            STATS.stop(f"action.{command.command_word}", probe)
+            STATS.count(f"commands.{command.command_word}")
+        return command
 
     def print_welcome(self):
         """Affiche le message de bienvenue."""
-        print(f"\nBienvenue {self.player.name} ! "
-              f"Votre équipage de {self.player.crew} hommes est prêt.")
-        print(self.player.current_room.get_long_description())
+        with output_channel(self.output, self.output_categories):
+            display(f"\nBienvenue {self.player.name} ! "
+                    f"Votre équipage de {self.player.crew} hommes est prêt.")
+            display(self.player.current_room.get_long_description())
 
     # --- ÉVÉNEMENTS SPÉCIAUX ---
 
-    def check_room_events(self):
-        """Vérifie les événements liés à la salle actuelle."""
-        current_room_name = self.player.current_room.name
-
-        # Tempête
-        if current_room_name == "une tempête furieuse" and not self.storm_encountered:
-            self.player.quest_manager.activate_quest("Esquiver la tempête")
-            self._run_storm_sequence()
-            self.storm_encountered = True
-
-        # Fouras
-        if current_room_name == "le phare aux questions (F.A.Q)":
-            self.player.quest_manager.activate_quest("Énigme du Phare I")
-            self.player.quest_manager.activate_quest("Énigme du Phare II")
-
-            if not self.fouras_hint_given:
-                print("\n💡 Maintenant que tu as visité le phare du mystérieux Fouras,"
-                      " tu as débloqué une quête :")
-                print("Pour l'activer tu dois Trouver Fouras et faire 'talk Fouras', "
-                      "réponds à ses questions et il te donnera des pièces d'or.\n")
-                self.fouras_hint_given = True
-
-    def _run_storm_sequence(self):
-        """Exécute la séquence de la tempête."""
-        print("\n⚡ UNE VAGUE SCÉLÉRATE ARRIVE SUR TOI ET TON ÉQUIPAGE ! ⚡")
-        print("ACTION REQUISE IMMÉDIATE (Vous ne pouvez pas fuir)")
-        print("  1 : La prendre de face (Risque pour le navire, équipage protégé)")
-        print("  2 : La prendre en biais (Le navire tangue, risque de chute)")
-
-        while True:
-            choix1 = input("\nQuel est ton choix (1 ou 2) ? > ")
-            if choix1 in ["1", "2"]:
-                break
-            print("Choix invalide.")
-
-        if choix1 == "2":
-            print("\n🌊 Le bateau tangue violemment... Un homme passe par-dessus bord !")
-            self.player.lose_crew(1)
-        else:
-            print("\n🌊 Le bateau craque mais tient bon. L'équipage est secoué mais sauf.")
-
-        print("\n🌪️ Le cœur du Cyclone se rapproche...")
-        print("  1 : Foncez dans l'œil du cyclone (Calme mais dangereux)")
-        print("  2 : Tenter de fuir la zone (Long et périlleux)")
-
-        while True:
-            choix2 = input("\nQuel est ton choix (1 ou 2) ? > ")
-            if choix2 in ["1", "2"]:
-                break
-            print("Choix invalide.")
-
-        if choix2 == "2":
-            print("\n💨 Les vents contraires vous ralentissent. "
-                  "Une déferlante emporte un autre marin !")
-            self.player.lose_crew(1)
-        else:
-            print("\n💨 Vous traversez le mur de vent et trouvez le calme temporaire de l'œil.")
-
-        self.player.quest_manager.complete_objective("Survivre au Cyclone")
+    @instrumented("events.room")
+    def check_room_events(self, previous_room=None):
+        """
+        Déclenche les événements d'un déplacement : sortie de la salle
+        quittée, puis quêtes et déclencheurs d'entrée de la salle actuelle.
+
+        Args:
+            previous_room (Room): La salle quittée (None s'il n'y en a pas).
+        """
+        room = self.player.current_room
+        if previous_room is not None:
+            self.triggers.fire(self, previous_room, ON_EXIT)
+        # Quêtes débloquées par l'entrée dans cette salle (tempête, Fouras)
+        self.player.quest_manager.enter_room(room.name)
+        self.triggers.fire(self, room, ON_ENTER)
 
     def handle_fouras_interaction(self):
-        """Gère le dialogue interactif avec Fouras."""
-        print("\n👴 Fouras : 'Héhéhé ! Tu ne sortiras pas d'ici sans avoir utilisé ta tête.'")
-
-        q1 = self.player.quest_manager.get_quest_by_title("Énigme du Phare I")
-        if q1 and q1.is_active and not q1.is_completed:
-            print("\n👴 Fouras : 'Question 1 : Combien d'îles (salles) "
-                  "sont présentes dans ton monde ?'")
-            rep = input("Votre réponse (écrivez le chiffre) > ")
-            if rep.strip() == "9":
-                print("\n👴 Fouras : 'Bien joué ! Tu as gagné 5 pièces d'or.'")
-                self.player.quest_manager.complete_objective("Répondre 9")
-                self._give_gold(5)
-            else:
-                print("\n👴 Fouras : 'Faux ! Tu perds ta chance pour cette question.'")
-
-        q2 = self.player.quest_manager.get_quest_by_title("Énigme du Phare II")
-        if q2 and q2.is_active and not q2.is_completed:
-            print("\n👴 Fouras : 'Question 2 : Quel animal est votre bras droit "
-                  "et se place sur votre épaule ?'")
-            rep = input("Votre réponse > ")
-            if "perroquet" in rep.lower():
-                print("\n👴 Fouras : 'Exactement ! Voici 5 pièces d'or.'")
-                self.player.quest_manager.complete_objective("Répondre perroquet")
-                self._give_gold(5)
-            else:
-                print("\n👴 Fouras : 'Non, ce n'est pas ça.'")
-
-        print("\n👴 Fouras : 'La session est terminée.'\n")
+        """Démarre le dialogue interactif avec Fouras."""
+        self.dialogue.start("fouras")
 
     def handle_merchant_interaction(self):
-        """Gère le dialogue avec le marchand."""
-        print("\n💰 Marchand : 'Bienvenue à la taverne, Capitaine !'")
-        print("💰 Marchand : 'Je peux te fournir des hommes (5 or) ou "
-              "t'acheter tes tortues (5 or).'")
-
-        while True:
-            current_gold = 0
-            if "pièce" in self.player.inventory:
-                current_gold = self.player.inventory["pièce"]["quantity"]
-
-            tortue_count = 0
-            if "tortue" in self.player.inventory:
-                tortue_count = self.player.inventory["tortue"]["quantity"]
-
-            print(f"\n--- BOURSE: {current_gold} Or | ÉQUIPAGE: {self.player.crew} "
-                  f"| TORTUES: {tortue_count} ---")
-            print("1. Acheter un matelot (-5 or)")
-            print("2. Vendre une tortue (+5 or)")
-            print("3. Quitter la discussion")
-
-            choice = input("Votre choix (1, 2 ou 3) > ")
-
-            if choice == "3":
-                print("\n💰 Marchand : 'À la prochaine !'")
-                break
-
-            if choice == "1":
-                if current_gold >= 5:
-                    self._remove_gold(5)
-                    self.player.add_crew(1)
-                else:
-                    print("\n💰 Marchand : 'Pas assez d'argent !'")
-
-            elif choice == "2":
-                if tortue_count > 0:
-                    if tortue_count == 1:
-                        del self.player.inventory["tortue"]
-                    else:
-                        self.player.inventory["tortue"]["quantity"] -= 1
-                    self._give_gold(5)
-                    print("\n💰 Marchand : 'Quelle belle bête ! Voici 5 pièces d'or.'")
-                else:
-                    print("\n💰 Marchand : 'Tu n'as pas de tortue à vendre !'")
-            else:
-                print("Choix invalide.")
+        """Démarre le dialogue avec le marchand."""
+        self.dialogue.start("marchand")
 
-    def _give_gold(self, amount):
+    def give_gold(self, amount):
         """Ajoute de l'or à l'inventaire."""
-        item_name = "pièce"
-        pinfo = self.player.inventory.get(item_name)
-        if pinfo is None:
-            self.player.inventory[item_name] = {
-                "description": "une pièce d'or",
-                "weight": 0.1,
-                "quantity": amount
-            }
-        else:
-            pinfo["quantity"] += amount
-        print(f"💰 (+{amount} pièces d'or ajoutées)")
-
-    def _remove_gold(self, amount):
+        self.player.inventory.add(GOLD.name, amount)
+        display(f"💰 (+{amount} pièces d'or ajoutées)")
+
+    def remove_gold(self, amount):
         """Retire de l'or de l'inventaire."""
-        if "pièce" in self.player.inventory:
-            self.player.inventory["pièce"]["quantity"] -= amount
-            if self.player.inventory["pièce"]["quantity"] <= 0:
-                del self.player.inventory["pièce"]
-            print(f"💰 (-{amount} pièces d'or)")
+        if self.player.inventory.remove(GOLD.name, amount, nested=True):
+            display(f"💰 (-{amount} pièces d'or)")
+
+    def respawn(self, room_id, item_name, quantity):
+        """Complète la pile d'un objet dans une salle jusqu'à quantity exemplaires."""
+        inventory = self.rooms[room_id].inventory
+        missing = quantity - inventory.count(item_name)
+        if missing > 0:
+            inventory.add(item_name, missing)
+            self.dirty_rooms.add(room_id)
 
 
 def main():
-    """Point d'entrée du jeu."""
-    Game().play()
+    """Point d'entrée du jeu (python game.py [monde.json] [--save partie.sav] [--seed N])."""
+    parser = argparse.ArgumentParser(description="Chasse au Trésor")
+    parser.add_argument("world", nargs="?", default=None, help="fichier de monde JSON")
+    parser.add_argument("--save", default=None, help="fichier de sauvegarde (repris s'il existe)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="graine du hasard, pour rejouer une partie à l'identique")
+    parser.add_argument("--stats", action="store_true",
+                        help="active les mesures de performance dès le départ")
+    args = parser.parse_args()
+    STATS.enable(args.stats)
+    Game(world_file=args.world, save_file=args.save, seed=args.seed).play()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,140 @@
+"""
+Module définissant les classes Gate et ExitCache.
+Sorties conditionnelles : un passage fermé tant que ses conditions (objet,
+équipage, quête terminée, or ; voir requirements.py) ne sont pas remplies.
+
+Les conditions d'une porte sont compilées une fois, à sa création. Chaque
+joueur a son ExitCache : l'état ouvert ou fermé d'une porte n'est recalculé
+que si l'empreinte de ses entrées (Requirement.stamp : équipage, version de
+l'inventaire, version d'une quête) a changé. Le plan de route (WorldGraph.route)
+et 'look' s'en servent sans réévaluer toutes les portes à chaque commande.
+"""
+from dialogue import apply_effects
+from requirements import compile_requirement
+
+
+class Gate:
+    """
+    Porte posée sur une sortie.
+
+    Attributes:
+        requires (list): Conditions d'ouverture (Requirement).
+        effects (tuple): Effets appliqués au passage (porte ouverte).
+        otherwise (tuple): Effets appliqués quand la porte refuse le passage
+            (par défaut : la liste des conditions manquantes).
+        index (int): Numéro de la porte dans le graphe (WorldGraph.gates).
+        edge (int): Arête inverse de la sortie dans le graphe (voir WorldGraph._tree_to).
+    """
+
+    __slots__ = ("requires", "effects", "otherwise", "index", "edge")
+
+    def __init__(self, requires, effects=(), otherwise=()):
+        self.requires = [compile_requirement(requirement) for requirement in requires]
+        self.effects = tuple(effects)
+        self.otherwise = tuple(otherwise)
+        self.index = None
+        self.edge = None
+
+    def is_open(self, manager):
+        """Indique si toutes les conditions sont remplies (sans cache)."""
+        for requirement in self.requires:
+            if not requirement.is_met(manager):
+                return False
+        return True
+
+    def stamp(self, manager):
+        """Empreinte des entrées de toutes les conditions de la porte."""
+        return tuple(requirement.stamp(manager) for requirement in self.requires)
+
+    def refuse(self, game):
+        """Affiche le refus de passage."""
+        if self.otherwise:
+            apply_effects(game, self.otherwise)
+            return
+        manager = game.player.quest_manager
+        missing = [requirement.label for requirement in self.requires
+                   if not requirement.is_met(manager)]
+        apply_effects(game, [("say", f"\n🔒 Passage fermé : {', '.join(missing)}.\n")])
+
+
+class ExitCache:
+    """
+    État des portes vu par un joueur, recalculé seulement quand leurs entrées changent.
+
+    Attributes:
+        world (WorldGraph): Le graphe compilé (et ses portes).
+        manager (QuestManager): Le gestionnaire de quêtes du joueur.
+    """
+
+    def __init__(self, world, manager):
+        """
+        Constructeur du cache.
+
+        Args:
+            world (WorldGraph): Le graphe compilé du monde.
+            manager (QuestManager): Le gestionnaire de quêtes du joueur.
+        """
+        self.world = world
+        self.manager = manager
+        self.reset()
+
+    def reset(self):
+        """Oublie l'état de toutes les portes (après une recompilation du graphe)."""
+        count = len(self.world.gates)
+        self._stamps = [None] * count
+        self._open = [False] * count
+        self._known = bytearray(count)
+        self._closed = None
+
+    def is_open(self, gate):
+        """Indique si une porte est ouverte pour ce joueur."""
+        index = gate.index
+        if index >= len(self._known):
+            self.reset()
+        stamp = gate.stamp(self.manager)
+        if not self._known[index] or self._stamps[index] != stamp:
+            self._known[index] = 1
+            self._stamps[index] = stamp
+            is_open = gate.is_open(self.manager)
+            if is_open != self._open[index]:
+                self._open[index] = is_open
+                self._closed = None
+        return self._open[index]
+
+    def cross(self, game, room, direction):
+        """
+        Tente de franchir une sortie : les effets de passage de sa porte sont
+        appliqués si elle est ouverte, le refus est affiché sinon.
+
+        Returns:
+            bool: True si la sortie n'a pas de porte ou si la porte est ouverte.
+        """
+        gate = room.gates.get(direction) if room.gates else None
+        if gate is None:
+            return True
+        if not self.is_open(gate):
+            gate.refuse(game)
+            return False
+        apply_effects(game, gate.effects)
+        return True
+
+    def closed_edges(self):
+        """
+        Retourne les arêtes inverses des portes fermées (pour WorldGraph.route).
+
+        Returns:
+            frozenset: Les arêtes fermées ; le même objet tant qu'aucune porte ne change.
+        """
+        for gate in self.world.gates:
+            self.is_open(gate)
+        if self._closed is None:
+            self._closed = frozenset(gate.edge for gate in self.world.gates
+                                     if not self._open[gate.index])
+        return self._closed
+
+    def closed_exits(self, room):
+        """Retourne les directions fermées pour ce joueur depuis une salle."""
+        if not room.gates:
+            return []
+        return [direction for direction, gate in room.gates.items()
+                if not self.is_open(gate)]
@@ -0,0 +1,127 @@
+"""
+Module du mode sans terminal (headless).
+Rejoue un script de commandes à travers le moteur, sans aucune saisie clavier.
+
+Usage : python headless.py script.txt [--name Capitaine] [--echo] [--repeat N] [--world monde.json]
+                            [--seed N] [--fast-forward N] [--stats] [--trace trace.json]
+
+Avec la même graine (--seed), deux parties rejouent exactement les mêmes
+déplacements de PNJ : la graine utilisée est affichée à la fin.
+"""
+import argparse
+import random
+import time
+
+from console import discard
+from game import Game
+from stats import STATS
+
+
+class ScriptedInput:
+    """
+    Canal d'entrée qui fournit les lignes d'un script comme le ferait input().
+
+    Lève EOFError quand le script est épuisé, comme input() en fin de fichier.
+    """
+
+    def __init__(self, lines):
+        """
+        Constructeur du canal scripté.
+
+        Args:
+            lines (iterable): Lignes de commandes (fichier ouvert, liste, générateur...).
+        """
+        self._lines = iter(lines)
+
+    def __call__(self, prompt=""):
+        """Retourne la prochaine ligne du script."""
+        try:
+            line = next(self._lines)
+        except StopIteration:
+            raise EOFError("fin du script") from None
+        return line.rstrip("\r\n")
+
+
+def replay(lines, player_name="Capitaine", output_func=discard, world_file=None, seed=None,
+           fast_forward=0):
+    """
+    Joue une partie complète à partir d'un script de commandes.
+
+    Chaque ligne passe par Game.step ; les scènes interactives (tempête,
+    Fouras, marchand) consomment elles aussi les lignes suivantes du script.
+
+    Args:
+        lines (iterable): Lignes de commandes à rejouer.
+        player_name (str): Nom du joueur.
+        output_func (callable): Canal de sortie (par défaut, tout est ignoré).
+        world_file (str): Fichier de monde JSON (défaut: le monde intégré).
+        seed (int): Graine du hasard (défaut: tirée au hasard, voir Game.seed).
+        fast_forward (int): Ticks simulés sans affichage avant la première commande.
+
+    Returns:
+        Game: La partie dans son état final.
+    """
+    script = ScriptedInput(lines)
+    game = Game(input_func=script, output_func=output_func, world_file=world_file, seed=seed)
+    game.setup(player_name)
+    game.fast_forward(fast_forward)
+    game.print_welcome()
+    try:
+        while not game.finished:
+            game.step(script())
+    except EOFError:
+        pass
+    return game
+
+
+def replay_file(path, player_name="Capitaine", output_func=discard, world_file=None, seed=None):
+    """
+    Rejoue un fichier de commandes (une commande par ligne).
+
+    Returns:
+        Game: La partie dans son état final.
+    """
+    with open(path, encoding="utf-8") as script_file:
+        return replay(script_file, player_name, output_func, world_file, seed)
+
+
+def main():
+    """Point d'entrée en ligne de commande du mode headless."""
+    parser = argparse.ArgumentParser(description="Rejoue un script de commandes.")
+    parser.add_argument("script", help="fichier de commandes, une par ligne")
+    parser.add_argument("--name", default="Capitaine", help="nom du joueur")
+    parser.add_argument("--echo", action="store_true", help="affiche la sortie du jeu")
+    parser.add_argument("--repeat", type=int, default=1, help="nombre de parties à jouer")
+    parser.add_argument("--world", default=None, help="fichier de monde JSON")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="graine du hasard (défaut: tirée au hasard et affichée)")
+    parser.add_argument("--fast-forward", type=int, default=0, metavar="N",
+                        help="simule N ticks sans affichage avant le script")
+    parser.add_argument("--stats", action="store_true",
+                        help="affiche les compteurs et latences à la fin")
+    parser.add_argument("--trace", default=None,
+                        help="exporte la trace (format Chrome trace-event) dans ce fichier")
+    args = parser.parse_args()
+    STATS.enable(args.stats or args.trace is not None)
+
+    with open(args.script, encoding="utf-8") as script_file:
+        lines = script_file.read().splitlines()
+
+    seed = args.seed if args.seed is not None else random.getrandbits(32)
+    output_func = None if args.echo else discard
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        replay(lines, args.name, output_func, args.world, seed, args.fast_forward)
+    elapsed = time.perf_counter() - start
+
+    if not args.echo:
+        print(f"{args.repeat} partie(s) en {elapsed:.3f} s "
+              f"({args.repeat / elapsed:.0f} parties/s, graine {seed})")
+    if args.stats:
+        print(STATS.report())
+    if args.trace is not None:
+        STATS.export_trace(args.trace)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Module définissant les classes MoveHistory et VisitedRooms.
+Mémorise les déplacements du joueur sous forme de numéros de salle (Room.id).
+
+MoveHistory est un tampon circulaire de taille fixe : 'back' n'a besoin que
+des derniers déplacements, et la mémoire ne grandit pas avec la durée de la
+partie. VisitedRooms garde chaque salle visitée une seule fois, dans l'ordre
+de la première visite, pour la commande 'history' (affichée par pages) et
+pour les quêtes d'exploration (ensemble de bits, voir bitset.py).
+"""
+from array import array
+
+from bitset import Bitset
+
+# Nombre de déplacements mémorisés pour 'back'
+HISTORY_SIZE = 100
+
+
+class MoveHistory:
+    """
+    Tampon circulaire des derniers numéros de salle quittés.
+
+    Chaque déplacement a une position absolue : le nombre de déplacements
+    oubliés (_evicted) plus sa place dans le tampon. take_changes s'en sert
+    pour décrire ce qui a changé sans recopier tout le tampon (voir savegame.py).
+
+    Attributes:
+        size (int): Nombre maximal de déplacements mémorisés.
+    """
+
+    __slots__ = ("size", "_ids", "_start", "_length", "_evicted", "_mark", "_mark_top",
+                 "_low")
+
+    def __init__(self, size=HISTORY_SIZE, room_ids=()):
+        """
+        Constructeur de l'historique.
+
+        Args:
+            size (int): Nombre maximal de déplacements mémorisés.
+            room_ids (iterable): Numéros initiaux, du plus ancien au plus récent.
+        """
+        self.size = size
+        self._ids = array("i", [0]) * size
+        self._start = 0
+        self._length = 0
+        self._evicted = 0
+        for room_id in room_ids:
+            self.push(room_id)
+        # Positions absolues de la tête et de la fin au dernier take_changes, et plus
+        # basse fin atteinte depuis
+        self._mark = self._evicted
+        self._mark_top = self._low = self._evicted + self._length
+
+    def __len__(self):
+        """Nombre de déplacements mémorisés."""
+        return self._length
+
+    def push(self, room_id):
+        """Mémorise une salle quittée ; la plus ancienne est oubliée si le tampon est plein."""
+        if self._length < self.size:
+            self._ids[(self._start + self._length) % self.size] = room_id
+            self._length += 1
+        else:
+            self._ids[self._start] = room_id
+            self._start = (self._start + 1) % self.size
+            self._evicted += 1
+
+    def peek(self):
+        """Retourne la salle quittée le plus récemment, sans la retirer (None si vide)."""
+        if not self._length:
+            return None
+        return self._ids[(self._start + self._length - 1) % self.size]
+
+    def pop(self):
+        """Retire et retourne la salle quittée le plus récemment (None si vide)."""
+        if not self._length:
+            return None
+        self._length -= 1
+        self._low = min(self._low, self._evicted + self._length)
+        return self._ids[(self._start + self._length) % self.size]
+
+    def to_list(self):
+        """Retourne les numéros mémorisés, du plus ancien au plus récent."""
+        return [self._ids[(self._start + i) % self.size] for i in range(self._length)]
+
+    def take_changes(self):
+        """
+        Retourne les changements depuis l'appel précédent, et les oublie.
+
+        Returns:
+            list | None: [oubliés, gardés, ajoutés] tels que la liste actuelle
+            vaut ancienne[oubliés:gardés] + ajoutés, ou None si rien n'a changé.
+        """
+        top = self._evicted + self._length
+        if self._evicted == self._mark and self._low == top == self._mark_top:
+            return None
+        first_added = max(self._low, self._evicted)
+        added = [self._ids[(self._start + position - self._evicted) % self.size]
+                 for position in range(first_added, top)]
+        changes = [self._evicted - self._mark, self._low - self._mark, added]
+        self._mark = self._evicted
+        self._mark_top = self._low = top
+        return changes
+
+
+class VisitedRooms:
+    """
+    Salles visitées, sans doublon, dans l'ordre de la première visite.
+
+    Attributes:
+        order (list): Numéros de salle dans l'ordre de la première visite.
+        rooms (Bitset): Les mêmes numéros, un bit par salle du monde.
+    """
+
+    __slots__ = ("order", "rooms")
+
+    def __init__(self, room_ids=()):
+        """
+        Constructeur.
+
+        Args:
+            room_ids (iterable): Numéros initiaux, dans l'ordre de visite.
+        """
+        self.order = []
+        self.rooms = Bitset()
+        for room_id in room_ids:
+            self.add(room_id)
+
+    def __len__(self):
+        """Nombre de salles visitées."""
+        return len(self.order)
+
+    def __contains__(self, room_id):
+        """Indique si une salle a déjà été visitée."""
+        return room_id in self.rooms
+
+    def add(self, room_id):
+        """
+        Ajoute une salle si elle n'a pas encore été visitée.
+
+        Returns:
+            bool: True s'il s'agit d'une première visite.
+        """
+        if not self.rooms.add(room_id):
+            return False
+        self.order.append(room_id)
+        return True
+
+    def page(self, number, page_size):
+        """
+        Retourne les numéros d'une page (la première page vaut 1).
+
+        Returns:
+            list: Les numéros de salle de la page (vide si elle n'existe pas).
+        """
+        start = (number - 1) * page_size
+        return self.order[start:start + page_size] if number >= 1 else []
+
+    def page_count(self, page_size):
+        """Nombre de pages nécessaires pour tout afficher."""
+        return max(1, -(-len(self.order) // page_size))
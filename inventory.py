@@ -0,0 +1,367 @@
+"""
+Module définissant la classe Inventory.
+Contenu d'une salle, du joueur ou d'un conteneur, sous forme de piles d'objets.
+
+Un inventaire peut contenir d'autres inventaires (conteneurs : un coffre, un
+sac...), eux-mêmes imbriqués à volonté. Chaque inventaire tient à jour le
+poids total et le nombre d'objets de tout son sous-arbre : chaque ajout ou
+retrait corrige ces totaux en remontant vers la racine, si bien que lire un
+poids ou vérifier une capacité ne parcourt jamais le contenu.
+"""
+from item import ITEMS
+
+# Tolérance sur les sommes de poids décimaux (0.1 + 0.2 != 0.3)
+EPSILON = 1e-9
+
+
+class Inventory:
+    """
+    Inventaire ou conteneur : des piles (numéro d'objet, quantité) et des sous-conteneurs.
+
+    Les objets sont désignés par leur nom ; seuls les numéros des prototypes
+    du registre ITEMS sont stockés. Déplacer une pile entière d'un inventaire
+    à l'autre coûte le même prix quelle que soit sa quantité.
+
+    Attributes:
+        name (str): Nom du conteneur (None pour l'inventaire d'une salle ou du joueur).
+        description (str): Description du conteneur.
+        weight (float): Poids du conteneur vide.
+        capacity (float): Poids maximal du contenu (None = illimité).
+        stacks (dict): Numéro d'objet -> quantité, dans l'ordre d'arrivée.
+        containers (dict): Sous-conteneurs, par nom.
+        parent (Inventory): Inventaire qui contient ce conteneur (None pour une racine).
+        total_weight (float): Poids du conteneur et de tout son contenu.
+        total_count (int): Nombre d'objets dans tout le sous-arbre.
+        version (int): Augmente à chaque modification du contenu, sous-conteneurs compris.
+        changed (set): Numéros des objets dont la quantité a changé (voir take_changes).
+    """
+
+    __slots__ = ("name", "description", "weight", "capacity", "stacks", "containers",
+                 "parent", "total_weight", "total_count", "version", "changed")
+
+    def __init__(self, stacks=None, name=None, description="", weight=0.0, capacity=None):
+        """
+        Constructeur de l'inventaire.
+
+        Args:
+            stacks (dict): Piles initiales (nom -> quantité).
+            name (str): Nom du conteneur.
+            description (str): Description du conteneur.
+            weight (float): Poids du conteneur vide.
+            capacity (float): Poids maximal du contenu (None = illimité).
+        """
+        # pylint: disable=too-many-arguments
+        self.name = name
+        self.description = description
+        self.weight = weight
+        self.capacity = capacity
+        self.stacks = {}
+        self.containers = {}
+        self.parent = None
+        self.total_weight = weight
+        self.total_count = 0
+        self.version = 0
+        self.changed = set()
+        for item_name, quantity in (stacks or {}).items():
+            self.add(item_name, quantity)
+
+    def __len__(self):
+        """Nombre de piles et de conteneurs directement contenus."""
+        return len(self.stacks) + len(self.containers)
+
+    def __bool__(self):
+        """Un inventaire est vrai s'il contient quelque chose."""
+        return bool(self.stacks) or bool(self.containers)
+
+    def __iter__(self):
+        """Parcourt les piles : (prototype, quantité)."""
+        for item_id, quantity in self.stacks.items():
+            yield ITEMS[item_id], quantity
+
+    def __contains__(self, name):
+        """Indique si l'inventaire contient directement au moins un exemplaire de l'objet."""
+        item = ITEMS.get(name)
+        return item is not None and item.id in self.stacks
+
+    # --- Totaux et capacité ---
+
+    @property
+    def content_weight(self):
+        """Poids du contenu (sans le conteneur lui-même)."""
+        return self.total_weight - self.weight
+
+    def _propagate(self, weight, count, item_ids):
+        """
+        Reporte une variation de poids et de nombre d'objets jusqu'à la racine.
+
+        Toute modification passe par ici : la version de l'inventaire et de
+        ceux qui le contiennent augmente (voir render_cache.py), et les objets
+        touchés sont notés comme changés.
+        """
+        node = self
+        while node is not None:
+            node.total_weight += weight
+            node.total_count += count
+            node.version += 1
+            node.changed.update(item_ids)
+            node = node.parent
+
+    def item_ids(self):
+        """Retourne les numéros des objets de tout le sous-arbre."""
+        found = set(self.stacks)
+        for container in self.containers.values():
+            found |= container.item_ids()
+        return found
+
+    def take_changes(self):
+        """
+        Retourne les noms des objets dont la quantité a changé depuis l'appel
+        précédent (sous-conteneurs compris), et oublie ces changements.
+        """
+        changed, self.changed = self.changed, set()
+        return {ITEMS[item_id].name for item_id in changed}
+
+    def free_weight(self):
+        """
+        Poids qui peut encore être ajouté ici, compte tenu de la capacité
+        de ce conteneur et de tous ceux qui le contiennent.
+        """
+        free = float("inf")
+        node = self
+        while node is not None:
+            if node.capacity is not None:
+                free = min(free, node.capacity - node.content_weight)
+            node = node.parent
+        return max(free, 0.0)
+
+    def fits(self, weight):
+        """Indique si un poids supplémentaire tient dans ce conteneur."""
+        return weight <= self.free_weight() + EPSILON
+
+    def room_for(self, item, quantity):
+        """Retourne le nombre d'exemplaires d'un objet (au plus quantity) qui tiennent ici."""
+        free = self.free_weight()
+        if item.weight <= 0 or free == float("inf"):
+            return quantity
+        return min(quantity, int((free + EPSILON) // item.weight))
+
+    # --- Piles d'objets ---
+
+    def count(self, name, nested=False):
+        """
+        Retourne le nombre d'exemplaires d'un objet directement contenus.
+
+        Args:
+            name (str): Nom de l'objet.
+            nested (bool): Compter aussi les exemplaires rangés dans les sous-conteneurs.
+        """
+        item = ITEMS.get(name)
+        if item is None:
+            return 0
+        total = self.stacks.get(item.id, 0)
+        if nested:
+            for container in self.containers.values():
+                total += container.count(name, True)
+        return total
+
+    def add(self, name, quantity=1):
+        """
+        Ajoute des exemplaires d'un objet déjà enregistré dans ITEMS.
+        La capacité n'est pas vérifiée (voir transfer).
+
+        Raises:
+            KeyError: Si l'objet est inconnu du registre.
+        """
+        item = ITEMS.get(name)
+        if item is None:
+            raise KeyError(name)
+        if quantity > 0:
+            self.stacks[item.id] = self.stacks.get(item.id, 0) + quantity
+            self._propagate(item.weight * quantity, quantity, (item.id,))
+
+    def remove(self, name, quantity=1, nested=False):
+        """
+        Retire jusqu'à quantity exemplaires d'un objet.
+
+        Args:
+            name (str): Nom de l'objet.
+            quantity (int): Nombre d'exemplaires à retirer.
+            nested (bool): Compléter dans les sous-conteneurs si la pile directe ne suffit pas.
+
+        Returns:
+            int: Le nombre d'exemplaires effectivement retirés.
+        """
+        item = ITEMS.get(name)
+        if item is None:
+            return 0
+        removed = 0
+        held = self.stacks.get(item.id, 0)
+        if held:
+            removed = min(quantity, held)
+            if removed == held:
+                del self.stacks[item.id]
+            else:
+                self.stacks[item.id] = held - removed
+            self._propagate(-item.weight * removed, -removed, (item.id,))
+        if nested:
+            for container in self.containers.values():
+                if removed >= quantity:
+                    break
+                removed += container.remove(name, quantity - removed, True)
+        return removed
+
+    def transfer(self, other, name, quantity=None):
+        """
+        Déplace des exemplaires d'un objet vers un autre inventaire, dans la
+        limite de la place disponible à l'arrivée.
+
+        Args:
+            other (Inventory): L'inventaire de destination.
+            name (str): Le nom de l'objet.
+            quantity (int): Nombre d'exemplaires (None = toute la pile).
+
+        Returns:
+            int: Le nombre d'exemplaires déplacés.
+        """
+        item = ITEMS.get(name)
+        held = self.count(name)
+        if not held:
+            return 0
+        wanted = held if quantity is None else min(quantity, held)
+        # Retirer d'abord : la place libérée compte si other contient self
+        self.remove(name, wanted)
+        moved = other.room_for(item, wanted)
+        if moved < wanted:
+            self.add(name, wanted - moved)
+        if moved:
+            other.add(name, moved)
+        return moved
+
+    def transfer_all(self, other):
+        """
+        Déplace vers un autre inventaire tout ce qui y tient : piles puis conteneurs.
+
+        Returns:
+            tuple: (ce qui a été déplacé, tout a-t-il été déplacé ?). Les éléments
+            déplacés sont des couples (prototype ou conteneur, quantité).
+        """
+        moved = []
+        for item, quantity in list(self):
+            count = self.transfer(other, item.name, quantity)
+            if count:
+                moved.append((item, count))
+        for container in list(self.containers.values()):
+            if self.transfer_container(other, container.name):
+                moved.append((container, 1))
+        return moved, not self
+
+    # --- Conteneurs ---
+
+    def add_container(self, container):
+        """Range un conteneur (et tout son contenu) dans cet inventaire."""
+        if container.name in self.containers:
+            raise ValueError(f"Conteneur en double : '{container.name}'")
+        self.containers[container.name] = container
+        container.parent = self
+        self._propagate(container.total_weight, container.total_count, container.item_ids())
+
+    def remove_container(self, name):
+        """Sort un conteneur de cet inventaire et le retourne (ou None)."""
+        container = self.containers.pop(name, None)
+        if container is not None:
+            container.parent = None
+            self._propagate(-container.total_weight, -container.total_count,
+                            container.item_ids())
+        return container
+
+    def transfer_container(self, other, name):
+        """
+        Déplace un conteneur vers un autre inventaire s'il y tient.
+
+        Un conteneur ne peut pas être rangé dans lui-même ni dans l'un de ses
+        sous-conteneurs.
+
+        Returns:
+            bool: True si le conteneur a été déplacé.
+        """
+        container = self.containers.get(name)
+        if container is None or other.is_inside(container) or name in other.containers:
+            return False
+        self.remove_container(name)
+        if not other.fits(container.total_weight):
+            self.add_container(container)
+            return False
+        other.add_container(container)
+        return True
+
+    def is_inside(self, container):
+        """Indique si cet inventaire est le conteneur donné ou l'un de ses sous-conteneurs."""
+        node = self
+        while node is not None:
+            if node is container:
+                return True
+            node = node.parent
+        return False
+
+    def find_container(self, name):
+        """Cherche un conteneur par son nom dans tout le sous-arbre (ou None)."""
+        if name in self.containers:
+            return self.containers[name]
+        for container in self.containers.values():
+            found = container.find_container(name)
+            if found is not None:
+                return found
+        return None
+
+    # --- Affichage ---
+
+    def summary(self):
+        """Ligne décrivant un conteneur : description, poids et nombre d'objets."""
+        text = f"{self.name} : {self.description} ({self.total_weight:g} kg, "
+        text += f"{self.total_count} objet(s)"
+        if self.capacity is not None:
+            text += f", contenu {self.content_weight:g}/{self.capacity:g} kg"
+        return text + ")"
+
+    def container_lines(self, indent="    "):
+        """Lignes décrivant les sous-conteneurs et leur contenu, récursivement."""
+        lines = []
+        for container in self.containers.values():
+            lines.append(f"{indent}- [{container.summary()}]")
+            for item, quantity in container:
+                lines.append(f"{indent}    - {item.name} (x{quantity}) : {item.description}")
+            lines.extend(container.container_lines(indent + "    "))
+        return lines
+
+    # --- Sauvegarde ---
+
+    def to_dict(self):
+        """
+        Retourne le contenu sous forme sérialisable (pour la sauvegarde) :
+        {nom: quantité}, plus la clé "containers" s'il y a des sous-conteneurs.
+        """
+        data = {ITEMS[item_id].name: quantity for item_id, quantity in self.stacks.items()}
+        if self.containers:
+            data["containers"] = [
+                {"name": c.name, "description": c.description, "weight": c.weight,
+                 "capacity": c.capacity, "content": c.to_dict()}
+                for c in self.containers.values()
+            ]
+        return data
+
+    @classmethod
+    def from_dict(cls, data, **attributes):
+        """
+        Reconstruit un inventaire à partir de to_dict().
+
+        Raises:
+            KeyError: Si un objet est inconnu du registre.
+        """
+        data = dict(data)
+        containers = data.pop("containers", ())
+        inventory = cls(data, **attributes)
+        for entry in containers:
+            inventory.add_container(cls.from_dict(
+                entry["content"], name=entry["name"], description=entry["description"],
+                weight=entry["weight"], capacity=entry["capacity"]))
+        return inventory
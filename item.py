@@ -1,31 +1,100 @@
 """
-Module définissant la classe Item.
+Module définissant la classe Item et le registre des objets.
 Représente les objets que le joueur peut ramasser.
+
+Chaque sorte d'objet n'existe qu'en un seul exemplaire en mémoire (poids
+mouche) : les inventaires ne stockent que des piles (numéro d'objet, quantité)
+et partagent le prototype enregistré dans ITEMS.
 """
 
+
+class ItemDefinitionError(ValueError):
+    """Erreur levée quand un objet déjà enregistré est redéfini différemment."""
+
+
 class Item:
     """
-    Classe représentant un objet dans le jeu.
+    Classe représentant une sorte d'objet dans le jeu.
 
     Attributes:
+        id (int): Numéro de l'objet dans le registre.
         name (str): Le nom de l'objet.
         description (str): La description de l'objet.
         weight (float): Le poids de l'objet.
     """
 
-    def __init__(self, name: str):
+    __slots__ = ("id", "name", "description", "weight")
+
+    def __init__(self, name: str, description: str = "", weight: float = 0.0, item_id=None):
         """
         Constructeur de la classe Item.
 
         Args:
             name (str): Le nom de l'objet.
+            description (str): La description de l'objet.
+            weight (float): Le poids d'un exemplaire.
+            item_id (int): Numéro attribué par le registre.
         """
+        self.id = item_id
         self.name = name
-        self.description = ""
-        self.weight = 0.0
+        self.description = description
+        self.weight = weight
 
     def __str__(self) -> str:
         """
         Représentation textuelle de l'objet.
         """
         return f"{self.name} : {self.description} ({self.weight} kg)"
+
+
+class ItemRegistry:
+    """
+    Registre des prototypes d'objets, partagé par toutes les parties.
+
+    Attributes:
+        items (list): Les prototypes, indexés par numéro d'objet.
+    """
+
+    def __init__(self):
+        """Constructeur du registre."""
+        self.items = []
+        self._by_name = {}
+
+    def register(self, name, description="", weight=0.0):
+        """
+        Retourne le prototype d'un objet, en le créant s'il n'existe pas encore.
+
+        Un monde peut redéclarer un objet déjà connu (ex: "pièce") à
+        l'identique ; il partage alors le prototype existant.
+
+        Returns:
+            Item: Le prototype.
+
+        Raises:
+            ItemDefinitionError: Si le nom est déjà enregistré avec une autre
+                description ou un autre poids.
+        """
+        item = self._by_name.get(name)
+        if item is None:
+            item = Item(name, description, weight, len(self.items))
+            self.items.append(item)
+            self._by_name[name] = item
+        elif item.description != description or item.weight != weight:
+            raise ItemDefinitionError(
+                f"Objet '{name}' déjà défini autrement ({item.description}, {item.weight} kg).")
+        return item
+
+    def get(self, name):
+        """Retourne le prototype d'un objet par son nom, ou None."""
+        return self._by_name.get(name)
+
+    def __getitem__(self, item_id):
+        """Retourne le prototype d'un objet par son numéro."""
+        return self.items[item_id]
+
+    def __len__(self):
+        """Nombre de sortes d'objets enregistrées."""
+        return len(self.items)
+
+
+ITEMS = ItemRegistry()
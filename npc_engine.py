@@ -0,0 +1,271 @@
+"""
+Module définissant la classe NPCEngine.
+Simule le déplacement de tous les PNJ en un seul pas groupé.
+
+Les positions et les drapeaux de mobilité des PNJ sont stockés dans des
+tableaux indexés par numéro de PNJ ; les salles sont numérotées selon leur
+ordre dans la liste des salles du jeu. Si NumPy est installé, un tour complet
+est calculé de façon vectorisée ; sinon, une boucle sur des tableaux
+array.array prend le relais. Les deux chemins lisent les mêmes octets du
+générateur de la partie, dans le même ordre, et choisissent la destination
+en arithmétique entière : une graine donne la même partie, que NumPy soit
+installé ou non.
+
+En mode DEBUG, seuls les déplacements qui entrent dans une salle observée
+ou en sortent sont détaillés : le coût d'un tick reste indépendant du
+nombre de PNJ ailleurs dans le monde.
+"""
+import random
+import sys
+from array import array
+
+from character import name_key
+from console import DEBUG, debug, enabled
+from stats import instrumented
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Un octet tiré sur deux, en dessous de HALF, fait bouger un PNJ
+HALF = 128
+# Bits d'un tirage de destination (voir NPCEngine._picks)
+PICK_BITS = 32
+
+
+class NPCEngine:
+    """
+    Moteur de simulation des PNJ.
+
+    Les PNJ présents dans les salles (Room.characters, Character.current_room)
+    ne sont tenus à jour que pour les salles observées par le joueur ; les
+    autres sont reconstruites à la demande quand le joueur y entre.
+
+    Attributes:
+        rooms (list): Les salles du monde, dans l'ordre de leur numéro.
+        characters (list): Les PNJ suivis, dans l'ordre de leur numéro.
+        positions: Numéro de salle de chaque PNJ.
+        mobile: 1 si le PNJ peut se déplacer, 0 sinon.
+        moved (set): Numéros des PNJ déplacés depuis le dernier tour journalisé (savegame.py).
+    """
+
+    def __init__(self, rooms, characters, rng=None, use_numpy=True):
+        """
+        Constructeur du moteur.
+
+        Args:
+            rooms (list): Les salles du monde.
+            characters (list): Les PNJ à simuler.
+            rng (random.Random): Source de hasard (défaut: module random).
+            use_numpy (bool): Utilise NumPy s'il est disponible.
+        """
+        self.rooms = list(rooms)
+        self.characters = list(characters)
+        self.rng = rng if rng is not None else random
+        self.use_numpy = use_numpy and numpy is not None
+        self._room_ids = {id(room): index for index, room in enumerate(self.rooms)}
+        self._tracked = {id(npc) for npc in self.characters}
+        # clé de nom (name_key) -> numéros des PNJ portant ce nom, pour 'where'
+        self._by_key = {}
+        for npc_index, npc in enumerate(self.characters):
+            self._by_key.setdefault(npc.key, []).append(npc_index)
+        self._observed = set()
+        self.moved = set()
+
+        room_ids = [self._room_ids[id(npc.current_room)] for npc in self.characters]
+        flags = [1 if getattr(npc, "mobile", True) else 0 for npc in self.characters]
+        if self.use_numpy:
+            self.positions = numpy.array(room_ids, dtype=numpy.int64)
+            self.mobile = numpy.array(flags, dtype=bool)
+        else:
+            self.positions = array("q", room_ids)
+            self.mobile = array("b", flags)
+        self.rebuild_adjacency()
+
+    def reseed(self, seed):
+        """
+        Réinitialise la source de hasard (voir Game.tick).
+
+        Args:
+            seed (int): Nouvelle graine.
+        """
+        self.rng.seed(seed)
+
+    def rebuild_adjacency(self):
+        """Précalcule la table d'adjacence (à refaire si les sorties changent)."""
+        neighbours = [
+            [self._room_ids[id(room)] for room in r.exits.values() if room is not None]
+            for r in self.rooms
+        ]
+        if self.use_numpy:
+            width = max((len(n) for n in neighbours), default=0) or 1
+            self._adjacency = numpy.full((len(neighbours), width), -1, dtype=numpy.int64)
+            for room_id, targets in enumerate(neighbours):
+                self._adjacency[room_id, :len(targets)] = targets
+            self._degrees = numpy.array([len(n) for n in neighbours], dtype=numpy.int64)
+        else:
+            self._adjacency = [tuple(n) for n in neighbours]
+
+    def room_id(self, room):
+        """Retourne le numéro d'une salle."""
+        return self._room_ids[id(room)]
+
+    def room_of(self, npc_index):
+        """Retourne la salle où se trouve réellement un PNJ (même non observé)."""
+        return self.rooms[int(self.positions[npc_index])]
+
+    def locate(self, name):
+        """
+        Retrouve où sont les PNJ d'un nom donné (accents et casse ignorés) :
+        nom exact d'abord, puis noms contenant la saisie.
+
+        Les positions du moteur sont toujours à jour, même pour les salles
+        que le joueur n'observe pas.
+
+        Returns:
+            list: Couples (PNJ, salle).
+        """
+        key = name_key(name)
+        indexes = self._by_key.get(key)
+        if indexes is None and key:
+            indexes = [i for other_key, same_name in self._by_key.items()
+                       if key in other_key for i in same_name]
+        return [(self.characters[i], self.room_of(i)) for i in indexes or ()]
+
+    @instrumented("npcs.tick")
+    def tick(self, observed_rooms=()):
+        """
+        Avance tous les PNJ mobiles d'un tour.
+
+        Chaque PNJ mobile a une chance sur deux de bouger vers une salle
+        voisine tirée au hasard.
+
+        Args:
+            observed_rooms (iterable): Salles vues par le joueur, à garder cohérentes.
+
+        Returns:
+            int: Le nombre de PNJ qui se sont déplacés.
+        """
+        observed = self.observe(observed_rooms)
+
+        if self.use_numpy:
+            moved, old_positions = self._step_numpy()
+            self.moved.update(moved.tolist())
+            visible = self._visible_numpy(moved, old_positions, observed)
+        else:
+            moved, old_positions = self._step_python()
+            self.moved.update(moved)
+            positions = self.positions
+            visible = [(npc_index, old_id) for npc_index, old_id in zip(moved, old_positions)
+                       if old_id in observed or positions[npc_index] in observed]
+
+        visible = list(visible)
+        for npc_index, old_id in visible:
+            self._apply_move(npc_index, old_id, int(self.positions[npc_index]))
+        if enabled(DEBUG):
+            self._debug_report(visible)
+        return len(moved)
+
+    def observe(self, observed_rooms):
+        """
+        Déclare les salles observées et reconstruit celles qui viennent de l'être.
+
+        Returns:
+            set: Les numéros des salles observées.
+        """
+        observed = {self._room_ids[id(room)] for room in observed_rooms}
+        for room_id in observed - self._observed:
+            self.materialize(room_id)
+        self._observed = observed
+        return observed
+
+    def _picks(self, count):
+        """Tire count entiers de 32 bits, pour choisir les destinations."""
+        data = self.rng.randbytes(4 * count)
+        if self.use_numpy:
+            return numpy.frombuffer(data, dtype="<u4").astype(numpy.int64)
+        picks = array("I", data)
+        if sys.byteorder == "big":
+            picks.byteswap()
+        return picks
+
+    def _step_numpy(self):
+        """Calcule un tour de déplacement de façon vectorisée."""
+        positions = self.positions
+        draws = numpy.frombuffer(self.rng.randbytes(len(positions)), dtype=numpy.uint8)
+        wants = self.mobile & (draws < HALF)
+        degrees = self._degrees[positions]
+        moving = numpy.flatnonzero(wants & (degrees > 0))
+        old = positions[moving]
+        choice = (self._picks(len(moving)) * degrees[moving]) >> PICK_BITS
+        positions[moving] = self._adjacency[old, choice]
+        return moving, old
+
+    def _visible_numpy(self, moved, old_positions, observed):
+        """Sélectionne les déplacements qui touchent une salle observée."""
+        if not observed or len(moved) == 0:
+            return []
+        watched = numpy.fromiter(observed, dtype=numpy.int64)
+        mask = (numpy.isin(old_positions, watched)
+                | numpy.isin(self.positions[moved], watched))
+        return zip(moved[mask].tolist(), old_positions[mask].tolist())
+
+    def _step_python(self):
+        """Calcule un tour de déplacement sans NumPy (mêmes tirages que _step_numpy)."""
+        positions = self.positions
+        adjacency = self._adjacency
+        draws = self.rng.randbytes(len(positions))
+        moved = [npc_index for npc_index, is_mobile in enumerate(self.mobile)
+                 if is_mobile and draws[npc_index] < HALF and adjacency[positions[npc_index]]]
+        old_positions = []
+        for npc_index, pick in zip(moved, self._picks(len(moved))):
+            old_id = positions[npc_index]
+            targets = adjacency[old_id]
+            positions[npc_index] = targets[(pick * len(targets)) >> PICK_BITS]
+            old_positions.append(old_id)
+        return moved, old_positions
+
+    def place(self, npc_index, room_id):
+        """
+        Place directement un PNJ dans une salle (chargement d'une sauvegarde).
+
+        Args:
+            npc_index (int): Numéro du PNJ.
+            room_id (int): Numéro de la salle.
+        """
+        npc = self.characters[npc_index]
+        npc.current_room.remove_character(npc)
+        self.positions[npc_index] = room_id
+        self.rooms[room_id].add_character(npc)
+
+    def _apply_move(self, npc_index, old_id, new_id):
+        """Répercute un déplacement sur les listes Room.characters."""
+        npc = self.characters[npc_index]
+        self.rooms[old_id].remove_character(npc)
+        self.rooms[new_id].add_character(npc)
+
+    def materialize(self, room_id):
+        """
+        Reconstruit la liste des PNJ d'une salle à partir des positions.
+
+        Args:
+            room_id (int): Numéro de la salle.
+        """
+        room = self.rooms[room_id]
+        others = [c for c in room.characters if id(c) not in self._tracked]
+        if self.use_numpy:
+            present = numpy.flatnonzero(self.positions == room_id).tolist()
+        else:
+            present = [i for i, pos in enumerate(self.positions) if pos == room_id]
+        room.clear_characters()
+        for npc in others:
+            room.add_character(npc)
+        for npc_index in present:
+            room.add_character(self.characters[npc_index])
+
+    def _debug_report(self, visible):
+        """Affiche les déplacements qui touchent une salle observée (mode DEBUG)."""
+        for npc_index, old_id in visible:
+            debug("DEBUG: {} s'est déplacé de '{}' vers '{}'.", self.characters[npc_index].name,
+                  self.rooms[old_id].name, self.room_of(npc_index).name)
@@ -0,0 +1,165 @@
+"""
+Module définissant les objectifs de quête typés.
+
+Un objectif est compilé une seule fois, à la création de la quête : ses
+paramètres (salle, action, seuil, objet) deviennent des champs typés et son
+texte n'est plus qu'un libellé, pour l'affichage et la sauvegarde. Vérifier
+un compteur est alors une comparaison d'entiers, sans relire le texte.
+
+Libellés reconnus par compile_objective :
+    - "Visiter <salle>" (ou Explorer, Aller à, Entrer dans) : VisitObjective ;
+    - un texte contenant un compteur connu (COUNTER_NAMES) et un nombre,
+      ex: "Se déplacer 10 fois" : CounterObjective ;
+    - "Posséder <nombre> <objet>" (ou Avoir) : ItemObjective ;
+    - tout autre texte, "<action> [avec | le | la] <cible>" : ActionObjective.
+"""
+
+# Préfixes des objectifs de visite de lieu
+ROOM_OBJECTIVE_PREFIXES = ("Visiter ", "Explorer ", "Aller à ", "Entrer dans ")
+# Préfixes des objectifs de possession d'objets
+ITEM_OBJECTIVE_PREFIXES = ("Posséder ", "Avoir ")
+# Compteurs suivis par le jeu (voir QuestManager.check_counter_objectives)
+COUNTER_NAMES = ("Se déplacer",)
+# Mots ignorés entre une action et sa cible ("Parler avec Fouras")
+ACTION_ARTICLES = ("avec ", "le ", "la ")
+
+
+class Objective:
+    """
+    Objectif de quête compilé.
+
+    Attributes:
+        label (str): Texte affiché ; identifie aussi l'objectif dans la quête et la sauvegarde.
+    """
+
+    __slots__ = ("label",)
+
+    def __init__(self, label):
+        """
+        Args:
+            label (str): Texte de l'objectif.
+        """
+        self.label = label
+
+    def __str__(self):
+        return self.label
+
+
+class VisitObjective(Objective):
+    """
+    Visiter une salle.
+
+    Attributes:
+        room_name (str): Nom de la salle.
+    """
+
+    __slots__ = ("room_name",)
+
+    def __init__(self, room_name, label=None):
+        super().__init__(label if label is not None else f"Visiter {room_name}")
+        self.room_name = room_name
+
+
+class ActionObjective(Objective):
+    """
+    Faire une action, éventuellement sur une cible ("Répondre 9").
+
+    Attributes:
+        action (str): L'action (premier mot du libellé).
+        target (str): La cible, ou None.
+    """
+
+    __slots__ = ("action", "target")
+
+    def __init__(self, action, target=None, label=None):
+        if label is None:
+            label = action if target is None else f"{action} {target}"
+        super().__init__(label)
+        self.action = action
+        self.target = target
+
+
+class CounterObjective(Objective):
+    """
+    Atteindre une valeur d'un compteur ("Se déplacer 10 fois").
+
+    Attributes:
+        counter (str): Nom du compteur.
+        required (int): Valeur à atteindre.
+    """
+
+    __slots__ = ("counter", "required")
+
+    def __init__(self, counter, required, label=None):
+        super().__init__(label if label is not None else f"{counter} {required} fois")
+        self.counter = counter
+        self.required = required
+
+    def progress(self, current_counts=None):
+        """Retourne le libellé suivi de la valeur actuelle du compteur, si elle est connue."""
+        if current_counts and self.counter in current_counts:
+            return f"{self.label} (Progression: {current_counts[self.counter]}/{self.required})"
+        return self.label
+
+
+class ItemObjective(Objective):
+    """
+    Avoir un nombre d'exemplaires d'un objet dans son inventaire (conteneurs compris).
+
+    Attributes:
+        item_name (str): Nom de l'objet.
+        quantity (int): Nombre d'exemplaires requis.
+    """
+
+    __slots__ = ("item_name", "quantity")
+
+    def __init__(self, item_name, quantity=1, label=None):
+        super().__init__(label if label is not None else f"Posséder {quantity} {item_name}")
+        self.item_name = item_name
+        self.quantity = quantity
+
+
+def _strip_prefix(text, prefixes):
+    """Retourne le texte sans le premier préfixe trouvé, ou None."""
+    for prefix in prefixes:
+        if text.startswith(prefix):
+            return text[len(prefix):]
+    return None
+
+
+def compile_objective(objective, counters=COUNTER_NAMES):
+    """
+    Compile un objectif écrit en texte (un objectif déjà typé est retourné tel quel).
+
+    Args:
+        objective (str | Objective): L'objectif.
+        counters (tuple): Noms des compteurs reconnus.
+
+    Returns:
+        Objective: L'objectif typé ; son libellé est le texte d'origine.
+    """
+    if isinstance(objective, Objective):
+        return objective
+    text = str(objective)
+
+    room_name = _strip_prefix(text, ROOM_OBJECTIVE_PREFIXES)
+    if room_name is not None:
+        return VisitObjective(room_name, text)
+
+    words = text.split()
+    for counter in counters:
+        if counter in text:
+            for word in words:
+                if word.isdigit():
+                    return CounterObjective(counter, int(word), text)
+
+    item = _strip_prefix(text, ITEM_OBJECTIVE_PREFIXES)
+    if item is not None:
+        quantity, _, item_name = item.partition(" ")
+        if quantity.isdigit() and item_name:
+            return ItemObjective(item_name, int(quantity), text)
+        return ItemObjective(item, 1, text)
+
+    action, _, target = text.partition(" ")
+    target = _strip_prefix(target, ACTION_ARTICLES) or target
+    return ActionObjective(action, target or None, text)
@@ -2,7 +2,17 @@
 Module définissant la classe Player.
 Gère l'état du joueur, son inventaire, son historique et son équipage.
 """
+from console import QUEST, display
+from history import MoveHistory, VisitedRooms
+from inventory import Inventory
 from quests import QuestManager
+from render_cache import RenderCache
+
+# Poids maximal transporté par le navire (kg) et sac de départ
+HOLD_CAPACITY = 50
+SACK = {"name": "sac", "description": "un sac de toile", "weight": 0.5, "capacity": 5}
+# Nombre de salles par page de la commande 'history'
+HISTORY_PAGE_SIZE = 10
 
 class Player:
     """
@@ -13,38 +23,68 @@ class Player:
         """Constructeur du joueur."""
         self.name = name
         self.current_room = None
-        self.history = []
-        self.inventory = {}
+        self.history = MoveHistory()
+        self.visited = VisitedRooms()
+        self.inventory = Inventory(capacity=HOLD_CAPACITY)
+        self.inventory.add_container(Inventory(**SACK))
         self.move_count = 0
         self.quest_manager = QuestManager(self)
         self.rewards = []
         self.crew = 6  # On commence avec 6 membres d'équipage
+        # État des portes vu par le joueur (gates.ExitCache, créé avec le monde)
+        self.exit_cache = None
+        # Derniers rendus de 'check' et 'history' (voir render_cache.py)
+        self._views = RenderCache()
+
+    def get_history(self, rooms, page=1):
+        """
+        Affiche une page des lieux visités (chacun une seule fois).
 
-    def get_history(self):
-        """Affiche l'historique des lieux visités."""
-        print("\nVous avez déjà visité les pièces suivantes :")
-        if not self.history:
-            print("- (aucune pour le moment)")
+        Args:
+            rooms (list): Les salles du monde, indexées par Room.id.
+            page (int): Numéro de la page (à partir de 1).
+        """
+        # Les salles visitées ne font que s'ajouter : leur nombre suffit comme version
+        key = (self.visited, len(self.visited), page)
+        display(self._views.get("history", key, self._render_history, rooms, page))
+
+    def _render_history(self, rooms, page):
+        """Construit une page de l'historique."""
+        lines = ["\nVous avez déjà visité les pièces suivantes :"]
+        if not self.visited:
+            lines.append("- (aucune pour le moment)")
         else:
-            for room in self.history:
-                print(f"- {room.name}")
-        print()
+            pages = self.visited.page_count(HISTORY_PAGE_SIZE)
+            if page > pages:
+                lines.append(f"- (page {page} inexistante : {pages} page(s) au total)")
+            for room_id in self.visited.page(page, HISTORY_PAGE_SIZE):
+                lines.append(f"- {rooms[room_id].name}")
+            if 1 < pages and page <= pages:
+                lines.append(f"(page {page}/{pages} : 'history <page>' pour les autres)")
+        lines.append("")
+        return "\n".join(lines)
 
     def get_inventory(self) -> str:
         """
         Produit une chaîne représentant l'inventaire et l'équipage.
         """
+        inventory = self.inventory
+        return self._views.get("inventory", (inventory, inventory.version, self.crew),
+                               self._render_inventory)
+
+    def _render_inventory(self):
+        """Construit la liste de l'inventaire et l'état de l'équipage."""
         status = f"\n👥 Équipage : {self.crew} matelots valides.\n"
 
         if not self.inventory:
             return status + "Votre inventaire est vide."
 
         lines = [status, "Vous disposez des items suivants :"]
-        for item_name, info in self.inventory.items():
-            description = info.get("description", "")
-            weight = info.get("weight", 0)
-            qty = info.get("quantity", 1)
-            lines.append(f"    - {item_name} (x{qty}) : {description} ({weight} kg)")
+        for item, qty in self.inventory:
+            lines.append(f"    - {item.name} (x{qty}) : {item.description} ({item.weight} kg)")
+        lines.extend(self.inventory.container_lines())
+        lines.append(f"\n⚖️  Chargement : {self.inventory.content_weight:g}/"
+                     f"{self.inventory.capacity:g} kg ({self.inventory.total_count} objet(s))")
         return "\n".join(lines)
 
     def move(self, direction):
@@ -57,49 +97,59 @@ class Player:
         next_room = self.current_room.exits.get(direction)
         if next_room is None:
             if direction in ["N", "E", "S", "O"]:
-                print("\nNotre perroquet n'a aperçu aucune île dans cette direction !\n")
+                display("\nNotre perroquet n'a aperçu aucune île dans cette direction !\n")
             else:
-                print("\nIl n'y a pas d'échelle pour monter ou descendre !\n")
+                display("\nIl n'y a pas d'échelle pour monter ou descendre !\n")
             return False
 
-        self.history.append(self.current_room)
+        self.history.push(self.current_room.id)
         self.current_room = next_room
-
-        # Check room visit objectives
-        self.quest_manager.check_room_objectives(self.current_room.name)
+        self.visit(next_room)
 
         self.move_count += 1
         self.quest_manager.check_counter_objectives("Se déplacer", self.move_count)
 
-        print(self.current_room.get_long_description())
+        display(self.current_room.get_long_description())
         return True
 
+    def visit(self, room):
+        """
+        Enregistre la présence du joueur dans une salle et vérifie les quêtes
+        (objectifs de visite, et exploration lors d'une première visite).
+        """
+        if self.visited.add(room.id):
+            self.quest_manager.check_exploration(room)
+        self.quest_manager.check_room_objectives(room.name)
+
     def add_reward(self, reward):
         """Ajoute une récompense spéciale au joueur."""
         if reward and reward not in self.rewards:
             self.rewards.append(reward)
-            print(f"\n🎁 Vous avez obtenu une récompense spéciale : {reward}\n")
+            display(f"\n🎁 Vous avez obtenu une récompense spéciale : {reward}\n",
+                    category=QUEST)
 
     def show_rewards(self):
         """Affiche les récompenses spéciales."""
         if not self.rewards:
-            print("\n🎁 Aucune récompense spéciale obtenue pour le moment.\n")
+            display("\n🎁 Aucune récompense spéciale obtenue pour le moment.\n")
         else:
-            print("\n🎁 Vos récompenses spéciales :")
+            display("\n🎁 Vos récompenses spéciales :")
             for reward in self.rewards:
-                print(f"  • {reward}")
-            print()
+                display(f"  • {reward}")
+            display()
 
     def lose_crew(self, amount):
         """Retire des membres d'équipage."""
         self.crew -= amount
         if self.crew < 0:
             self.crew = 0
-        print(f"\n💀 Drame ! Vous avez perdu {amount} membre(s) d'équipage !")
-        print(f"Il vous reste {self.crew} matelots fidèles.\n")
+        display(f"\n💀 Drame ! Vous avez perdu {amount} membre(s) d'équipage !")
+        display(f"Il vous reste {self.crew} matelots fidèles.\n")
+        self.quest_manager.notify("crew")
 
     def add_crew(self, amount):
         """Ajoute des membres d'équipage."""
         self.crew += amount
-        print(f"\n🤝 Bienvenue à bord ! Vous avez gagné {amount} membre(s) d'équipage !")
-        print(f"Vous avez maintenant {self.crew} matelots.\n")
+        display(f"\n🤝 Bienvenue à bord ! Vous avez gagné {amount} membre(s) d'équipage !")
+        display(f"Vous avez maintenant {self.crew} matelots.\n")
+        self.quest_manager.notify("crew")
@@ -2,6 +2,16 @@
 Module définissant les classes Quest et QuestManager.
 Gère le système de quêtes, d'objectifs et de récompenses.
 """
+import heapq
+from itertools import count
+
+from console import QUEST, display
+from objectives import (ActionObjective, CounterObjective, ItemObjective, VisitObjective,
+                        compile_objective)
+from render_cache import RenderCache
+from requirements import compile_requirement
+from stats import instrumented
+
 
 class Quest:
     """
@@ -10,33 +20,54 @@ class Quest:
     Attributes:
         title (str): Titre de la quête.
         description (str): Description.
-        objectives (list): Liste des objectifs textuels.
+        objectives (list): Libellés des objectifs (affichage, sauvegarde).
+        compiled (list): Objectifs typés (voir objectives.py), dans le même ordre.
         completed_objectives (list): Liste des objectifs accomplis.
         is_completed (bool): Statut de complétion global.
         is_active (bool): Si la quête est active.
         reward (str): Description de la récompense.
+        requires (list): Conditions de déblocage (voir requirements.py) ; une quête
+            qui en a est activée automatiquement quand elles sont toutes remplies.
+        version (int): Augmente à chaque changement d'état (voir render_cache.py).
+        manager (QuestManager): Gestionnaire prévenu des changements (ou None).
     """
 
-    def __init__(self, title, description, objectives=None, reward=None):
+    def __init__(self, title, description, objectives=None, reward=None, requires=None):
+        # pylint: disable=too-many-arguments
         self.title = title
         self.description = description
-        self.objectives = objectives if objectives is not None else []
+        self.compiled = [compile_objective(objective) for objective in objectives or ()]
+        self.objectives = [objective.label for objective in self.compiled]
         self.completed_objectives = []
+        self._objective_set = set(self.objectives)
+        self._completed_set = set()
         self.is_completed = False
         self.is_active = False
         self.reward = reward
+        self.requires = [compile_requirement(requirement) for requirement in requires or ()]
+        self.version = 0
+        self.manager = None
+
+    def _changed(self):
+        """Signale un changement d'état à la quête et à son gestionnaire."""
+        self.version += 1
+        if self.manager is not None:
+            self.manager.version += 1
 
     def activate(self):
         """Active la quête et affiche un message."""
         self.is_active = True
-        print(f"\n🗡️  Nouvelle quête activée: {self.title}")
-        print(f"📝 {self.description}\n")
+        self._changed()
+        display(f"\n🗡️  Nouvelle quête activée: {self.title}", category=QUEST)
+        display(f"📝 {self.description}\n", category=QUEST)
 
     def complete_objective(self, objective, player=None):
         """Marque un objectif comme accompli."""
-        if objective in self.objectives and objective not in self.completed_objectives:
+        if objective in self._objective_set and objective not in self._completed_set:
+            self._completed_set.add(objective)
             self.completed_objectives.append(objective)
-            print(f"✅ Objectif accompli: {objective}")
+            self._changed()
+            display(f"✅ Objectif accompli: {objective}", category=QUEST)
 
             if len(self.completed_objectives) == len(self.objectives):
                 self.complete_quest(player)
@@ -47,12 +78,25 @@ class Quest:
         """Termine la quête et donne la récompense."""
         if not self.is_completed:
             self.is_completed = True
-            print(f"\n🏆 Quête terminée: {self.title}")
+            self._changed()
+            display(f"\n🏆 Quête terminée: {self.title}", category=QUEST)
             if self.reward:
-                print(f"🎁 Récompense: {self.reward}")
+                display(f"🎁 Récompense: {self.reward}", category=QUEST)
                 if player:
                     player.add_reward(self.reward)
-            print()
+            display(category=QUEST)
+
+    def restore(self, is_active, is_completed, completed_objectives):
+        """Restaure l'état de la quête (chargement d'une sauvegarde), sans message."""
+        self.is_active = is_active
+        self.is_completed = is_completed
+        self.completed_objectives = list(completed_objectives)
+        self._completed_set = set(self.completed_objectives)
+        self._changed()
+
+    def is_objective_completed(self, objective):
+        """Indique si un objectif a déjà été accompli."""
+        return objective in self._completed_set
 
     def get_status(self):
         """Retourne le statut formaté de la quête."""
@@ -69,151 +113,450 @@ class Quest:
         details = f"\n📋 Quête: {self.title}\n"
         details += f"📖 {self.description}\n"
 
-        if self.objectives:
+        if self.compiled:
             details += "\nObjectifs:\n"
-            for objective in self.objectives:
-                status = "✅" if objective in self.completed_objectives else "⬜"
-                objective_text = self._format_objective_with_progress(objective, current_counts)
-                details += f"  {status} {objective_text}\n"
+            for objective in self.compiled:
+                status = "✅" if objective.label in self._completed_set else "⬜"
+                if isinstance(objective, CounterObjective):
+                    details += f"  {status} {objective.progress(current_counts)}\n"
+                else:
+                    details += f"  {status} {objective.label}\n"
+        details += self._requirements_details()
 
         if self.reward:
             details += f"\n🎁 Récompense: {self.reward}\n"
         return details
 
-    def _format_objective_with_progress(self, objective, current_counts):
-        """Formate l'objectif avec un compteur de progression si applicable."""
-        if not current_counts:
-            return objective
-
-        for counter_name, current_count in current_counts.items():
-            if counter_name in objective:
-                required = self._extract_number_from_text(objective)
-                if required is not None:
-                    return f"{objective} (Progression: {current_count}/{required})"
-        return objective
-
-    def _extract_number_from_text(self, text):
-        """Extrait le premier nombre trouvé dans une chaîne."""
-        for word in text.split():
-            if word.isdigit():
-                return int(word)
-        return None
+    def _requirements_details(self):
+        """Liste les conditions de déblocage d'une quête pas encore activée."""
+        if self.is_active or not self.requires:
+            return ""
+        lines = "".join(f"  🔒 {requirement}\n" for requirement in self.requires)
+        return f"\nConditions de déblocage:\n{lines}"
 
     def check_room_objective(self, room_name, player=None):
         """Vérifie les objectifs liés à la visite de lieux."""
-        room_objectives = [
-            f"Visiter {room_name}", f"Explorer {room_name}",
-            f"Aller à {room_name}", f"Entrer dans {room_name}"
-        ]
-        for objective in room_objectives:
-            if self.complete_objective(objective, player):
+        for objective in self.compiled:
+            if (isinstance(objective, VisitObjective) and objective.room_name == room_name
+                    and self.complete_objective(objective.label, player)):
                 return True
         return False
 
     def check_action_objective(self, action, target=None, player=None):
         """Vérifie les objectifs liés à des actions."""
-        if target:
-            variations = [
-                f"{action} {target}", f"{action} avec {target}",
-                f"{action} le {target}", f"{action} la {target}"
-            ]
-        else:
-            variations = [action]
-
-        for objective in variations:
-            if self.complete_objective(objective, player):
+        target = target or None
+        for objective in self.compiled:
+            if (isinstance(objective, ActionObjective) and objective.action == action
+                    and objective.target == target
+                    and self.complete_objective(objective.label, player)):
                 return True
         return False
 
     def check_counter_objective(self, counter_name, current_count, player=None):
-        """Vérifie les objectifs liés à des compteurs (ex: Marcher 10 fois)."""
-        for objective in self.objectives:
-            if counter_name in objective and objective not in self.completed_objectives:
-                words = objective.split()
-                for word in words:
-                    if word.isdigit():
-                        required = int(word)
-                        if current_count >= required:
-                            self.complete_objective(objective, player)
-                            return True
+        """Vérifie les objectifs liés à des compteurs (ex: Se déplacer 10 fois)."""
+        for objective in self.compiled:
+            if (isinstance(objective, CounterObjective) and objective.counter == counter_name
+                    and current_count >= objective.required
+                    and self.complete_objective(objective.label, player)):
+                return True
         return False
 
     def __str__(self):
         return self.get_status()
 
 
+class ExplorationQuest(Quest):
+    """
+    Quête d'exploration : visiter toutes les salles d'une région.
+
+    La progression n'est pas une liste d'objectifs textuels : elle se lit
+    dans l'ensemble de bits des salles visitées par le joueur
+    (VisitedRooms.rooms), et n'occupe qu'un compteur par quête.
+
+    Attributes:
+        region (Bitset): Numéros des salles à visiter.
+        total (int): Nombre de salles de la région.
+        visited_count (int): Nombre de salles de la région déjà visitées.
+    """
+
+    def __init__(self, title, description, region, reward=None, requires=None):
+        """
+        Constructeur de la quête.
+
+        Args:
+            region (Bitset): Numéros des salles à visiter.
+        """
+        # pylint: disable=too-many-arguments
+        super().__init__(title, description, [], reward, requires)
+        self.region = region
+        self.total = len(region)
+        self.visited_count = 0
+
+    def sync(self, visited):
+        """Recalcule la progression à partir des salles visitées (popcount), sans message."""
+        self.visited_count = self.region.intersection_count(visited.rooms)
+        self._changed()
+
+    def record_visit(self, room, player=None):
+        """
+        Enregistre la première visite d'une salle.
+
+        Returns:
+            bool: True si la salle fait partie de la région.
+        """
+        if self.is_completed or room.id not in self.region:
+            return False
+        self.visited_count += 1
+        self._changed()
+        display(f"✅ Lieu exploré: {room.name} ({self.visited_count}/{self.total})",
+                category=QUEST)
+        if self.visited_count >= self.total:
+            self.complete_quest(player)
+        return True
+
+    def get_status(self):
+        """Retourne le statut formaté de la quête."""
+        if not self.is_active or self.is_completed:
+            return super().get_status()
+        return f"⏳ {self.title} ({self.visited_count}/{self.total} lieux)"
+
+    def get_details(self, current_counts=None):
+        """Retourne les détails de la quête avec la progression de l'exploration."""
+        details = f"\n📋 Quête: {self.title}\n"
+        details += f"📖 {self.description}\n"
+        details += f"\nLieux explorés: {self.visited_count}/{self.total}\n"
+        details += self._requirements_details()
+        if self.reward:
+            details += f"\n🎁 Récompense: {self.reward}\n"
+        return details
+
+
 class QuestManager:
-    """Classe gérant l'ensemble des quêtes du jeu."""
+    """
+    Classe gérant l'ensemble des quêtes du jeu.
+
+    Les objectifs typés des quêtes actives sont indexés par événement (salle
+    visitée, action et cible, nom de compteur, objet possédé) : un événement
+    ne coûte que le nombre d'objectifs qui l'attendent, quel que soit le
+    nombre de quêtes actives.
+
+    Les quêtes verrouillées (Quest.requires) sont indexées de même par clé
+    d'état observé : un changement (quête terminée, salle, équipage, or)
+    n'évalue de nouveau que les quêtes qui en dépendent.
+
+    Attributes:
+        version (int): Augmente quand une quête est ajoutée ou change d'état.
+    """
 
     def __init__(self, player=None):
         self.quests = []
         self.active_quests = []
         self.player = player
+        self._by_title = {}
+        # nom de salle -> [(quête, objectif)] en attente de cette visite
+        self._by_room = {}
+        # (action, cible) -> [(quête, objectif)] en attente de cette action
+        self._by_action = {}
+        # libellé d'objectif -> [quêtes] en attente (complétion manuelle)
+        self._by_text = {}
+        # nom de compteur -> tas de (seuil, n°, quête, objectif)
+        self._counters = {}
+        # nom d'objet -> [(quête, objectif)] en attente de cette possession
+        self._by_item = {}
+        # (inventaire, version) lors du dernier check_inventory
+        self._inventory_seen = None
+        # numéro de salle pas encore visitée -> [quêtes d'exploration actives qui l'attendent]
+        self._by_region = {}
+        # clé d'état observé -> [quêtes verrouillées qui en dépendent]
+        self._locked = {}
+        self._sequence = count()
+        self.version = 0
+        self._views = RenderCache()
 
     def add_quest(self, quest):
         """Ajoute une quête au jeu."""
         self.quests.append(quest)
+        quest.manager = self
+        self.version += 1
+        self._by_title.setdefault(quest.title, quest)
+        if quest.is_active and not quest.is_completed:
+            self.active_quests.append(quest)
+            self._index_quest(quest)
+        elif quest.requires and not quest.is_active:
+            self._lock(quest)
+            if self.player is not None:
+                self._try_unlock(quest)
 
     def activate_quest(self, quest_title):
-        """Active une quête via son titre."""
+        """Active une quête via son titre (si ses conditions de déblocage sont remplies)."""
+        quest = self._by_title.get(quest_title)
+        if quest is None or quest.is_active or not self.is_unlocked(quest):
+            return False
+        quest.activate()
+        if quest.requires:
+            self._release(quest)
+        self.active_quests.append(quest)
+        self._index_quest(quest)
+        return True
+
+    def reindex(self):
+        """Reconstruit la liste des quêtes actives et les index (après une restauration)."""
+        self.active_quests = []
+        self._by_room = {}
+        self._by_action = {}
+        self._by_text = {}
+        self._counters = {}
+        self._by_item = {}
+        self._inventory_seen = None
+        self._by_region = {}
+        self._locked = {}
         for quest in self.quests:
-            if quest.title == quest_title and not quest.is_active:
-                quest.activate()
+            # Toute quête d'exploration reprend sa progression, même terminée
+            if isinstance(quest, ExplorationQuest) and self.player is not None:
+                quest.sync(self.player.visited)
+            if quest.is_active and not quest.is_completed:
                 self.active_quests.append(quest)
-                return True
-        return False
+                self._index_quest(quest)
+            elif quest.requires and not quest.is_active:
+                self._lock(quest)
+
+    # --- Déblocage des quêtes ---
+
+    def is_unlocked(self, quest):
+        """Indique si toutes les conditions de déblocage d'une quête sont remplies."""
+        for requirement in quest.requires:
+            if not requirement.is_met(self):
+                return False
+        return True
+
+    def _lock(self, quest):
+        """Enregistre une quête verrouillée auprès des clés d'état qu'elle observe."""
+        for key in {requirement.key for requirement in quest.requires}:
+            self._locked.setdefault(key, []).append(quest)
+        self._inventory_seen = None
+
+    def _release(self, quest):
+        """Retire une quête activée des clés d'état qu'elle observait."""
+        for key in {requirement.key for requirement in quest.requires}:
+            waiting = self._locked.get(key)
+            if waiting and quest in waiting:
+                waiting.remove(quest)
+                if not waiting:
+                    del self._locked[key]
+
+    def _try_unlock(self, quest):
+        """Active une quête verrouillée si ses conditions sont toutes remplies."""
+        if self.is_unlocked(quest):
+            self.activate_quest(quest.title)
+
+    def notify(self, key):
+        """
+        Signale qu'un état a changé : seules les quêtes verrouillées qui
+        l'observent sont évaluées de nouveau.
+
+        Args:
+            key: Clé de l'état (ex: "crew", ("quest", titre), ("room", nom)).
+        """
+        waiting = self._locked.get(key)
+        if not waiting:
+            return
+        # Une quête débloquée se retire des listes (voir _release) : on parcourt une copie
+        for quest in list(waiting):
+            self._try_unlock(quest)
+
+    def enter_room(self, room_name):
+        """Signale l'entrée du joueur dans une salle (conditions InRoom)."""
+        self.notify(("room", room_name))
+
+    # --- Progression des objectifs ---
+
+    def _index_quest(self, quest):
+        """Enregistre les objectifs restants d'une quête active dans les index."""
+        if isinstance(quest, ExplorationQuest):
+            visited = () if self.player is None else self.player.visited
+            if visited:
+                quest.sync(visited)
+            for room_id in quest.region:
+                if room_id not in visited:
+                    self._by_region.setdefault(room_id, []).append(quest)
+        for objective in quest.compiled:
+            label = objective.label
+            if quest.is_objective_completed(label):
+                continue
+            self._by_text.setdefault(label, []).append(quest)
+            if isinstance(objective, VisitObjective):
+                self._by_room.setdefault(objective.room_name, []).append((quest, label))
+            elif isinstance(objective, ActionObjective):
+                key = (objective.action, objective.target)
+                self._by_action.setdefault(key, []).append((quest, label))
+            elif isinstance(objective, CounterObjective):
+                heapq.heappush(self._counters.setdefault(objective.counter, []),
+                               (objective.required, next(self._sequence), quest, label))
+            elif isinstance(objective, ItemObjective):
+                self._by_item.setdefault(objective.item_name, []).append((quest, objective))
+                self._inventory_seen = None
+
+    def _after_progress(self, quest):
+        """
+        Retire la quête des quêtes actives si elle vient d'être terminée,
+        et débloque les quêtes qui en dépendent.
+        """
+        if quest.is_completed and quest in self.active_quests:
+            self.active_quests.remove(quest)
+            self.notify(("quest", quest.title))
+
+    def _complete_waiting(self, index, key, waiting):
+        """
+        Complète les objectifs en attente d'un événement, un seul par quête.
+
+        Args:
+            index (dict): Index de l'événement (ex: self._by_room).
+            key: Clé de l'événement, déjà retirée de l'index.
+            waiting (list): Les (quête, objectif) qui attendaient cet événement.
+        """
+        served = set()
+        for quest, objective in waiting:
+            # Comme Quest.check_room_objective : un seul objectif par quête
+            if quest in served:
+                index.setdefault(key, []).append((quest, objective))
+                continue
+            if quest.complete_objective(objective, self.player):
+                served.add(quest)
+                self._after_progress(quest)
+
+    def _complete_text(self, objective_text):
+        """
+        Complète un objectif, par son libellé, dans la première quête qui l'attend.
+
+        Args:
+            objective_text (str): Libellé exact de l'objectif.
+
+        Returns:
+            Quest | None: La quête qui a progressé, ou None.
+        """
+        waiting = self._by_text.get(objective_text)
+        if not waiting:
+            return None
+        for index, quest in enumerate(waiting):
+            if quest.complete_objective(objective_text, self.player):
+                del waiting[index]
+                if not waiting:
+                    del self._by_text[objective_text]
+                self._after_progress(quest)
+                return quest
+        # Entrées obsolètes (objectif accompli par un autre chemin)
+        waiting[:] = [q for q in waiting if not q.is_objective_completed(objective_text)]
+        if not waiting:
+            del self._by_text[objective_text]
+        return None
 
     def complete_objective(self, objective_text):
         """Complète un objectif manuellement dans les quêtes actives."""
-        for quest in self.active_quests:
-            if quest.complete_objective(objective_text):
-                if quest.is_completed:
-                    self.active_quests.remove(quest)
-                return True
-        return False
+        return self._complete_text(objective_text) is not None
 
+    @instrumented("quests.room")
     def check_room_objectives(self, room_name):
         """Vérifie les objectifs de salle pour toutes les quêtes actives."""
-        for quest in self.active_quests[:]:
-            quest.check_room_objective(room_name, self.player)
-            if quest.is_completed:
-                self.active_quests.remove(quest)
+        waiting = self._by_room.pop(room_name, None)
+        if waiting:
+            self._complete_waiting(self._by_room, room_name, waiting)
+
+    @instrumented("quests.exploration")
+    def check_exploration(self, room):
+        """
+        Fait progresser les quêtes d'exploration après la première visite d'une
+        salle : seules celles dont la région contient la salle sont évaluées.
+        """
+        waiting = self._by_region.pop(room.id, None)
+        if waiting:
+            for quest in waiting:
+                if quest.record_visit(room, self.player):
+                    self._after_progress(quest)
 
+    @instrumented("quests.action")
     def check_action_objectives(self, action, target=None):
         """Vérifie les objectifs d'action."""
-        for quest in self.active_quests[:]:
-            quest.check_action_objective(action, target, self.player)
-            if quest.is_completed:
-                self.active_quests.remove(quest)
+        key = (action, target or None)
+        waiting = self._by_action.pop(key, None)
+        if waiting:
+            self._complete_waiting(self._by_action, key, waiting)
 
+    @instrumented("quests.counter")
     def check_counter_objectives(self, counter_name, current_count):
-        """Vérifie les objectifs de compteur."""
-        for quest in self.active_quests[:]:
-            quest.check_counter_objective(counter_name, current_count, self.player)
-            if quest.is_completed:
-                self.active_quests.remove(quest)
+        """Vérifie les objectifs de compteur : les seuils atteints sont en tête du tas."""
+        heap = self._counters.get(counter_name)
+        while heap and heap[0][0] <= current_count:
+            _, _, quest, objective = heapq.heappop(heap)
+            if quest.complete_objective(objective, self.player):
+                self._after_progress(quest)
+
+    @instrumented("quests.inventory")
+    def check_inventory(self, inventory):
+        """
+        Vérifie les objectifs de possession d'objets (conteneurs compris).
+
+        Rien n'est recompté tant que la version de l'inventaire n'a pas changé ;
+        ensuite, seuls les objets dont la quantité a changé sont recomptés
+        (tous après une réindexation ou un changement d'inventaire). Les quêtes
+        verrouillées qui attendent de l'or ou un objet sont aussi évaluées.
+
+        Args:
+            inventory (Inventory): L'inventaire du joueur.
+        """
+        locked = self._locked
+        if not self._by_item and "gold" not in locked and "inventory" not in locked:
+            return
+        seen = (inventory, inventory.version)
+        if self._inventory_seen == seen:
+            return
+        full = self._inventory_seen is None or self._inventory_seen[0] is not inventory
+        self._inventory_seen = seen
+        changed = inventory.take_changes()
+        self.notify("gold")
+        self.notify("inventory")
+        if full:
+            item_names = list(self._by_item)
+        else:
+            item_names = [name for name in changed if name in self._by_item]
+        for item_name in item_names:
+            held = inventory.count(item_name, nested=True)
+            waiting = self._by_item[item_name]
+            remaining = []
+            for quest, objective in waiting:
+                if quest.is_objective_completed(objective.label):
+                    continue
+                if held >= objective.quantity:
+                    if quest.complete_objective(objective.label, self.player):
+                        self._after_progress(quest)
+                else:
+                    remaining.append((quest, objective))
+            if remaining:
+                self._by_item[item_name] = remaining
+            else:
+                del self._by_item[item_name]
 
     def get_quest_by_title(self, title):
         """Récupère une quête par son titre."""
-        for quest in self.quests:
-            if quest.title == title:
-                return quest
-        return None
+        return self._by_title.get(title)
 
     def show_quests(self):
         """Affiche la liste des quêtes."""
         if not self.quests:
-            print("\nAucune quête disponible.\n")
+            display("\nAucune quête disponible.\n")
             return
-        print("\n📋 Liste des quêtes:")
-        for quest in self.quests:
-            print(f"  {quest.get_status()}")
-        print()
+        display(self._views.get("quests", self.version, self._render_quests))
+
+    def _render_quests(self):
+        """Construit la liste des quêtes et de leur statut."""
+        lines = ["\n📋 Liste des quêtes:"]
+        lines.extend(f"  {quest.get_status()}" for quest in self.quests)
+        lines.append("")
+        return "\n".join(lines)
 
     def show_quest_details(self, quest_title, current_counts=None):
         """Affiche les détails d'une quête."""
         quest = self.get_quest_by_title(quest_title)
         if quest:
-            print(quest.get_details(current_counts))
+            display(quest.get_details(current_counts))
         else:
-            print(f"\nQuête '{quest_title}' non trouvée.\n")
+            display(f"\nQuête '{quest_title}' non trouvée.\n")
@@ -0,0 +1,46 @@
+"""
+Module définissant la classe RenderCache.
+Mémorise le dernier texte rendu des vues d'un objet (look, check, quests, history).
+
+Les objets affichés portent un compteur de version, incrémenté à chaque
+modification (Room.version, Inventory.version, QuestManager.version...). Une
+vue est rendue une fois pour une clé faite de ces versions ; tant que rien
+ne change, l'afficher de nouveau ne coûte qu'une recherche dans un
+dictionnaire et une comparaison de clé.
+"""
+
+
+class RenderCache:
+    """
+    Derniers rendus des vues d'un objet : nom de la vue -> (clé, texte).
+    """
+
+    __slots__ = ("_views",)
+
+    def __init__(self):
+        """Constructeur d'un cache vide."""
+        self._views = {}
+
+    def get(self, view, key, render, *args):
+        """
+        Retourne le texte mémorisé d'une vue si sa clé n'a pas changé, sinon le rend à nouveau.
+
+        Args:
+            view (str): Nom de la vue (ex: "description").
+            key: Versions des objets affichés (comparées par ==, les objets par identité).
+            render (callable): Fonction qui produit le texte.
+            args: Arguments de render.
+
+        Returns:
+            str: Le texte de la vue.
+        """
+        entry = self._views.get(view)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        text = render(*args)
+        self._views[view] = (key, text)
+        return text
+
+    def clear(self):
+        """Oublie tous les rendus."""
+        self._views.clear()
@@ -0,0 +1,154 @@
+"""
+Module définissant les conditions de déblocage des quêtes.
+
+Une quête qui a des conditions (Quest.requires) reste verrouillée jusqu'à ce
+qu'elles soient toutes remplies : elle est alors activée automatiquement.
+Chaque condition déclare la clé de l'état qu'elle observe (une quête, une
+salle, l'équipage, l'or, l'inventaire) ; le QuestManager n'évalue de
+nouveau que les quêtes qui attendent la clé qui vient de changer
+(QuestManager.notify). Les mêmes conditions ferment les sorties (voir
+gates.py), dont l'état n'est recalculé que si l'empreinte (stamp) de leurs
+entrées a changé.
+
+Conditions écrites en texte (compile_requirement) : un titre de quête, qui
+doit être terminée.
+"""
+
+# Valeurs du joueur observables : nom -> (lecture, libellé de l'unité)
+PLAYER_STATS = {
+    "crew": (lambda player: player.crew, "matelots"),
+    "gold": (lambda player: player.inventory.count("pièce", nested=True), "pièces d'or"),
+}
+
+
+class Requirement:
+    """
+    Condition de déblocage d'une quête.
+
+    Attributes:
+        key: Clé de l'état observé, passée à QuestManager.notify quand il change.
+        label (str): Texte affiché dans les détails de la quête.
+    """
+
+    __slots__ = ("key", "label")
+
+    def __init__(self, key, label):
+        self.key = key
+        self.label = label
+
+    def __str__(self):
+        return self.label
+
+    def is_met(self, manager):
+        """
+        Indique si la condition est remplie.
+
+        Args:
+            manager (QuestManager): Le gestionnaire de quêtes (et son joueur).
+        """
+        raise NotImplementedError
+
+    def stamp(self, manager):
+        """
+        Empreinte des entrées de la condition : tant qu'elle ne change pas,
+        is_met retourne le même résultat.
+        """
+        raise NotImplementedError
+
+
+class QuestCompleted(Requirement):
+    """Une autre quête doit être terminée (chaîne de quêtes)."""
+
+    __slots__ = ("title",)
+
+    def __init__(self, title):
+        super().__init__(("quest", title), f"Terminer '{title}'")
+        self.title = title
+
+    def is_met(self, manager):
+        quest = manager.get_quest_by_title(self.title)
+        return quest is not None and quest.is_completed
+
+    def stamp(self, manager):
+        quest = manager.get_quest_by_title(self.title)
+        return None if quest is None else quest.version
+
+
+class InRoom(Requirement):
+    """Le joueur doit entrer dans une salle."""
+
+    __slots__ = ("room_name",)
+
+    def __init__(self, room_name):
+        super().__init__(("room", room_name), f"Entrer dans le lieu : {room_name}")
+        self.room_name = room_name
+
+    def is_met(self, manager):
+        player = manager.player
+        return (player is not None and player.current_room is not None
+                and player.current_room.name == self.room_name)
+
+    def stamp(self, manager):
+        return None if manager.player is None else manager.player.current_room
+
+
+class MinimumStat(Requirement):
+    """Une valeur du joueur (PLAYER_STATS) doit atteindre un minimum."""
+
+    __slots__ = ("stat", "amount")
+
+    def __init__(self, stat, amount):
+        if stat not in PLAYER_STATS:
+            raise ValueError(f"Valeur du joueur inconnue : '{stat}'.")
+        super().__init__(stat, f"Avoir {amount} {PLAYER_STATS[stat][1]}")
+        self.stat = stat
+        self.amount = amount
+
+    def is_met(self, manager):
+        player = manager.player
+        return player is not None and PLAYER_STATS[self.stat][0](player) >= self.amount
+
+    def stamp(self, manager):
+        player = manager.player
+        if player is None:
+            return None
+        if self.stat == "gold":
+            # L'or est compté dans l'inventaire : sa version suffit
+            return (player.inventory, player.inventory.version)
+        return player.crew
+
+
+class HasItem(Requirement):
+    """Le joueur doit posséder un objet (conteneurs compris)."""
+
+    __slots__ = ("item_name", "quantity")
+
+    def __init__(self, item_name, quantity=1):
+        label = f"Posséder {item_name}" if quantity == 1 else f"Posséder {quantity} {item_name}"
+        super().__init__("inventory", label)
+        self.item_name = item_name
+        self.quantity = quantity
+
+    def is_met(self, manager):
+        player = manager.player
+        return (player is not None
+                and player.inventory.count(self.item_name, nested=True) >= self.quantity)
+
+    def stamp(self, manager):
+        player = manager.player
+        return None if player is None else (player.inventory, player.inventory.version)
+
+
+def compile_requirement(requirement):
+    """
+    Compile une condition écrite en texte (une condition déjà typée est retournée telle quelle).
+
+    Args:
+        requirement (str | Requirement): Titre d'une quête à terminer, ou la condition.
+
+    Returns:
+        Requirement: La condition typée.
+    """
+    if isinstance(requirement, Requirement):
+        return requirement
+    return QuestCompleted(str(requirement))
@@ -2,6 +2,9 @@
 Module définissant la classe Room.
 Représente les lieux du jeu, leurs sorties et leur contenu.
 """
+from character import name_key
+from inventory import Inventory
+from render_cache import RenderCache
 
 class Room:
     """
@@ -11,8 +14,12 @@ class Room:
         name (str): Le nom du lieu.
         description (str): La description du lieu.
         exits (dict): Les sorties disponibles vers d'autres salles.
-        inventory (dict): Les objets présents dans la salle.
-        characters (list): Les personnages présents dans la salle.
+        gates (dict): Portes posées sur des sorties, par direction (None si aucune, voir gates.py).
+        inventory (Inventory): Les objets présents dans la salle.
+        characters (dict): Les personnages présents (utilisé comme ensemble ordonné).
+        id (int): Numéro de la salle dans le graphe compilé du monde (WorldGraph).
+        version (int): Version du nom, de la description et des sorties (voir touch).
+        characters_version (int): Augmente à chaque arrivée ou départ de PNJ.
     """
 
     def __init__(self, name: str, description: str):
@@ -26,8 +33,40 @@ class Room:
         self.name = name
         self.description = description
         self.exits = {}
-        self.inventory = {}
-        self.characters = []
+        self.gates = None
+        self.inventory = Inventory()
+        self.characters = {}
+        # clé de nom (name_key) -> personnages présents portant ce nom
+        self._characters_by_key = {}
+        self.id = None
+        self.version = 0
+        self.characters_version = 0
+        # Derniers rendus (créés au premier affichage : la plupart des salles ne le sont jamais)
+        self._views = None
+
+    def touch(self):
+        """
+        Signale un changement de nom, de description ou de sorties.
+
+        WorldGraph.compile() le fait pour toutes les salles : après avoir
+        modifié des sorties, recompiler le graphe suffit.
+        """
+        self.version += 1
+
+    def lock_exit(self, direction, gate):
+        """
+        Pose une porte sur une sortie (voir gates.py).
+        Le graphe du monde doit être recompilé ensuite (WorldGraph.compile).
+        """
+        if self.gates is None:
+            self.gates = {}
+        self.gates[direction] = gate
+
+    def _view(self, view, key, render):
+        """Rendu mémorisé d'une vue de la salle (voir render_cache.py)."""
+        if self._views is None:
+            self._views = RenderCache()
+        return self._views.get(view, key, render)
 
     def get_exit(self, direction: str):
         """
@@ -48,6 +87,10 @@ class Room:
         Returns:
             str: Liste des sorties formatée.
         """
+        return self._view("exits", self.version, self._render_exits)
+
+    def _render_exits(self):
+        """Construit la liste des sorties."""
         exit_string = "Sorties: "
         for exit_key, room in self.exits.items():
             if room is not None:
@@ -61,14 +104,18 @@ class Room:
         Returns:
             str: Chaîne prête à afficher.
         """
+        inventory = self.inventory
+        return self._view("inventory", (inventory, inventory.version), self._render_inventory)
+
+    def _render_inventory(self):
+        """Construit la liste des objets de la pièce."""
         if not self.inventory:
             return "Il n'y a rien ici."
 
         lines = ["La pièce contient :"]
-        for item_name, info in self.inventory.items():
-            desc = info.get("description", "")
-            weight = info.get("weight", 0)
-            lines.append(f"    - {item_name} : {desc} ({weight} kg)")
+        for item, _ in self.inventory:
+            lines.append(f"    - {item.name} : {item.description} ({item.weight} kg)")
+        lines.extend(self.inventory.container_lines())
         return "\n".join(lines)
 
     def get_long_description(self) -> str:
@@ -78,11 +125,33 @@ class Room:
         Returns:
             str: Description formatée.
         """
+        return self._view("description", self.version, self._render_long_description)
+
+    def _render_long_description(self):
+        """Construit la description complète."""
         return (
             f"\nVous venez d'arriver dans {self.name}, {self.description}\n\n"
             f"{self.get_exit_string()}\n"
         )
 
+    def get_characters(self) -> str:
+        """
+        Produit une chaîne listant les PNJ présents.
+
+        Returns:
+            str: Chaîne prête à afficher.
+        """
+        return self._view("characters", self.characters_version, self._render_characters)
+
+    def _render_characters(self):
+        """Construit la liste des PNJ présents."""
+        if not self.characters:
+            return "Il n'y a pas de PNJ ici."
+        lines = ["PNJ présents :"]
+        for character in self.characters:
+            lines.append(f" - {character.name} : {character.description}")
+        return "\n".join(lines)
+
     def add_character(self, character):
         """
         Ajoute un PNJ à cette room si pas déjà présent.
@@ -91,7 +160,9 @@ class Room:
             character (Character): Le personnage à ajouter.
         """
         if character not in self.characters:
-            self.characters.append(character)
+            self.characters[character] = None
+            self._characters_by_key.setdefault(character.key, {})[character] = None
+            self.characters_version += 1
             character.current_room = self
 
     def remove_character(self, character):
@@ -102,4 +173,38 @@ class Room:
             character (Character): Le personnage à retirer.
         """
         if character in self.characters:
-            self.characters.remove(character)
+            del self.characters[character]
+            self.characters_version += 1
+            same_name = self._characters_by_key[character.key]
+            del same_name[character]
+            if not same_name:
+                del self._characters_by_key[character.key]
+
+    def clear_characters(self):
+        """Retire tous les PNJ de cette room."""
+        self.characters = {}
+        self._characters_by_key = {}
+        self.characters_version += 1
+
+    def find_character(self, name):
+        """
+        Cherche un PNJ présent par son nom, sans tenir compte des accents ni
+        de la casse : nom exact d'abord, puis nom contenant la saisie.
+
+        Le coût ne dépend que du nombre de noms différents, pas du nombre de
+        PNJ présents (une taverne pleine de "Matelot" reste rapide).
+
+        Args:
+            name (str): Le nom saisi.
+
+        Returns:
+            Character | None: Le premier PNJ trouvé.
+        """
+        key = name_key(name)
+        same_name = self._characters_by_key.get(key)
+        if same_name is None and key:
+            for other_key, characters in self._characters_by_key.items():
+                if key in other_key:
+                    same_name = characters
+                    break
+        return next(iter(same_name)) if same_name else None
@@ -0,0 +1,364 @@
+"""
+Module définissant la classe SaveManager.
+Sauvegarde la partie sous forme d'un instantané compact et d'un journal de deltas.
+
+Deux fichiers sont utilisés :
+    - l'instantané (chemin donné) : tout l'état de la partie, en JSON compressé (zlib) ;
+    - le journal (chemin + ".journal") : une ligne JSON par tour, ne contenant
+      que ce qui a changé depuis le tour précédent.
+
+Sauvegarder après chaque commande ne coûte donc que la taille du changement :
+les changements sont repérés par les compteurs de version (inventaires,
+quêtes), les listes qui ne font que grandir (salles visitées, récompenses),
+les marques de l'historique (MoveHistory.take_changes) et les ensembles de
+salles et de PNJ modifiés par l'horloge (Game.dirty_rooms, NPCEngine.moved),
+sans relire tout l'état à chaque tour.
+Quand le journal devient long, il est fusionné dans un nouvel instantané
+(compaction). Reprendre une partie = charger l'instantané puis rejouer les
+deltas du journal, jamais la transcription complète des commandes.
+"""
+import json
+import os
+import zlib
+
+from history import MoveHistory, VisitedRooms
+from inventory import Inventory
+
+SAVE_FORMAT = 9
+# Valeurs simples du joueur, comparées à chaque tour
+PLAYER_FIELDS = ("name", "room", "crew", "move_count")
+
+
+class SaveError(ValueError):
+    """Erreur levée quand une sauvegarde est illisible ou ne correspond pas au monde."""
+
+
+def _encode(data):
+    """Encode un objet en JSON compact."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+class SaveManager:
+    """
+    Gestionnaire de sauvegarde d'une partie.
+
+    Attributes:
+        game (Game): La partie sauvegardée.
+        path (str): Chemin de l'instantané.
+        journal_path (str): Chemin du journal de deltas.
+        compact_every (int): Nombre de tours journalisés avant compaction.
+    """
+
+    def __init__(self, game, path, compact_every=200):
+        """
+        Constructeur du gestionnaire.
+
+        Args:
+            game (Game): La partie à sauvegarder.
+            path (str): Chemin de l'instantané.
+            compact_every (int): Nombre de tours journalisés avant compaction.
+        """
+        self.game = game
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compact_every = compact_every
+        self.turn = 0
+        self._journal_entries = 0
+        # Repères de l'état déjà écrit (voir _remember), None avant le premier instantané
+        self._seen = None
+
+    def exists(self):
+        """Indique si une sauvegarde existe déjà."""
+        return os.path.exists(self.path)
+
+    def saved_name(self):
+        """Retourne le nom du joueur sauvegardé, ou None."""
+        if not self.exists():
+            return None
+        return self._read_snapshot()["player"]["name"]
+
+    # --- Capture de l'état ---
+
+    def _capture_player(self):
+        """Retourne l'état du joueur."""
+        player = self.game.player
+        return {
+            "name": player.name,
+            "room": player.current_room.id,
+            "inventory": player.inventory.to_dict(),
+            "history": player.history.to_list(),
+            "visited": list(player.visited.order),
+            "crew": player.crew,
+            "move_count": player.move_count,
+            "rewards": list(player.rewards),
+        }
+
+    def _capture_quests(self):
+        """Retourne l'état de chaque quête, dans l'ordre du QuestManager."""
+        return [[quest.is_active, quest.is_completed, list(quest.completed_objectives)]
+                for quest in self.game.player.quest_manager.quests]
+
+    def _capture_npcs(self):
+        """Retourne la salle de chaque PNJ suivi par le moteur."""
+        return [int(position) for position in self.game.npc_engine.positions]
+
+    def _capture(self):
+        """Capture l'état complet de la partie."""
+        game = self.game
+        return {
+            "format": SAVE_FORMAT,
+            "world": game.world_file,
+            "room_count": len(game.rooms),
+            "turn": self.turn,
+            "seed": game.seed,
+            "ticks": game.ticks,
+            "player": self._capture_player(),
+            "rooms": {str(room.id): room.inventory.to_dict()
+                      for room in game.rooms},
+            "npcs": self._capture_npcs(),
+            "quests": self._capture_quests(),
+            "triggers": sorted(game.triggers.fired),
+            "scene": game.dialogue.state(),
+        }
+
+    # --- Écriture ---
+
+    def save_snapshot(self):
+        """Écrit un instantané complet et vide le journal (compaction)."""
+        state = self._capture()
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as snapshot:
+            snapshot.write(zlib.compress(_encode(state).encode("utf-8")))
+        os.replace(temporary, self.path)
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+        self._journal_entries = 0
+        self._remember(state)
+
+    def _remember(self, state):
+        """
+        Prend les repères de l'état écrit (ou restauré) : les prochains deltas
+        ne contiendront que ce qui a changé depuis.
+        """
+        game = self.game
+        player = game.player
+        current = player.current_room
+        quest_manager = player.quest_manager
+        self._seen = {
+            "player": {key: state["player"][key] for key in PLAYER_FIELDS},
+            "inventory": (player.inventory, player.inventory.version),
+            "visited": len(player.visited),
+            "rewards": len(player.rewards),
+            "room": (current.id, current.inventory, current.inventory.version),
+            "quest_version": quest_manager.version,
+            "quest_versions": [quest.version for quest in quest_manager.quests],
+            "quests": state["quests"],
+            "triggers": len(game.triggers.fired),
+            "ticks": state["ticks"],
+            "scene": state["scene"],
+        }
+        player.history.take_changes()
+        game.npc_engine.moved.clear()
+        game.dirty_rooms.clear()
+
+    def _player_delta(self):
+        """Retourne les changements du joueur depuis le dernier tour journalisé."""
+        seen = self._seen
+        player = self.game.player
+        changed = {}
+        for key, value in (("name", player.name), ("room", player.current_room.id),
+                           ("crew", player.crew), ("move_count", player.move_count)):
+            if seen["player"][key] != value:
+                changed[key] = seen["player"][key] = value
+        inventory = player.inventory
+        if seen["inventory"] != (inventory, inventory.version):
+            changed["inventory"] = inventory.to_dict()
+            seen["inventory"] = (inventory, inventory.version)
+        history = player.history.take_changes()
+        if history is not None:
+            changed["history_changes"] = history
+        for key, values in (("visited", player.visited.order), ("rewards", player.rewards)):
+            if len(values) != seen[key]:
+                changed[key + "_append"] = values[seen[key]:]
+                seen[key] = len(values)
+        return changed
+
+    def _rooms_delta(self):
+        """
+        Retourne l'inventaire des salles changées au dernier tour : celle où
+        se trouvait le joueur (si sa version a changé) et celles que l'horloge
+        a changées (Game.dirty_rooms).
+        """
+        game = self.game
+        room_ids = set(game.dirty_rooms)
+        room_id, inventory, version = self._seen["room"]
+        if game.rooms[room_id].inventory is not inventory or inventory.version != version:
+            room_ids.add(room_id)
+        game.dirty_rooms.clear()
+        current = game.player.current_room
+        self._seen["room"] = (current.id, current.inventory, current.inventory.version)
+        return {str(i): game.rooms[i].inventory.to_dict() for i in sorted(room_ids)}
+
+    def _quests_delta(self):
+        """Retourne l'état des quêtes dont la version a changé au dernier tour."""
+        seen = self._seen
+        quest_manager = self.game.player.quest_manager
+        if quest_manager.version == seen["quest_version"]:
+            return {}
+        seen["quest_version"] = quest_manager.version
+        versions = seen["quest_versions"]
+        changed = {}
+        for index, quest in enumerate(quest_manager.quests):
+            if quest.version == versions[index]:
+                continue
+            versions[index] = quest.version
+            state = [quest.is_active, quest.is_completed, list(quest.completed_objectives)]
+            if state != seen["quests"][index]:
+                changed[str(index)] = seen["quests"][index] = state
+        return changed
+
+    def record_turn(self):
+        """
+        Ajoute au journal les changements du dernier tour.
+
+        Le coût d'un tour dépend de ce qui a changé, pas de la taille de l'état :
+        rien n'est recopié ni comparé pour ce qui n'a pas bougé.
+        """
+        if self._seen is None:
+            self.save_snapshot()
+            return
+        self.turn += 1
+        game = self.game
+        seen = self._seen
+        delta = {"turn": self.turn}
+
+        player = self._player_delta()
+        if player:
+            delta["player"] = player
+        rooms = self._rooms_delta()
+        if rooms:
+            delta["rooms"] = rooms
+
+        moved = game.npc_engine.moved
+        if moved:
+            positions = game.npc_engine.positions
+            delta["npcs"] = {str(i): int(positions[i]) for i in sorted(moved)}
+            moved.clear()
+
+        quests = self._quests_delta()
+        if quests:
+            delta["quests"] = quests
+
+        if game.ticks != seen["ticks"]:
+            delta["ticks"] = seen["ticks"] = game.ticks
+        if len(game.triggers.fired) != seen["triggers"]:
+            delta["triggers"] = sorted(game.triggers.fired)
+            seen["triggers"] = len(game.triggers.fired)
+        scene = game.dialogue.state()
+        if scene != seen["scene"]:
+            delta["scene"] = seen["scene"] = scene
+        if len(delta) == 1:
+            return
+
+        with open(self.journal_path, "a", encoding="utf-8") as journal:
+            journal.write(_encode(delta) + "\n")
+        self._journal_entries += 1
+        if self._journal_entries >= self.compact_every:
+            self.save_snapshot()
+
+    # --- Lecture ---
+
+    def _read_snapshot(self):
+        """Lit et décode l'instantané."""
+        try:
+            with open(self.path, "rb") as snapshot:
+                return json.loads(zlib.decompress(snapshot.read()).decode("utf-8"))
+        except (OSError, zlib.error, ValueError) as error:
+            raise SaveError(f"Sauvegarde illisible : {self.path} ({error}).") from error
+
+    def _read_journal(self):
+        """Retourne les deltas du journal (une dernière ligne incomplète est ignorée)."""
+        if not os.path.exists(self.journal_path):
+            return []
+        deltas = []
+        with open(self.journal_path, encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    deltas.append(json.loads(line))
+                except ValueError:
+                    break
+        return deltas
+
+    def resume(self):
+        """
+        Restaure la partie : instantané puis deltas du journal.
+
+        Raises:
+            SaveError: Si la sauvegarde ne correspond pas au monde chargé.
+        """
+        state = self._read_snapshot()
+        if state.get("format") != SAVE_FORMAT or state["room_count"] != len(self.game.rooms):
+            raise SaveError("La sauvegarde ne correspond pas à ce monde.")
+
+        deltas = self._read_journal()
+        for delta in deltas:
+            player = state["player"]
+            for key, value in delta.get("player", {}).items():
+                if key == "history_changes":
+                    forgotten, kept, added = value
+                    player["history"] = player["history"][forgotten:kept] + added
+                elif key.endswith("_append"):
+                    player[key[:-len("_append")]].extend(value)
+                else:
+                    player[key] = value
+            state["rooms"].update(delta.get("rooms", {}))
+            for npc_index, room_id in delta.get("npcs", {}).items():
+                state["npcs"][int(npc_index)] = room_id
+            for quest_index, quest_state in delta.get("quests", {}).items():
+                state["quests"][int(quest_index)] = quest_state
+            state["triggers"] = delta.get("triggers", state["triggers"])
+            state["ticks"] = delta.get("ticks", state["ticks"])
+            if "scene" in delta:
+                state["scene"] = delta["scene"]
+            state["turn"] = delta["turn"]
+
+        self._apply(state)
+        self.turn = state["turn"]
+        self._journal_entries = len(deltas)
+        self._remember(state)
+
+    def _apply(self, state):
+        """Applique un état complet à la partie."""
+        game = self.game
+        rooms = game.rooms
+        player = game.player
+        saved = state["player"]
+        player.name = saved["name"]
+        player.current_room = rooms[saved["room"]]
+        try:
+            player.inventory = Inventory.from_dict(saved["inventory"],
+                                                   capacity=player.inventory.capacity)
+            for room_id, inventory in state["rooms"].items():
+                rooms[int(room_id)].inventory = Inventory.from_dict(inventory)
+        except KeyError as error:
+            raise SaveError(f"Objet inconnu dans la sauvegarde : {error}") from error
+        player.history = MoveHistory(player.history.size, saved["history"])
+        player.visited = VisitedRooms(saved["visited"])
+        player.crew = saved["crew"]
+        player.move_count = saved["move_count"]
+        player.rewards = list(saved["rewards"])
+
+        for npc_index, room_id in enumerate(state["npcs"]):
+            game.npc_engine.place(npc_index, room_id)
+        game.npc_engine.observe((player.current_room,))
+
+        quest_manager = player.quest_manager
+        for quest, (active, completed, objectives) in zip(quest_manager.quests, state["quests"]):
+            quest.restore(active, completed, objectives)
+        quest_manager.reindex()
+
+        game.triggers.restore(state["triggers"])
+        game.seed = state["seed"]
+        game.ticks = state["ticks"]
+        game.clock.restore(game.ticks)
+        game.dialogue.restore(state["scene"])
@@ -0,0 +1,105 @@
+"""
+Module des scènes interactives du jeu : la tempête, Fouras et le Marchand.
+Chaque scène est décrite comme un graphe de noeuds (voir dialogue.py).
+"""
+from dialogue import Choice, Node, Scene
+
+STORM_PROMPT = "\nQuel est ton choix (1 ou 2) ? > "
+
+
+def _merchant_status(game):
+    """Ligne d'état affichée dans le menu du Marchand."""
+    inventory = game.player.inventory
+    gold = inventory.count("pièce", nested=True)
+    turtles = inventory.count("tortue", nested=True)
+    return (f"\n--- BOURSE: {gold} Or | ÉQUIPAGE: {game.player.crew} "
+            f"| TORTUES: {turtles} ---")
+
+
+STORM = Scene("tempête", start="vague", nodes={
+    "vague": Node(
+        lines=["\n⚡ UNE VAGUE SCÉLÉRATE ARRIVE SUR TOI ET TON ÉQUIPAGE ! ⚡",
+               "ACTION REQUISE IMMÉDIATE (Vous ne pouvez pas fuir)",
+               "  1 : La prendre de face (Risque pour le navire, équipage protégé)",
+               "  2 : La prendre en biais (Le navire tangue, risque de chute)"],
+        prompt=STORM_PROMPT,
+        choices=[
+            Choice(["1"], [("say", "\n🌊 Le bateau craque mais tient bon. "
+                                   "L'équipage est secoué mais sauf.")], goto="cyclone"),
+            Choice(["2"], [("say", "\n🌊 Le bateau tangue violemment... "
+                                   "Un homme passe par-dessus bord !"),
+                           ("lose_crew", 1)], goto="cyclone"),
+        ]),
+    "cyclone": Node(
+        lines=["\n🌪️ Le cœur du Cyclone se rapproche...",
+               "  1 : Foncez dans l'œil du cyclone (Calme mais dangereux)",
+               "  2 : Tenter de fuir la zone (Long et périlleux)"],
+        prompt=STORM_PROMPT,
+        choices=[
+            Choice(["1"], [("say", "\n💨 Vous traversez le mur de vent et trouvez "
+                                   "le calme temporaire de l'œil.")], goto="fin"),
+            Choice(["2"], [("say", "\n💨 Les vents contraires vous ralentissent. "
+                                   "Une déferlante emporte un autre marin !"),
+                           ("lose_crew", 1)], goto="fin"),
+        ]),
+    "fin": Node(effects=[("complete_objective", "Survivre au Cyclone")]),
+})
+
+FOURAS = Scene("fouras", start="accueil", nodes={
+    "accueil": Node(
+        lines=["\n👴 Fouras : 'Héhéhé ! Tu ne sortiras pas d'ici sans avoir utilisé ta tête.'"],
+        next="question1"),
+    "question1": Node(
+        condition=("quest_open", "Énigme du Phare I"),
+        lines=["\n👴 Fouras : 'Question 1 : Combien d'îles (salles) "
+               "sont présentes dans ton monde ?'"],
+        prompt="Votre réponse (écrivez le chiffre) > ",
+        choices=[Choice(["9"], [("say", "\n👴 Fouras : 'Bien joué ! Tu as gagné 5 pièces d'or.'"),
+                                ("complete_objective", "Répondre 9"),
+                                ("give_gold", 5)], goto="question2")],
+        default=Choice(effects=[("say", "\n👴 Fouras : 'Faux ! Tu perds ta chance "
+                                        "pour cette question.'")], goto="question2"),
+        next="question2"),
+    "question2": Node(
+        condition=("quest_open", "Énigme du Phare II"),
+        lines=["\n👴 Fouras : 'Question 2 : Quel animal est votre bras droit "
+               "et se place sur votre épaule ?'"],
+        prompt="Votre réponse > ",
+        choices=[Choice(contains="perroquet",
+                        effects=[("say", "\n👴 Fouras : 'Exactement ! Voici 5 pièces d'or.'"),
+                                 ("complete_objective", "Répondre perroquet"),
+                                 ("give_gold", 5)], goto="fin")],
+        default=Choice(effects=[("say", "\n👴 Fouras : 'Non, ce n'est pas ça.'")], goto="fin"),
+        next="fin"),
+    "fin": Node(lines=["\n👴 Fouras : 'La session est terminée.'\n"]),
+})
+
+MERCHANT = Scene("marchand", start="accueil", nodes={
+    "accueil": Node(
+        lines=["\n💰 Marchand : 'Bienvenue à la taverne, Capitaine !'",
+               "💰 Marchand : 'Je peux te fournir des hommes (5 or) ou "
+               "t'acheter tes tortues (5 or).'"],
+        next="menu"),
+    "menu": Node(
+        lines=[_merchant_status,
+               "1. Acheter un matelot (-5 or)",
+               "2. Vendre une tortue (+5 or)",
+               "3. Quitter la discussion"],
+        prompt="Votre choix (1, 2 ou 3) > ",
+        choices=[
+            Choice(["1"], condition=("has_gold", 5),
+                   effects=[("remove_gold", 5), ("add_crew", 1)],
+                   otherwise=[("say", "\n💰 Marchand : 'Pas assez d'argent !'")],
+                   goto="menu"),
+            Choice(["2"], condition=("has_item", "tortue"),
+                   effects=[("remove_item", "tortue"), ("give_gold", 5),
+                            ("say", "\n💰 Marchand : 'Quelle belle bête ! "
+                                    "Voici 5 pièces d'or.'")],
+                   otherwise=[("say", "\n💰 Marchand : 'Tu n'as pas de tortue à vendre !'")],
+                   goto="menu"),
+            Choice(["3"], [("say", "\n💰 Marchand : 'À la prochaine !'")]),
+        ],
+        default=Choice(effects=[("say", "Choix invalide.")], goto="menu")),
+})
+
+SCENES = {scene.name: scene for scene in (STORM, FOURAS, MERCHANT)}
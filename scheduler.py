@@ -0,0 +1,235 @@
+"""
+Module définissant l'horloge du monde : les classes Timer, TimingWheel et TimedEvent.
+
+Le monde avance par ticks (voir Game.tick). Les événements à date fixe ou
+répétés (déplacement des PNJ, réapparition d'objets, tempêtes) sont rangés
+dans une roue temporelle hiérarchique : LEVELS roues de SLOTS cases, la roue
+n°k couvrant des cases de SLOTS**k ticks. Programmer ou annuler un événement
+coûte O(1), quel que soit le nombre d'événements en attente ; à chaque tick,
+seule la case du tick courant est vidée, et les événements lointains ne
+descendent d'une roue (cascade) qu'une fois tous les SLOTS ticks.
+
+Les événements d'une même case sont déclenchés dans leur ordre de
+programmation : une partie se rejoue à l'identique.
+"""
+from dialogue import apply_effects, check_condition
+
+# Dimensions de la roue : 4 roues de 256 cases couvrent 2**32 ticks
+SLOT_BITS = 8
+SLOTS = 1 << SLOT_BITS
+SLOT_MASK = SLOTS - 1
+LEVELS = 4
+
+
+class Timer:
+    """
+    Événement programmé dans la roue.
+
+    Attributes:
+        due (int): Tick auquel l'événement se déclenche.
+        period (int): Intervalle entre deux déclenchements (None = une seule fois).
+        payload: L'événement (rendu par TimingWheel.advance).
+        seq (int): Numéro de programmation (ordre de déclenchement dans un tick).
+        cancelled (bool): L'événement a été annulé.
+    """
+
+    __slots__ = ("due", "period", "payload", "seq", "cancelled")
+
+    def __init__(self, due, period, payload, seq):
+        self.due = due
+        self.period = period
+        self.payload = payload
+        self.seq = seq
+        self.cancelled = False
+
+
+def _seq(timer):
+    """Clé de tri des événements d'un même tick."""
+    return timer.seq
+
+
+class TimingWheel:
+    """
+    Roue temporelle hiérarchique.
+
+    Attributes:
+        now (int): Tick courant.
+    """
+
+    def __init__(self, now=0):
+        """
+        Constructeur d'une roue vide.
+
+        Args:
+            now (int): Tick de départ.
+        """
+        self._next_seq = 0
+        self._clear(now)
+
+    def _clear(self, now):
+        """Vide la roue et la place au tick now."""
+        self.now = now
+        self._wheels = [[[] for _ in range(SLOTS)] for _ in range(LEVELS)]
+        # Événements au-delà de l'horizon de la roue (SLOTS**LEVELS ticks)
+        self._overflow = []
+        self._count = 0
+
+    def __len__(self):
+        """Retourne le nombre d'événements en attente."""
+        return self._count
+
+    def _insert(self, timer):
+        """Range un événement dans la case de sa date (due > now)."""
+        # La roue est choisie par le bit de poids fort qui diffère entre now et due
+        level = ((timer.due ^ self.now).bit_length() - 1) >> 3 if timer.due ^ self.now else 0
+        if level >= LEVELS:
+            self._overflow.append(timer)
+            return
+        self._wheels[level][(timer.due >> (SLOT_BITS * level)) & SLOT_MASK].append(timer)
+
+    def schedule(self, delay, payload, period=None):
+        """
+        Programme un événement.
+
+        Args:
+            delay (int): Nombre de ticks avant le déclenchement (au moins 1).
+            payload: L'événement, rendu par advance à son échéance.
+            period (int): Répète l'événement tous les period ticks (None = une fois).
+
+        Returns:
+            Timer: L'événement programmé (à passer à cancel).
+        """
+        if period is not None and period < 1:
+            raise ValueError(f"Période invalide : {period}.")
+        timer = Timer(self.now + max(1, delay), period, payload, self._next_seq)
+        self._next_seq += 1
+        self._count += 1
+        self._insert(timer)
+        return timer
+
+    def every(self, period, payload, first=None):
+        """
+        Programme un événement répété.
+
+        Args:
+            period (int): Intervalle en ticks.
+            payload: L'événement.
+            first (int): Délai avant le premier déclenchement (défaut: period).
+
+        Returns:
+            Timer: L'événement programmé.
+        """
+        return self.schedule(period if first is None else first, payload, period)
+
+    def cancel(self, timer):
+        """Annule un événement (il est retiré de sa case quand elle est vidée)."""
+        if not timer.cancelled:
+            timer.cancelled = True
+            self._count -= 1
+
+    def _cascade(self):
+        """Redescend les événements des roues supérieures dont la case commence maintenant."""
+        now = self.now
+        level = 1
+        while level < LEVELS and not now & ((1 << (SLOT_BITS * level)) - 1):
+            level += 1
+        # Des roues les plus hautes aux plus basses : chacune alimente la suivante
+        if level == LEVELS:
+            overflow, self._overflow = self._overflow, []
+            for timer in overflow:
+                self._insert(timer)
+        for upper in range(level - 1, 0, -1):
+            wheel = self._wheels[upper]
+            slot = (now >> (SLOT_BITS * upper)) & SLOT_MASK
+            timers, wheel[slot] = wheel[slot], []
+            for timer in timers:
+                self._insert(timer)
+
+    def advance(self):
+        """
+        Avance d'un tick et retourne les événements échus.
+
+        Les événements répétés sont reprogrammés avant d'être rendus.
+
+        Returns:
+            list: Les payloads échus, dans leur ordre de programmation.
+        """
+        self.now += 1
+        if not self.now & SLOT_MASK:
+            self._cascade()
+        wheel = self._wheels[0]
+        slot = self.now & SLOT_MASK
+        timers = wheel[slot]
+        if not timers:
+            return []
+        wheel[slot] = []
+        if len(timers) > 1:
+            timers.sort(key=_seq)
+        fired = []
+        for timer in timers:
+            if timer.cancelled:
+                continue
+            fired.append(timer.payload)
+            if timer.period is None:
+                self._count -= 1
+            else:
+                timer.due += timer.period
+                self._insert(timer)
+        return fired
+
+    def timers(self):
+        """Retourne les événements en attente (dans un ordre quelconque)."""
+        pending = [timer for timer in self._overflow if not timer.cancelled]
+        for wheel in self._wheels:
+            for slot in wheel:
+                pending.extend(timer for timer in slot if not timer.cancelled)
+        return pending
+
+    def restore(self, now):
+        """
+        Replace l'horloge au tick now (chargement d'une sauvegarde).
+
+        Les événements programmés depuis le tick de départ sont recalés comme
+        si la roue avait tourné jusque-là : un événement répété garde sa
+        phase, un événement unique déjà échu est oublié.
+
+        Args:
+            now (int): Le tick restauré.
+        """
+        pending = self.timers()
+        self._clear(now)
+        for timer in sorted(pending, key=_seq):
+            if timer.due <= now:
+                if timer.period is None:
+                    continue
+                timer.due += ((now - timer.due) // timer.period + 1) * timer.period
+            self._count += 1
+            self._insert(timer)
+
+
+class TimedEvent:
+    """
+    Événement du monde déclenché par l'horloge.
+
+    Si la condition est remplie, les effets sont appliqués ; sinon ce sont les
+    effets otherwise. Effets et conditions sont ceux des scènes (voir dialogue.py).
+
+    Attributes:
+        effects (tuple): Effets appliqués quand la condition est remplie.
+        condition: Condition (None = toujours remplie).
+        otherwise (tuple): Effets appliqués quand la condition n'est pas remplie.
+    """
+
+    __slots__ = ("effects", "condition", "otherwise")
+
+    def __init__(self, effects=(), condition=None, otherwise=()):
+        self.effects = tuple(effects)
+        self.condition = condition
+        self.otherwise = tuple(otherwise)
+
+    def run(self, game):
+        """Applique l'événement à la partie."""
+        if check_condition(game, self.condition):
+            apply_effects(game, self.effects)
+        else:
+            apply_effects(game, self.otherwise)
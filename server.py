@@ -0,0 +1,185 @@
+"""
+Module du serveur de jeu multi-joueurs (asyncio).
+Héberge une partie par connexion TCP, avec un protocole ligne à ligne (type telnet).
+
+Usage : python server.py [--host 127.0.0.1] [--port 4000] [--max-sessions 1000]
+                         [--idle-timeout 600] [--world monde.json] [--stats]
+
+Un seul processus, une seule boucle d'événements : aucune session n'a de
+thread dédié. Chaque ligne reçue passe par Game.step ; tout ce que la partie
+affiche pendant le tour est envoyé d'un bloc au client.
+"""
+import argparse
+import asyncio
+
+from console import ALL_CATEGORIES, DEBUG as DEBUG_CATEGORY
+from game import Game
+from stats import STATS
+
+
+class Session:
+    """
+    Session d'un joueur connecté.
+
+    Attributes:
+        game (Game): La partie du joueur.
+        writer (asyncio.StreamWriter): Flux d'écriture vers le client.
+        buffer (list): Sortie produite pendant le tour en cours.
+    """
+
+    __slots__ = ("game", "writer", "buffer")
+
+    def __init__(self, writer, world_file=None):
+        """
+        Constructeur de la session.
+
+        Args:
+            writer (asyncio.StreamWriter): Flux d'écriture vers le client.
+            world_file (str): Fichier de monde JSON (défaut: le monde intégré).
+        """
+        self.writer = writer
+        self.buffer = []
+        # Les joueurs connectés n'ont ni les commandes d'administration ni les
+        # messages de debug (un par PNJ à chaque tick)
+        self.game = Game(input_func=self.no_input, output_func=self.write,
+                         world_file=world_file, admin=False,
+                         output_categories=ALL_CATEGORIES - {DEBUG_CATEGORY})
+
+    def write(self, *args, sep=" ", end="\n"):
+        """Canal de sortie de la partie : accumule le texte du tour."""
+        self.buffer.append(sep.join(str(arg) for arg in args) + end)
+
+    def no_input(self, prompt=""):
+        """
+        Canal d'entrée de la partie.
+
+        Le serveur ne fait jamais de saisie bloquante : chaque ligne reçue,
+        y compris les réponses aux scènes, passe par Game.step.
+        """
+        raise EOFError("saisie bloquante impossible en réseau")
+
+    async def flush(self):
+        """Envoie au client la sortie accumulée."""
+        if self.buffer:
+            self.writer.write("".join(self.buffer).encode("utf-8"))
+            self.buffer.clear()
+        await self.writer.drain()
+
+
+class GameServer:
+    """
+    Serveur de jeu asyncio.
+
+    Attributes:
+        max_sessions (int): Nombre maximal de joueurs connectés en même temps.
+        idle_timeout (float): Délai d'inactivité (secondes) avant déconnexion.
+        world_file (str): Fichier de monde JSON commun à toutes les parties.
+        sessions (set): Les sessions en cours.
+    """
+
+    def __init__(self, max_sessions=1000, idle_timeout=600.0, world_file=None):
+        """Constructeur du serveur."""
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.world_file = world_file
+        self.sessions = set()
+
+    async def _read_line(self, reader):
+        """
+        Lit une ligne du client, ou None en cas d'inactivité ou de déconnexion.
+
+        Raises:
+            ConnectionError: Si la ligne dépasse la limite du flux (64 Kio).
+        """
+        try:
+            data = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+        except asyncio.TimeoutError:
+            return None
+        except (ValueError, asyncio.LimitOverrunError) as error:
+            raise ConnectionError("ligne trop longue") from error
+        if not data:
+            return None
+        return data.decode("utf-8", errors="replace").rstrip("\r\n")
+
+    async def _ask_name(self, reader, session):
+        """Demande le nom du joueur (entre 2 et 15 caractères)."""
+        session.buffer.append("\nEntrez votre nom: ")
+        while True:
+            await session.flush()
+            name = await self._read_line(reader)
+            if name is None:
+                return None
+            name = name.strip()
+            if 2 <= len(name) <= 15:
+                return name
+            session.buffer.append("\nEntrez un nom entre 2 et 15 caractères : ")
+
+    async def handle_client(self, reader, writer):
+        """Gère une connexion du début à la fin."""
+        if len(self.sessions) >= self.max_sessions:
+            writer.write("Serveur complet, réessayez plus tard.\n".encode("utf-8"))
+            await writer.drain()
+            writer.close()
+            return
+
+        session = Session(writer, self.world_file)
+        self.sessions.add(session)
+        try:
+            await self._play(reader, session)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.sessions.discard(session)
+            writer.close()
+
+    async def _play(self, reader, session):
+        """Boucle de jeu d'une session."""
+        name = await self._ask_name(reader, session)
+        if name is None:
+            return
+        game = session.game
+        game.setup(name)
+        game.print_welcome()
+
+        while not game.finished:
+            session.buffer.append(game.prompt())
+            await session.flush()
+            line = await self._read_line(reader)
+            if line is None:
+                session.buffer.append("\n⌛ Session fermée pour inactivité.\n")
+                break
+            game.step(line)
+        await session.flush()
+
+    async def serve(self, host="127.0.0.1", port=4000):
+        """Démarre le serveur et sert indéfiniment."""
+        server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    """Point d'entrée du serveur."""
+    parser = argparse.ArgumentParser(description="Serveur multi-joueurs Chasse au Trésor.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4000)
+    parser.add_argument("--max-sessions", type=int, default=1000)
+    parser.add_argument("--idle-timeout", type=float, default=600.0)
+    parser.add_argument("--world", default=None, help="fichier de monde JSON")
+    parser.add_argument("--stats", action="store_true",
+                        help="mesure les performances et affiche le rapport à l'arrêt")
+    args = parser.parse_args()
+    STATS.enable(args.stats)
+
+    server = GameServer(args.max_sessions, args.idle_timeout, args.world)
+    print(f"Serveur en écoute sur {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    if args.stats:
+        print(STATS.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Module définissant les classes Histogram et Stats.
+Instrumentation des chemins critiques : compteurs, histogrammes de latence
+et trace exportable au format Chrome (chrome://tracing, Perfetto).
+
+Une seule instance, STATS, est partagée par tout le processus (toutes les
+parties d'un serveur). Elle est désactivée par défaut et ne s'active qu'au
+lancement (option --stats) : une partie ne peut pas la basculer pour les
+autres. Deux façons de mesurer :
+
+    - les méthodes décorées par @instrumented("quests.room") : désactivées,
+      elles restent les fonctions d'origine (aucun coût) ; enable() les
+      remplace sur leur classe par une version chronométrée ;
+    - les mesures en ligne, pour un bloc de code :
+
+        probe = STATS.start()
+        ...
+        STATS.stop("dispatch.parse", probe)
+
+      désactivée, start() retourne 0 sans lire l'horloge et stop() s'arrête
+      au premier test.
+"""
+import functools
+import json
+import os
+from time import perf_counter_ns
+
+# Nombre maximal d'événements gardés dans la trace (les suivants sont ignorés)
+TRACE_LIMIT = 200_000
+# Dossier où la commande 'stats trace' range les traces exportées en jeu
+TRACE_DIR = "traces"
+
+
+class Histogram:
+    """
+    Histogramme de durées à seaux logarithmiques (puissances de 2 en nanosecondes).
+
+    Attributes:
+        count (int): Nombre de mesures.
+        total (int): Somme des durées (ns).
+        maximum (int): Plus longue durée (ns).
+        buckets (list): Nombre de mesures par seau (le seau b couvre [2^(b-1), 2^b[ ns).
+    """
+
+    __slots__ = ("count", "total", "maximum", "buckets")
+
+    def __init__(self):
+        """Constructeur d'un histogramme vide."""
+        self.count = 0
+        self.total = 0
+        self.maximum = 0
+        self.buckets = [0] * 64
+
+    def add(self, duration):
+        """Ajoute une durée (ns)."""
+        self.count += 1
+        self.total += duration
+        if duration > self.maximum:
+            self.maximum = duration
+        self.buckets[min(duration.bit_length(), 63)] += 1
+
+    def percentile(self, fraction):
+        """
+        Borne supérieure (ns) du centile demandé (0.5 pour la médiane).
+
+        La précision est celle des seaux : à un facteur 2 près.
+        """
+        rank = fraction * self.count
+        seen = 0
+        for bucket, amount in enumerate(self.buckets):
+            seen += amount
+            if amount and seen >= rank:
+                return min(1 << bucket, self.maximum)
+        return self.maximum
+
+    def mean(self):
+        """Durée moyenne (ns)."""
+        return self.total / self.count if self.count else 0.0
+
+
+class Stats:
+    """
+    Compteurs, histogrammes et trace des chemins critiques.
+
+    Attributes:
+        enabled (bool): Si les mesures sont prises.
+        counters (dict): Nom -> nombre d'occurrences.
+        histograms (dict): Nom -> Histogram des durées.
+        events (list): Événements de la trace : (nom, début ns, durée ns, tour).
+        turn (int): Numéro du tour en cours (repris dans la trace).
+        probes (list): Méthodes décorées : (classe, attribut, fonction, nom de mesure).
+    """
+
+    def __init__(self):
+        """Constructeur : instrumentation désactivée."""
+        self.enabled = False
+        self.counters = {}
+        self.histograms = {}
+        self.events = []
+        self.turn = 0
+        self.probes = []
+        self._origin = perf_counter_ns()
+
+    def enable(self, enabled=True):
+        """Active ou désactive les mesures (et les méthodes décorées)."""
+        self.enabled = enabled
+        for probe in self.probes:
+            self._install(*probe)
+
+    def _install(self, owner, attribute, func, name):
+        """Met en place la version chronométrée d'une méthode, ou celle d'origine."""
+        setattr(owner, attribute, self._timed(func, name) if self.enabled else func)
+
+    def _timed(self, func, name):
+        """Enveloppe une fonction dans une mesure de durée."""
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            probe = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.stop(name, probe)
+        return timed
+
+    def reset(self):
+        """Efface toutes les mesures (les méthodes décorées restent en place)."""
+        self.counters = {}
+        self.histograms = {}
+        self.events = []
+        self.turn = 0
+        self._origin = perf_counter_ns()
+
+    def count(self, name, amount=1):
+        """Incrémente un compteur (si les mesures sont actives)."""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def start(self):
+        """Début d'une mesure : l'heure (ns), ou 0 si les mesures sont désactivées."""
+        return perf_counter_ns() if self.enabled else 0
+
+    def stop(self, name, probe):
+        """
+        Fin d'une mesure commencée par start().
+
+        Args:
+            name (str): Nom du point de mesure (ex: "quests.room").
+            probe (int): Valeur retournée par start().
+        """
+        if not probe:
+            return
+        duration = perf_counter_ns() - probe
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(duration)
+        if len(self.events) < TRACE_LIMIT:
+            self.events.append((name, probe, duration, self.turn))
+
+    # --- Rapports ---
+
+    def report(self):
+        """
+        Produit le rapport texte des compteurs et latences.
+
+        Returns:
+            str: Rapport prêt à afficher.
+        """
+        state = "activées" if self.enabled else "désactivées, --stats au lancement pour activer"
+        lines = [f"\n📊 Statistiques ({state}) - {self.turn} tour(s) mesuré(s)"]
+        if self.counters:
+            lines.append("\nCompteurs :")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"  {name:28} {value:>10}")
+        if self.histograms:
+            lines.append("\nLatences (µs) :")
+            lines.append(f"  {'':28} {'appels':>8} {'moyenne':>9} {'p50<=':>8} "
+                         f"{'p99<=':>8} {'max':>9}")
+            for name, histogram in sorted(self.histograms.items()):
+                lines.append(
+                    f"  {name:28} {histogram.count:>8} {histogram.mean() / 1000:>9.1f} "
+                    f"{histogram.percentile(0.5) / 1000:>8.1f} "
+                    f"{histogram.percentile(0.99) / 1000:>8.1f} "
+                    f"{histogram.maximum / 1000:>9.1f}")
+        if not self.counters and not self.histograms:
+            lines.append("Aucune mesure.")
+        return "\n".join(lines) + "\n"
+
+    def chrome_trace(self):
+        """
+        Retourne la trace au format Chrome trace-event (événements complets "X").
+
+        Returns:
+            dict: Document JSON ({"traceEvents": [...]}), temps en microsecondes.
+        """
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {"name": name, "cat": name.split(".", 1)[0], "ph": "X", "pid": pid,
+                 "tid": 1, "ts": (start - self._origin) / 1000, "dur": duration / 1000,
+                 "args": {"turn": turn}}
+                for name, start, duration, turn in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def export_trace(self, path):
+        """Écrit la trace au format Chrome trace-event dans un fichier JSON."""
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump(self.chrome_trace(), trace_file)
+
+
+def trace_path(name):
+    """
+    Chemin d'une trace exportée en jeu, toujours rangée dans TRACE_DIR.
+
+    Args:
+        name (str): Nom du fichier, sans dossier.
+
+    Returns:
+        str: Le chemin dans TRACE_DIR (le dossier est créé au besoin).
+
+    Raises:
+        ValueError: Si le nom désigne un dossier ou un autre emplacement.
+    """
+    if name in ("", ".", "..") or os.path.basename(name) != name or "\\" in name:
+        raise ValueError(f"Nom de fichier invalide : {name!r}.")
+    os.makedirs(TRACE_DIR, exist_ok=True)
+    return os.path.join(TRACE_DIR, name)
+
+
+STATS = Stats()
+
+
+class instrumented:  # pylint: disable=invalid-name
+    """
+    Décorateur de méthode : mesure sa durée quand STATS est activé.
+
+    La méthode reste inchangée sur sa classe tant que les mesures sont
+    désactivées ; STATS.enable() la remplace par une version chronométrée.
+    """
+
+    def __init__(self, name):
+        """
+        Args:
+            name (str): Nom de la mesure (ex: "quests.room").
+        """
+        self.name = name
+        self.func = None
+
+    def __call__(self, func):
+        """Mémorise la méthode décorée."""
+        self.func = func
+        return self
+
+    def __set_name__(self, owner, attribute):
+        """Remet la méthode d'origine sur la classe et l'enregistre auprès de STATS."""
+        probe = (owner, attribute, self.func, self.name)
+        STATS.probes.append(probe)
+        STATS._install(*probe)  # pylint: disable=protected-access
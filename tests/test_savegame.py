@@ -0,0 +1,63 @@
+"""
+Vérifie qu'une partie reprise (instantané + journal) retrouve l'état de la partie en cours.
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from console import discard
+from game import Game
+
+
+class SaveRoundTripTest(unittest.TestCase):
+    """Sauvegarde puis reprise d'une partie."""
+
+    def _game(self, path):
+        game = Game(input_func=lambda prompt="": "", output_func=discard, seed=3,
+                    save_file=path)
+        game.setup("Bob")
+        return game
+
+    def test_respawn_is_journaled(self):
+        """Une réapparition hors de la présence du joueur survit à la reprise."""
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "partie.sav")
+            game = self._game(path)
+            taverne = next(room for room in game.rooms if room.name == "la Taverne")
+            for line in ("go E", "take 10 pièce", "go O"):
+                game.step(line)
+            self.assertEqual(taverne.inventory.count("pièce"), 0)
+            # Aller-retour loin de la Taverne jusqu'après la réapparition (tick 20)
+            for index in range(24):
+                game.step("go N" if index % 2 == 0 else "back")
+            self.assertNotEqual(game.player.current_room, taverne)
+            self.assertEqual(taverne.inventory.count("pièce"), 10)
+
+            resumed = self._game(path)
+            self.assertEqual(resumed.ticks, game.ticks)
+            for room, restored in zip(game.rooms, resumed.rooms):
+                self.assertEqual(restored.inventory.to_dict(), room.inventory.to_dict())
+
+    def test_completed_exploration_keeps_progress(self):
+        """Une quête d'exploration terminée garde sa progression après la reprise."""
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "partie.sav")
+            game = self._game(path)
+            for room in game.rooms:
+                game.player.visit(room)
+            game.step("look")
+            quest = game.player.quest_manager.get_quest_by_title("Grand Explorateur")
+            self.assertTrue(quest.is_completed)
+
+            resumed = self._game(path).player.quest_manager.get_quest_by_title(
+                "Grand Explorateur")
+            self.assertTrue(resumed.is_completed)
+            self.assertEqual(resumed.visited_count, resumed.total)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Module définissant les classes Trigger et TriggerRegistry.
+Événements attachés aux salles : à l'entrée, à la sortie, ou garde qui
+peut refuser l'entrée (la porte de la cave aux trésors).
+
+Les déclencheurs sont rangés par numéro de salle (Room.id) puis par sorte :
+entrer dans une salle ne consulte que les déclencheurs de cette salle, en
+temps constant, quel que soit leur nombre dans le monde. Leurs effets et
+conditions sont ceux des scènes (voir dialogue.py), si bien qu'un monde JSON
+peut en déclarer sans toucher au code (voir world_loader.py).
+"""
+from dialogue import apply_effects, check_condition
+
+# Sortes de déclencheurs
+ON_ENTER = "enter"
+ON_EXIT = "exit"
+BEFORE_ENTER = "guard"
+TRIGGER_KINDS = (ON_ENTER, ON_EXIT, BEFORE_ENTER)
+
+
+class Trigger:
+    """
+    Événement attaché à une salle.
+
+    Si la condition est remplie, les effets sont appliqués ; sinon ce sont
+    les effets otherwise (et une garde refuse l'entrée).
+
+    Attributes:
+        kind (str): ON_ENTER, ON_EXIT ou BEFORE_ENTER.
+        effects (tuple): Effets appliqués quand la condition est remplie.
+        condition: Condition (None = toujours remplie).
+        otherwise (tuple): Effets appliqués quand la condition n'est pas remplie.
+        once (bool): Ne se déclenche qu'une fois (une garde franchie reste ouverte).
+        index (int): Numéro d'enregistrement (identifie le déclencheur dans la sauvegarde).
+    """
+
+    __slots__ = ("kind", "effects", "condition", "otherwise", "once", "index")
+
+    def __init__(self, kind, effects=(), condition=None, otherwise=(), once=False):
+        # pylint: disable=too-many-arguments
+        if kind not in TRIGGER_KINDS:
+            raise ValueError(f"Sorte de déclencheur inconnue : '{kind}'.")
+        self.kind = kind
+        self.effects = tuple(effects)
+        self.condition = condition
+        self.otherwise = tuple(otherwise)
+        self.once = once
+        self.index = None
+
+
+class TriggerRegistry:
+    """
+    Déclencheurs d'une partie, par salle.
+
+    Attributes:
+        triggers (list): Tous les déclencheurs, dans l'ordre d'enregistrement.
+        fired (set): Numéros des déclencheurs uniques déjà déclenchés.
+    """
+
+    def __init__(self):
+        """Constructeur d'un registre vide."""
+        self.triggers = []
+        self.fired = set()
+        # numéro de salle -> sorte -> [déclencheurs]
+        self._by_room = {}
+
+    def add(self, room, trigger):
+        """
+        Attache un déclencheur à une salle (numérotée, voir WorldGraph).
+
+        Returns:
+            Trigger: Le déclencheur enregistré.
+        """
+        trigger.index = len(self.triggers)
+        self.triggers.append(trigger)
+        kinds = self._by_room.setdefault(room.id, {})
+        kinds.setdefault(trigger.kind, []).append(trigger)
+        return trigger
+
+    def _run(self, game, trigger):
+        """Applique un déclencheur. Retourne True si sa condition était remplie."""
+        if check_condition(game, trigger.condition):
+            if trigger.once:
+                self.fired.add(trigger.index)
+            apply_effects(game, trigger.effects)
+            return True
+        apply_effects(game, trigger.otherwise)
+        return False
+
+    def _pending(self, room, kind):
+        """Déclencheurs d'une sorte attachés à une salle, hors uniques déjà déclenchés."""
+        kinds = self._by_room.get(room.id)
+        if not kinds:
+            return ()
+        triggers = kinds.get(kind, ())
+        return [trigger for trigger in triggers if trigger.index not in self.fired]
+
+    def fire(self, game, room, kind):
+        """Déclenche les événements d'une salle (ON_ENTER ou ON_EXIT)."""
+        for trigger in self._pending(room, kind):
+            self._run(game, trigger)
+
+    def allows(self, game, room):
+        """
+        Évalue les gardes d'une salle avant d'y entrer.
+
+        Returns:
+            bool: True si toutes les gardes laissent passer.
+        """
+        for trigger in self._pending(room, BEFORE_ENTER):
+            if not self._run(game, trigger):
+                return False
+        return True
+
+    def restore(self, fired):
+        """Restaure les déclencheurs uniques déjà déclenchés (chargement d'une sauvegarde)."""
+        self.fired = set(fired)
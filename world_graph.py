@@ -0,0 +1,178 @@
+"""
+Module définissant la classe WorldGraph.
+Représentation compilée du monde : salles numérotées et sorties en tableaux.
+"""
+from array import array
+from collections import OrderedDict, deque
+
+# Ordre canonique des directions (indice utilisé dans les tableaux)
+DIRECTIONS = ("N", "E", "S", "O", "U", "D")
+DIRECTION_INDEX = {direction: index for index, direction in enumerate(DIRECTIONS)}
+
+
+class WorldGraph:
+    """
+    Graphe compilé des salles du monde.
+
+    Chaque salle reçoit un numéro (Room.id) égal à sa position dans la liste.
+    Les sorties sont stockées au format CSR : les arêtes de la salle i sont
+    targets[offsets[i]:offsets[i + 1]], avec leur direction dans directions.
+    Les arbres de plus court chemin vers une destination sont mis en cache,
+    pour chaque ensemble de portes fermées (voir gates.py).
+
+    Attributes:
+        rooms (list): Les salles, indexées par numéro.
+        offsets (array): Début des arêtes de chaque salle dans targets.
+        targets (array): Numéro de la salle d'arrivée de chaque arête.
+        directions (array): Indice (dans DIRECTIONS) de la direction de chaque arête.
+        exit_tables (dict): Pour chaque direction, la salle d'arrivée de chaque salle
+            (-1 si aucune).
+        gates (list): Portes posées sur les sorties, numérotées (Gate.index).
+    """
+
+    def __init__(self, rooms, cache_size=64):
+        """
+        Constructeur du graphe.
+
+        Args:
+            rooms (list): Les salles du monde.
+            cache_size (int): Nombre d'arbres de plus court chemin gardés en cache.
+        """
+        self.rooms = list(rooms)
+        self.cache_size = cache_size
+        self._trees = OrderedDict()
+        self.compile()
+
+    def compile(self):
+        """(Re)compile le graphe à partir des sorties des salles."""
+        for index, room in enumerate(self.rooms):
+            room.id = index
+            room.touch()
+
+        count = len(self.rooms)
+        self.offsets = array("l", [0])
+        self.targets = array("l")
+        self.directions = array("b")
+        self.exit_tables = {direction: array("l", [-1]) * count for direction in DIRECTIONS}
+        reverse = [[] for _ in range(count)]
+        self.gates = []
+
+        for room in self.rooms:
+            gates = room.gates or {}
+            for direction, target in room.exits.items():
+                if target is None or direction not in DIRECTION_INDEX:
+                    continue
+                self.targets.append(target.id)
+                self.directions.append(DIRECTION_INDEX[direction])
+                self.exit_tables[direction][room.id] = target.id
+                gate = gates.get(direction)
+                if gate is not None:
+                    gate.index = len(self.gates)
+                    self.gates.append(gate)
+                reverse[target.id].append((room.id, DIRECTION_INDEX[direction], gate))
+            self.offsets.append(len(self.targets))
+
+        # Arêtes inverses (pour les arbres enracinés sur la destination)
+        self._rev_offsets = array("l", [0])
+        self._rev_sources = array("l")
+        self._rev_directions = array("b")
+        for incoming in reverse:
+            for source, direction, gate in incoming:
+                if gate is not None:
+                    gate.edge = len(self._rev_sources)
+                self._rev_sources.append(source)
+                self._rev_directions.append(direction)
+            self._rev_offsets.append(len(self._rev_sources))
+
+        self._names = {}
+        for room in self.rooms:
+            self._names.setdefault(room.name.casefold(), room.id)
+        self._trees.clear()
+
+    def find_room(self, name):
+        """
+        Retrouve une salle par son nom (casse ignorée, nom partiel accepté).
+
+        Args:
+            name (str): Nom ou partie du nom de la salle.
+
+        Returns:
+            Room | None: La salle trouvée ou None.
+        """
+        key = name.strip().casefold()
+        if not key:
+            return None
+        room_id = self._names.get(key)
+        if room_id is None:
+            for room_name, candidate in self._names.items():
+                if key in room_name:
+                    room_id = candidate
+                    break
+        return None if room_id is None else self.rooms[room_id]
+
+    def neighbours(self, room_id):
+        """Retourne la liste des (direction, numéro de salle) accessibles depuis une salle."""
+        start, end = self.offsets[room_id], self.offsets[room_id + 1]
+        return [(DIRECTIONS[self.directions[i]], self.targets[i]) for i in range(start, end)]
+
+    def _tree_to(self, target_id, closed=frozenset()):
+        """
+        Retourne l'arbre de plus court chemin vers une salle (avec cache LRU).
+
+        L'arbre est un tableau : pour chaque salle, l'indice de la direction à
+        prendre pour se rapprocher de la destination (-1 si inaccessible).
+
+        Args:
+            target_id (int): Numéro de la salle d'arrivée.
+            closed (frozenset): Arêtes inverses fermées (Gate.edge), à ne pas emprunter.
+        """
+        key = (target_id, closed) if closed else target_id
+        tree = self._trees.get(key)
+        if tree is not None:
+            self._trees.move_to_end(key)
+            return tree
+
+        tree = array("b", [-1]) * len(self.rooms)
+        visited = bytearray(len(self.rooms))
+        visited[target_id] = 1
+        queue = deque([target_id])
+        rev_offsets, rev_sources, rev_directions = (
+            self._rev_offsets, self._rev_sources, self._rev_directions)
+        while queue:
+            current = queue.popleft()
+            for i in range(rev_offsets[current], rev_offsets[current + 1]):
+                source = rev_sources[i]
+                if not visited[source] and i not in closed:
+                    visited[source] = 1
+                    tree[source] = rev_directions[i]
+                    queue.append(source)
+
+        self._trees[key] = tree
+        if len(self._trees) > self.cache_size:
+            self._trees.popitem(last=False)
+        return tree
+
+    def route(self, source, target, closed=frozenset()):
+        """
+        Calcule le plus court chemin entre deux salles.
+
+        Args:
+            source (Room): Salle de départ.
+            target (Room): Salle d'arrivée.
+            closed (frozenset): Arêtes fermées (ExitCache.closed_edges), évitées.
+
+        Returns:
+            list | None: Les directions à suivre, ou None si la salle est inaccessible.
+        """
+        if source is target:
+            return []
+        tree = self._tree_to(target.id, closed)
+        if tree[source.id] < 0:
+            return None
+        path = []
+        current = source.id
+        while current != target.id:
+            direction = DIRECTIONS[tree[current]]
+            path.append(direction)
+            current = self.exit_tables[direction][current]
+        return path
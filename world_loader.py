@@ -0,0 +1,607 @@
+"""
+Module de chargement des mondes décrits dans un fichier JSON.
+
+Un fichier de monde décrit les salles, leurs sorties et inventaires, les PNJ
+et les quêtes. Au premier chargement, il est validé puis compilé (références
+résolues en numéros de salle) dans une forme binaire compacte (marshal),
+rangée dans un dossier __pycache__ à côté du fichier et indexée par
+l'empreinte SHA-256 de la source : les chargements suivants n'ont plus ni
+analyse JSON ni résolution de liens à faire.
+
+Format du fichier :
+
+    {
+      "start": "ocean",
+      "rooms": [
+        {"id": "ocean", "name": "un vaste océan", "description": "...",
+         "exits": {"N": "croco"},
+         "inventory": {"pièce": {"description": "...", "weight": 0.1, "quantity": 10}},
+         "containers": [{"name": "coffre", "description": "...", "weight": 30,
+                         "capacity": 20, "inventory": {...}, "containers": [...]}],
+         "triggers": [{"on": "enter", "effects": [["start_scene", "tempête"]], "once": true}],
+         "gates": {"N": {"requires": [{"crew": 8}], "otherwise": [["say", "Halte !"]]}},
+         "respawn": [{"item": "pièce", "quantity": 10, "every": 20}]}
+      ],
+      "characters": [
+        {"name": "Fouras", "description": "...", "room": "phare",
+         "msgs": ["..."], "mobile": true}
+      ],
+      "quests": [
+        {"title": "...", "description": "...", "objectives": ["..."],
+         "reward": "...", "active": false},
+        {"title": "...", "explore": {"exclude": ["cave"]}, "active": true},
+        {"title": "...", "objectives": ["..."], "requires": ["<titre>", {"room": "phare"}]}
+      ],
+      "events": [
+        {"every": 25, "first": 25, "effects": [["say", "..."]],
+         "condition": ["in_room", "un vaste océan"], "otherwise": []}
+      ]
+    }
+
+Les objets sont partagés par tous les mondes (voir item.py) : un objet
+déjà connu, comme "pièce", doit être redéclaré avec la même description et
+le même poids.
+
+Un objectif est un libellé ("Visiter un vaste océan", "Se déplacer 10 fois",
+voir objectives.py) ou un objet typé, avec un "label" facultatif :
+{"visit": "ocean"}, {"action": "Parler", "target": "Fouras"},
+{"counter": "Se déplacer", "count": 10}, {"hold": "pièce", "quantity": 20}.
+
+Un déclencheur (voir triggers.py) s'exécute à l'entrée ("enter") ou à la
+sortie ("exit") de sa salle, ou garde son entrée ("guard") : si sa
+"condition" est remplie (ex: ["min_crew", 8]), ses "effects" sont appliqués,
+sinon ses "otherwise" (et la garde refuse l'entrée). Effets et conditions
+sont ceux des scènes (dialogue.EFFECTS et dialogue.CONDITIONS), sauf
+"respawn", réservé aux réapparitions ; le type de leur argument est vérifié
+au chargement (EFFECT_ARGUMENTS, CONDITION_ARGUMENTS).
+
+Une porte ("gates", par direction de sortie) ferme un passage tant que ses
+conditions "requires" ne sont pas remplies (mêmes conditions que les quêtes,
+plus {"item": "clé", "quantity": 1}) ; "effects" s'applique au passage,
+"otherwise" au refus (par défaut : la liste des conditions manquantes).
+
+Un événement ("events", voir scheduler.py) est déclenché par l'horloge du
+monde tous les "every" ticks, la première fois au tick "first" (défaut:
+"every"), avec la même "condition" et les mêmes effets qu'un déclencheur.
+Une réapparition ("respawn", par salle) complète la pile d'un objet de
+l'inventaire de la salle jusqu'à "quantity" exemplaires (défaut: la quantité
+de départ) tous les "every" ticks.
+
+Une quête avec "requires" est activée automatiquement quand ses conditions
+sont remplies (voir requirements.py) : un titre de quête à terminer (défini
+dans le même fichier), {"room": "phare"} (y entrer), {"crew": 8} ou
+{"gold": 20} (un minimum). L'effet "start_scene" ne lance qu'une scène de
+scenes.SCENES. Ces références sont vérifiées au chargement, comme les salles.
+
+Une quête "explore" demande de visiter toutes les salles d'une région :
+{"rooms": [...]} (ces salles) ou {"exclude": [...]} (toutes les autres).
+Sa progression est suivie sur l'ensemble de bits des salles visitées, sans
+un objectif par salle.
+"""
+import hashlib
+import json
+import marshal
+import os
+from collections import namedtuple
+
+from bitset import Bitset
+from character import Character
+from gates import Gate
+from inventory import Inventory
+from item import ITEMS, ItemDefinitionError
+from objectives import ActionObjective, CounterObjective, ItemObjective, VisitObjective
+from quests import ExplorationQuest, Quest
+from requirements import PLAYER_STATS, HasItem, InRoom, MinimumStat, QuestCompleted
+from room import Room
+from scenes import SCENES
+from scheduler import TimedEvent
+from triggers import TRIGGER_KINDS, Trigger
+from world_graph import DIRECTIONS
+
+# À incrémenter quand la forme compilée change (invalide les caches existants)
+CACHE_FORMAT = 9
+
+# Type de l'argument des effets et conditions utilisables dans un fichier de monde
+EFFECT_ARGUMENTS = {
+    "say": str, "lose_crew": int, "add_crew": int, "give_gold": int, "remove_gold": int,
+    "say_status": str, "start_scene": str, "remove_item": str, "complete_objective": str,
+}
+CONDITION_ARGUMENTS = {
+    "quest_open": str, "has_gold": int, "has_item": str, "min_crew": int, "in_room": str,
+}
+
+
+# Monde construit : salles, PNJ, quêtes, titres des quêtes actives au départ, salle de
+# départ, déclencheurs [(salle, Trigger)] et événements [(premier tick, période, TimedEvent)]
+World = namedtuple("World", "rooms characters quests active_titles start triggers events",
+                   defaults=((), ()))
+
+
+class WorldFileError(ValueError):
+    """Erreur levée quand un fichier de monde est invalide."""
+
+
+def _object(entry, where):
+    """Vérifie qu'une entrée du fichier est un objet JSON et la retourne."""
+    if not isinstance(entry, dict):
+        raise WorldFileError(f"{where} : objet JSON attendu.")
+    return entry
+
+
+def _require(entry, key, kind, where):
+    """Retourne entry[key] en vérifiant sa présence et son type."""
+    if key not in _object(entry, where):
+        raise WorldFileError(f"{where} : champ '{key}' manquant.")
+    value = entry[key]
+    if not isinstance(value, kind):
+        raise WorldFileError(f"{where} : le champ '{key}' a un type invalide.")
+    return value
+
+
+def _optional(entry, key, kind, default, where):
+    """Retourne entry[key] (default s'il est absent) en vérifiant son type."""
+    value = _object(entry, where).get(key, default)
+    if not isinstance(value, kind):
+        raise WorldFileError(f"{where} : le champ '{key}' a un type invalide.")
+    return value
+
+
+def _compile_inventory(entries, where):
+    """Valide et compile des piles d'objets : ((nom, description, poids, quantité), ...)."""
+    inventory = []
+    for item_name, info in entries.items():
+        _object(info, f"{where}, objet '{item_name}'")
+        weight = info.get("weight", 0)
+        quantity = info.get("quantity", 1)
+        if not isinstance(weight, (int, float)) or not isinstance(quantity, int):
+            raise WorldFileError(f"{where} : objet '{item_name}' invalide.")
+        inventory.append((item_name, str(info.get("description", "")), weight, quantity))
+    return tuple(inventory)
+
+
+def _compile_containers(entries, where):
+    """
+    Valide et compile des conteneurs imbriqués :
+    ((nom, description, poids, capacité, piles, sous-conteneurs), ...).
+    """
+    containers = []
+    for entry in entries:
+        name = _require(entry, "name", str, where)
+        inner = f"{where}, conteneur '{name}'"
+        weight = entry.get("weight", 0)
+        capacity = entry.get("capacity")
+        valid_capacity = capacity is None or isinstance(capacity, (int, float))
+        if not isinstance(weight, (int, float)) or not valid_capacity:
+            raise WorldFileError(f"{inner} : poids ou capacité invalide.")
+        containers.append((name, str(entry.get("description", "")), weight, capacity,
+                           _compile_inventory(_optional(entry, "inventory", dict, {}, inner),
+                                              inner),
+                           _compile_containers(_optional(entry, "containers", list, [], inner),
+                                               inner)))
+    return tuple(containers)
+
+
+def _compile_effects(effects, arguments, where):
+    """
+    Valide et compile une suite d'effets (ou une condition) : ((nom, argument), ...).
+
+    Args:
+        effects (list): Les effets, chacun [nom, argument].
+        arguments (dict): Nom -> type de l'argument (EFFECT_ARGUMENTS ou CONDITION_ARGUMENTS).
+        where (str): Contexte des messages d'erreur.
+
+    Une scène lancée par "start_scene" doit exister (voir scenes.SCENES) et le
+    texte de "say_status" ne peut utiliser que {crew}.
+    """
+    if not isinstance(effects, list):
+        raise WorldFileError(f"{where} : liste d'effets attendue.")
+    compiled = []
+    for effect in effects:
+        if (not isinstance(effect, list) or len(effect) != 2
+                or not isinstance(effect[0], str) or effect[0] not in arguments):
+            raise WorldFileError(f"{where} : effet ou condition invalide ({effect}).")
+        name, argument = effect
+        if not isinstance(argument, arguments[name]) or isinstance(argument, bool):
+            raise WorldFileError(f"{where} : argument invalide pour '{name}' ({argument!r}).")
+        if name == "start_scene" and argument not in SCENES:
+            raise WorldFileError(f"{where} : scène '{argument}' inconnue.")
+        if name == "say_status":
+            try:
+                argument.format(crew=0)
+            except (KeyError, IndexError, ValueError) as error:
+                raise WorldFileError(f"{where} : texte invalide pour 'say_status' "
+                                     f"({argument!r}).") from error
+        compiled.append((name, argument))
+    return tuple(compiled)
+
+
+def _compile_triggers(entries, where):
+    """
+    Valide et compile les déclencheurs d'une salle.
+
+    Returns:
+        tuple: ((sorte, effets, condition, effets sinon, unique), ...).
+    """
+    triggers = []
+    for entry in entries:
+        kind = _require(entry, "on", str, where)
+        if kind not in TRIGGER_KINDS:
+            raise WorldFileError(f"{where} : déclencheur '{kind}' inconnu.")
+        condition = entry.get("condition")
+        if condition is not None:
+            condition = _compile_effects([condition], CONDITION_ARGUMENTS, where)[0]
+        triggers.append((kind,
+                         _compile_effects(entry.get("effects", []), EFFECT_ARGUMENTS, where),
+                         condition,
+                         _compile_effects(entry.get("otherwise", []), EFFECT_ARGUMENTS, where),
+                         bool(entry.get("once", False))))
+    return tuple(triggers)
+
+
+def _period(entry, key, where, default=None):
+    """Retourne un nombre de ticks (entier strictement positif) lu dans entry."""
+    value = entry.get(key, default)
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise WorldFileError(f"{where} : le champ '{key}' doit être un nombre de ticks.")
+    return value
+
+
+def _compile_event(entry, where):
+    """
+    Valide et compile un événement de l'horloge.
+
+    Returns:
+        tuple: (premier tick, période, effets, condition, effets sinon).
+    """
+    every = _period(entry, "every", where)
+    condition = entry.get("condition")
+    if condition is not None:
+        condition = _compile_effects([condition], CONDITION_ARGUMENTS, where)[0]
+    return (_period(entry, "first", where, every), every,
+            _compile_effects(entry.get("effects", []), EFFECT_ARGUMENTS, where),
+            condition,
+            _compile_effects(entry.get("otherwise", []), EFFECT_ARGUMENTS, where))
+
+
+def _compile_respawns(entries, room_index, inventory, where):
+    """
+    Valide et compile les réapparitions d'objets d'une salle en événements.
+
+    Returns:
+        tuple: Les événements (voir _compile_event).
+    """
+    quantities = {item_name: quantity for item_name, _, _, quantity in inventory}
+    events = []
+    for entry in entries:
+        item_name = _require(entry, "item", str, where)
+        if item_name not in quantities:
+            raise WorldFileError(f"{where} : réapparition d'un objet absent de la salle "
+                                 f"('{item_name}').")
+        quantity = _period(entry, "quantity", where, quantities[item_name])
+        every = _period(entry, "every", where)
+        events.append((every, every, (("respawn", (room_index, item_name, quantity)),),
+                       None, ()))
+    return tuple(events)
+
+
+def _compile_gates(entries, exits, resolve, titles, where):
+    """
+    Valide et compile les portes d'une salle.
+
+    Returns:
+        tuple: ((direction, conditions, effets, effets sinon), ...).
+    """
+    gates = []
+    for direction, entry in entries.items():
+        if direction not in exits:
+            raise WorldFileError(f"{where} : porte sur une sortie inexistante ('{direction}').")
+        inner = f"{where}, porte '{direction}'"
+        gates.append((direction,
+                      tuple(_compile_requirement(r, resolve, titles, inner)
+                            for r in _require(entry, "requires", list, inner)),
+                      _compile_effects(entry.get("effects", []), EFFECT_ARGUMENTS, inner),
+                      _compile_effects(entry.get("otherwise", []), EFFECT_ARGUMENTS, inner)))
+    return tuple(gates)
+
+
+def _compile_objective(objective, resolve, where):
+    """
+    Valide et compile un objectif : son libellé, ou (type, paramètre, paramètre, libellé).
+
+    Args:
+        objective (str | dict): L'objectif tel qu'écrit dans le fichier.
+        resolve (callable): Résout un identifiant de salle en numéro.
+        where (str): Contexte des messages d'erreur.
+    """
+    if not isinstance(objective, dict):
+        return str(objective)
+    label = objective.get("label")
+    if label is not None and not isinstance(label, str):
+        raise WorldFileError(f"{where} : le champ 'label' a un type invalide.")
+    if "visit" in objective:
+        return ("visit", resolve(_require(objective, "visit", str, where), where), None, label)
+    if "action" in objective:
+        target = objective.get("target")
+        if target is not None and not isinstance(target, str):
+            raise WorldFileError(f"{where} : le champ 'target' a un type invalide.")
+        return ("action", _require(objective, "action", str, where), target, label)
+    if "counter" in objective:
+        return ("counter", _require(objective, "counter", str, where),
+                _require(objective, "count", int, where), label)
+    if "hold" in objective:
+        quantity = objective.get("quantity", 1)
+        if not isinstance(quantity, int) or quantity < 1:
+            raise WorldFileError(f"{where} : le champ 'quantity' a un type invalide.")
+        return ("hold", _require(objective, "hold", str, where), quantity, label)
+    raise WorldFileError(f"{where} : objectif de type inconnu.")
+
+
+def _compile_requirement(requirement, resolve, titles, where):
+    """
+    Valide et compile une condition (déblocage de quête, porte) : (type, paramètre).
+
+    Args:
+        requirement (str | dict): La condition telle qu'écrite dans le fichier.
+        resolve (callable): Résout un identifiant de salle en numéro.
+        titles (set): Titres des quêtes du monde (une quête à terminer doit en faire partie).
+        where (str): Contexte des messages d'erreur.
+    """
+    if isinstance(requirement, str):
+        if requirement not in titles:
+            raise WorldFileError(f"{where} : quête '{requirement}' inconnue.")
+        return ("quest", requirement)
+    if isinstance(requirement, dict) and "item" in requirement:
+        quantity = requirement.get("quantity", 1)
+        if not isinstance(quantity, int) or quantity < 1:
+            raise WorldFileError(f"{where} : le champ 'quantity' a un type invalide.")
+        return ("item", (_require(requirement, "item", str, where), quantity))
+    if not isinstance(requirement, dict) or len(requirement) != 1:
+        raise WorldFileError(f"{where} : condition invalide.")
+    if "room" in requirement:
+        return ("room", resolve(_require(requirement, "room", str, where), where))
+    stat = next(iter(requirement))
+    if stat not in PLAYER_STATS:
+        raise WorldFileError(f"{where} : condition '{stat}' inconnue.")
+    return (stat, _require(requirement, stat, int, where))
+
+
+def _build_requirement(row, rooms):
+    """Construit une condition de déblocage à partir de sa forme compilée."""
+    kind, argument = row
+    if kind == "quest":
+        return QuestCompleted(argument)
+    if kind == "room":
+        return InRoom(rooms[argument].name)
+    if kind == "item":
+        return HasItem(*argument)
+    return MinimumStat(kind, argument)
+
+
+def _build_objective(row, rooms):
+    """Construit un objectif à partir de sa forme compilée (un libellé reste un libellé)."""
+    if isinstance(row, str):
+        return row
+    kind, first, second, label = row
+    if kind == "visit":
+        return VisitObjective(rooms[first].name, label)
+    if kind == "action":
+        return ActionObjective(first, second, label)
+    if kind == "counter":
+        return CounterObjective(first, second, label)
+    return ItemObjective(first, second, label)
+
+
+def compile_world(source):
+    """
+    Valide un monde (données JSON décodées) et le compile en tuples.
+
+    Args:
+        source (dict): Le contenu du fichier de monde.
+
+    Returns:
+        tuple: (salle de départ, salles, PNJ, quêtes, événements) avec des numéros de salle.
+
+    Raises:
+        WorldFileError: Si le monde est incohérent (le message donne le chemin de l'entrée).
+    """
+    if not isinstance(source, dict):
+        raise WorldFileError("Le monde doit être un objet JSON.")
+    room_entries = _require(source, "rooms", list, "monde")
+    character_entries = _optional(source, "characters", list, [], "monde")
+    quest_entries = _optional(source, "quests", list, [], "monde")
+    event_entries = _optional(source, "events", list, [], "monde")
+    if not room_entries:
+        raise WorldFileError("Le monde ne contient aucune salle.")
+
+    index = {}
+    for position, entry in enumerate(room_entries):
+        room_key = _require(entry, "id", str, f"salle n°{position}")
+        if room_key in index:
+            raise WorldFileError(f"Salle '{room_key}' définie deux fois.")
+        index[room_key] = position
+
+    def resolve(room_key, where):
+        if room_key not in index:
+            raise WorldFileError(f"{where} : salle '{room_key}' inconnue.")
+        return index[room_key]
+
+    titles = set()
+    for position, entry in enumerate(quest_entries):
+        titles.add(_require(entry, "title", str, f"quête n°{position}"))
+
+    rooms = []
+    events = []
+    for room_index, entry in enumerate(room_entries):
+        where = f"salle '{entry['id']}'"
+        exit_entries = _optional(entry, "exits", dict, {}, where)
+        exits = []
+        for direction, target in exit_entries.items():
+            if direction not in DIRECTIONS:
+                raise WorldFileError(f"{where} : direction '{direction}' inconnue.")
+            exits.append((direction, resolve(target, where)))
+        inventory = _compile_inventory(_optional(entry, "inventory", dict, {}, where), where)
+        events.extend(_compile_respawns(_optional(entry, "respawn", list, [], where),
+                                        room_index, inventory, where))
+        rooms.append((_require(entry, "name", str, where),
+                      _require(entry, "description", str, where),
+                      tuple(exits),
+                      inventory,
+                      _compile_containers(_optional(entry, "containers", list, [], where), where),
+                      _compile_triggers(_optional(entry, "triggers", list, [], where), where),
+                      _compile_gates(_optional(entry, "gates", dict, {}, where), exit_entries,
+                                     resolve, titles, where)))
+
+    characters = []
+    for position, entry in enumerate(character_entries):
+        _object(entry, f"PNJ n°{position}")
+        where = f"PNJ '{entry.get('name', '?')}'"
+        characters.append((_require(entry, "name", str, where),
+                           str(entry.get("description", "")),
+                           resolve(_require(entry, "room", str, where), where),
+                           tuple(str(msg) for msg in _optional(entry, "msgs", list, [], where)),
+                           bool(entry.get("mobile", True))))
+
+    quests = []
+    for entry in quest_entries:
+        where = f"quête '{entry['title']}'"
+        region = None
+        if "explore" in entry:
+            explore = _require(entry, "explore", dict, where)
+            if "rooms" in explore:
+                region = sorted({resolve(key, where)
+                                 for key in _require(explore, "rooms", list, where)})
+            else:
+                excluded = {resolve(key, where)
+                            for key in _optional(explore, "exclude", list, [], where)}
+                region = [i for i in range(len(room_entries)) if i not in excluded]
+            region = tuple(region)
+        quests.append((entry["title"],
+                       str(entry.get("description", "")),
+                       tuple(_compile_objective(o, resolve, where)
+                             for o in _optional(entry, "objectives", list, [], where)),
+                       entry.get("reward"),
+                       bool(entry.get("active", False)),
+                       region,
+                       tuple(_compile_requirement(r, resolve, titles, where)
+                             for r in _optional(entry, "requires", list, [], where))))
+
+    for position, entry in enumerate(event_entries):
+        where = f"événement n°{position}"
+        events.append(_compile_event(_object(entry, where), where))
+
+    start = resolve(_optional(source, "start", str, room_entries[0]["id"], "monde"), "monde")
+    return (start, tuple(rooms), tuple(characters), tuple(quests), tuple(events))
+
+
+def _cache_path(path, digest):
+    """Chemin du fichier compilé correspondant à une source et à son empreinte."""
+    folder = os.path.join(os.path.dirname(os.path.abspath(path)), "__pycache__")
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(folder, f"{stem}.{digest[:16]}.world")
+
+
+def load_compiled(path, use_cache=True):
+    """
+    Charge la forme compilée d'un fichier de monde, via le cache si possible.
+
+    Args:
+        path (str): Chemin du fichier JSON.
+        use_cache (bool): Lit et écrit le cache binaire.
+
+    Returns:
+        tuple: La forme compilée (voir compile_world).
+    """
+    with open(path, "rb") as world_file:
+        raw = world_file.read()
+    digest = hashlib.sha256(raw + bytes([CACHE_FORMAT])).hexdigest()
+    cache_file = _cache_path(path, digest)
+
+    if use_cache:
+        try:
+            with open(cache_file, "rb") as cached:
+                return marshal.load(cached)
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+    try:
+        source = json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise WorldFileError(f"{path} : JSON invalide ({error}).") from error
+    compiled = compile_world(source)
+
+    if use_cache:
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            temporary = cache_file + ".tmp"
+            with open(temporary, "wb") as cached:
+                marshal.dump(compiled, cached)
+            os.replace(temporary, cache_file)
+        except OSError:
+            pass
+    return compiled
+
+
+def _fill_inventory(inventory, items, containers):
+    """Remplit un inventaire à partir de ses piles et conteneurs compilés."""
+    for item_name, description, weight, quantity in items:
+        try:
+            ITEMS.register(item_name, description, weight)
+        except ItemDefinitionError as error:
+            raise WorldFileError(str(error)) from error
+        inventory.add(item_name, quantity)
+    for name, description, weight, capacity, inner_items, inner_containers in containers:
+        container = Inventory(name=name, description=description, weight=weight,
+                              capacity=capacity)
+        _fill_inventory(container, inner_items, inner_containers)
+        inventory.add_container(container)
+
+
+def build_world(compiled):
+    """
+    Construit les objets du jeu à partir de la forme compilée.
+
+    Returns:
+        World: Le monde construit.
+    """
+    start, room_rows, character_rows, quest_rows, event_rows = compiled
+    rooms = [Room(name, description) for name, description, *_ in room_rows]
+    triggers = []
+    for room, row in zip(rooms, room_rows):
+        _, _, exits, inventory, containers, room_triggers, gates = row
+        room.exits = {direction: rooms[target] for direction, target in exits}
+        for direction, requirements, effects, otherwise in gates:
+            room.lock_exit(direction, Gate([_build_requirement(r, rooms) for r in requirements],
+                                           effects, otherwise))
+        _fill_inventory(room.inventory, inventory, containers)
+        triggers.extend((room, Trigger(*row)) for row in room_triggers)
+
+    characters = []
+    for name, description, room_index, msgs, mobile in character_rows:
+        room = rooms[room_index]
+        npc = Character(name, description, room, list(msgs), mobile=mobile)
+        room.add_character(npc)
+        characters.append(npc)
+
+    quests = []
+    for title, description, objectives, reward, _, region, requirements in quest_rows:
+        requires = [_build_requirement(row, rooms) for row in requirements]
+        if region is None:
+            quests.append(Quest(title, description,
+                                [_build_objective(row, rooms) for row in objectives], reward,
+                                requires))
+        else:
+            quests.append(ExplorationQuest(title, description, Bitset(region, len(rooms)),
+                                           reward, requires))
+    active_titles = [row[0] for row in quest_rows if row[4]]
+    events = [(first, every, TimedEvent(*row)) for first, every, *row in event_rows]
+    return World(rooms, characters, quests, active_titles, rooms[start], triggers, events)
+
+
+def load_world(path, use_cache=True):
+    """
+    Charge un fichier de monde et construit ses objets.
+
+    Returns:
+        World: Le monde construit.
+    """
+    return build_world(load_compiled(path, use_cache))